@@ -1,7 +1,8 @@
 import sys
 import csv
 import os
-import mysql.connector
+import import_report
+from db_pool import DB_CONFIG, get_connection, connect_server
 import subprocess
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLineEdit,
                              QPushButton, QLabel, QGraphicsOpacityEffect, QMessageBox)
@@ -9,8 +10,73 @@ from PyQt5.QtGui import QPixmap, QFont, QPainter, QColor, QPen
 from PyQt5.QtCore import Qt, QRectF, QPropertyAnimation, QEasingCurve
 
 
-# ==================== ADMIN PANEL ====================
-from admin import AdminPanel
+# ==================== CREDENTIAL INDEX ====================
+class CredentialIndex:
+    """Username -> password lookup over registered_list.csv.
+
+    The file is parsed once and only re-read when its mtime/size change or
+    invalidate() is called; accounts added through register() are indexed
+    as they are written. A username may appear on several rows (from before
+    registration rejected taken names); only the first row registered under
+    it counts, so a later re-registration can't log in to that account.
+    """
+
+    def __init__(self, path="registered_list.csv"):
+        self.path = path
+        self._stamp = None
+        self._users = {}
+
+    def invalidate(self):
+        self._stamp = None
+
+    def _refresh(self):
+        st = os.stat(self.path)  # FileNotFoundError if nobody registered yet
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+        users = {}
+        with open(self.path, 'r', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader, None)  # Skip header
+            for row in reader:
+                if len(row) >= 2:
+                    users.setdefault(row[0], row)
+        self._users = users
+        self._stamp = stamp
+
+    def lookup(self, username, password):
+        self._refresh()
+        row = self._users.get(username)
+        return row if row is not None and row[1] == password else None
+
+    def has_user(self, username):
+        try:
+            self._refresh()
+        except FileNotFoundError:
+            return False
+        return username in self._users
+
+    def register(self, row):
+        """Append [name, password, email] to the file and index it without re-reading the file."""
+        file_exists = os.path.isfile(self.path)
+        with open(self.path, "a", newline="") as file:
+            # The index only stays current if it had read the file up to here
+            in_sync = self._stamp is not None and file.tell() == self._stamp[1]
+            writer = csv.writer(file)
+            if not file_exists:
+                writer.writerow(["Name", "Password", "Email"])
+            writer.writerow(row)
+        if in_sync or not file_exists:
+            if not file_exists:
+                self._users = {}
+            self._users.setdefault(row[0], list(row))
+            st = os.stat(self.path)
+            self._stamp = (st.st_mtime_ns, st.st_size)
+        else:
+            self.invalidate()
+
+
+credential_index = CredentialIndex()
 
 
 # ==================== HOVER BUTTON ====================
@@ -147,15 +213,12 @@ class RegisterWindow(QWidget):
         self.close()
 
     def initDatabase(self):
+        import mysql.connector  # loaded here rather than at startup; the login window doesn't need it
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password=""
-            )
+            conn = connect_server()
             cursor = conn.cursor()
-            cursor.execute("CREATE DATABASE IF NOT EXISTS HILOM")
-            cursor.execute("USE HILOM")
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
+            cursor.execute(f"USE {DB_CONFIG['database']}")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS registered_users(
                     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -166,7 +229,7 @@ class RegisterWindow(QWidget):
             """)
             conn.commit()
             conn.close()
-            print("Database ready: hilom_db")
+            print(f"Database ready: {DB_CONFIG['database']}")
         except mysql.connector.Error as e:
             print("Database Error:", e)
         except Exception as e:
@@ -176,6 +239,9 @@ class RegisterWindow(QWidget):
         if not name.strip():
             QMessageBox.warning(self, "Error", "Name cannot be empty!")
             return False
+        if credential_index.has_user(name):
+            QMessageBox.warning(self, "Error", "This name is already registered!")
+            return False
         if not email.strip():
             QMessageBox.warning(self, "Error", "Email cannot be empty!")
             return False
@@ -194,6 +260,7 @@ class RegisterWindow(QWidget):
         return True
 
     def save_account(self):
+        import mysql.connector
         try:
             name = self.name_input.text()
             pwd = self.password_input.text()
@@ -208,12 +275,7 @@ class RegisterWindow(QWidget):
 
             # Save to CSV
             try:
-                file_exists = os.path.isfile("registered_list.csv")
-                with open("registered_list.csv", "a", newline="") as file:
-                    writer = csv.writer(file)
-                    if not file_exists:
-                        writer.writerow(["Name", "Password", "Email"])
-                    writer.writerow([name, pwd, email])
+                credential_index.register([name, pwd, email])
                 csv_saved = True
                 print("Account saved to CSV")
             except Exception as e:
@@ -221,12 +283,7 @@ class RegisterWindow(QWidget):
 
             # Save to MySQL
             try:
-                conn = mysql.connector.connect(
-                    host="localhost",
-                    user="root",
-                    password="",
-                    database="HILOM"
-                )
+                conn = get_connection()
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO registered_users (name, password, email)
@@ -401,24 +458,21 @@ class LoginWindow(QWidget):
             return
         
         if username.lower() == "admin" and password == "secretadmin":
+            from admin import AdminPanel  # only the admin login needs the admin panel
             self.hide()
             self.admin_window = AdminPanel()
             self.admin_window.show()
             return
 
         try:
-            with open('registered_list.csv', 'r', newline='') as csvfile:
-                reader = csv.reader(csvfile)
-                next(reader, None)  # Skip header
-                for row in reader:
-                    if len(row) >= 2 and row[0] == username and row[1] == password:
-                        QMessageBox.information(self, "Success", "Login successful!")
-
-                        # Open Dashboard app
-                        import os
-                        os.startfile("dashboard.py")
-                        self.close()
-                        return
+            if credential_index.lookup(username, password):
+                QMessageBox.information(self, "Success", "Login successful!")
+
+                # Open Dashboard app
+                import os
+                os.startfile("dashboard.py")
+                self.close()
+                return
         except FileNotFoundError:
             QMessageBox.warning(self, "Error", "No registered users found. Please create an account first.")
             return
@@ -463,4 +517,5 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = LoginWindow()
     window.show()
+    import_report.report()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -1,22 +1,331 @@
 import sys
 import csv
 import os
-import mysql.connector
+import time
+from concurrent.futures import ThreadPoolExecutor
+from db_pool import get_connection
+import heartbeat
+import control
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QFrame, QTableWidget, QTableWidgetItem,
+    QPushButton, QFrame, QTableView, QHeaderView, QLineEdit,
     QTabWidget, QMessageBox, QTextEdit, QSplitter
 )
 from PyQt5.QtGui import QFont, QColor, QPixmap
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import (
+    Qt, QTimer, QObject, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+)
 import subprocess
 import signal
 
+ADMIN_WORKERS = 4                # loaders running at once
+ADMIN_STALE_AFTER = 60           # seconds before a source's data is shown as stale
+ADMIN_STATUS_INTERVAL = 1000     # ms between refreshes of the "updated N s ago" labels
+ADMIN_PAGE_SIZE = 200            # appointments fetched per page while scrolling
+ADMIN_LIVENESS_INTERVAL = 2000   # ms between dashboard liveness checks (cheap: two small file reads)
+ADMIN_RESTART_TIMEOUT = 10       # seconds to wait for a stopped dashboard to exit before starting anew
+DASHBOARD_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {seconds:02d}s"
+
+
+def fetch_appointment_page(after=None, limit=ADMIN_PAGE_SIZE):
+    """One page of appointments, newest first, strictly after the (created_at, id)
+    key `after`. Returns (rows, key of the last row); the key is None on the last page.
+
+    Keyset pagination on the (created_at, id) index (see migrations.py): every
+    page is an index range scan, however deep the admin has scrolled.
+    """
+    query = """
+        SELECT patient_name, schedule, time_slot, consultation_type, price,
+               contact, concern, 'Active' as status, created_at, id
+        FROM appointments
+    """
+    params = []
+    if after is not None:
+        query += " WHERE created_at < %s OR (created_at = %s AND id < %s)"
+        params = [after[0], after[0], after[1]]
+    query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+    params.append(limit)
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    last_key = tuple(rows[-1][-2:]) if len(rows) == limit else None
+    return [row[:-2] for row in rows], last_key
+
+
+class BackgroundLoader(QObject):
+    """Runs loader functions on a thread pool and reports back through signals,
+    which Qt delivers on the GUI thread."""
+
+    loaded = pyqtSignal(str, object, float)   # source, result, seconds taken
+    failed = pyqtSignal(str, str, float)      # source, error, seconds taken
+
+    def __init__(self, workers=ADMIN_WORKERS, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="admin-loader")
+        self._running = set()
+
+    def submit(self, source, fn):
+        """Start fn for source unless it is still running; returns False if skipped."""
+        if source in self._running:
+            return False
+        self._running.add(source)
+        self._executor.submit(self._run, source, fn)
+        return True
+
+    def is_running(self, source):
+        return source in self._running
+
+    def _run(self, source, fn):
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            self._running.discard(source)
+            self.failed.emit(source, str(e), time.perf_counter() - start)
+        else:
+            self._running.discard(source)
+            self.loaded.emit(source, result, time.perf_counter() - start)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RowTableModel(QAbstractTableModel):
+    """Table model over the row tuples exactly as fetched.
+
+    No per-cell objects: a cell's text is made when the view paints it.
+    Sorting reorders the row list with one Python sort, and is applied
+    again to the rows of every refresh.
+    """
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.rows = []
+        self._text = None  # casefolded text of each row, built on the first filter
+        self._sort = None  # (column, order) of the last sort, kept across set_rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.rows[index.row()]
+        value = row[index.column()] if index.column() < len(row) else None
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self.headers):
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = list(rows)
+        self._text = None
+        if self._sort is not None:
+            # The header still shows the sort indicator, so keep the rows in that order
+            column, order = self._sort
+            self.rows = [self.rows[i] for i in self._sorted_order(column, order)]
+        self.endResetModel()
+
+    def row_text(self, row):
+        if self._text is None:
+            self._text = ["\t".join("" if v is None else str(v) for v in r).casefold() for r in self.rows]
+        return self._text[row]
+
+    def _sorted_order(self, column, order):
+        """Row positions in the order sorting by column would put them."""
+        cells = [row[column] if column < len(row) else None for row in self.rows]
+        descending = order == Qt.DescendingOrder
+        try:
+            # None doesn't compare with values: keep empty cells together at one end
+            return sorted(range(len(cells)), reverse=descending,
+                          key=lambda i: (cells[i] is None, 0 if cells[i] is None else cells[i]))
+        except TypeError:
+            # Mixed types in one column (e.g. the sample rows); compare as text
+            return sorted(range(len(cells)), reverse=descending, key=lambda i: str(cells[i]))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if not 0 <= column < len(self.headers):
+            self._sort = None  # sort indicator cleared: later refreshes keep the fetched order
+            return
+        self._sort = (column, order)
+        new_order = self._sorted_order(column, order)
+
+        self.layoutAboutToBeChanged.emit()
+        moved_to = {old: new for new, old in enumerate(new_order)}
+        persistent = self.persistentIndexList()
+        self.rows = [self.rows[i] for i in new_order]
+        if self._text is not None:
+            self._text = [self._text[i] for i in new_order]
+        self.changePersistentIndexList(
+            persistent, [self.index(moved_to[i.row()], i.column()) for i in persistent])
+        self.layoutChanged.emit()
+
+
+class RowFilterProxy(QSortFilterProxyModel):
+    """Case-insensitive "contains" filter over every column of a RowTableModel.
+
+    Sorting is passed on to the source model, which sorts its row list in one
+    go instead of the proxy calling data() for every comparison.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    def set_filter_text(self, text):
+        self._needle = text.strip().casefold()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self._needle or self._needle in self.sourceModel().row_text(source_row)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+
+class KeysetTableModel(RowTableModel):
+    """RowTableModel that pages in more rows as the view scrolls to the end.
+
+    fetch_page(after, limit) runs on a worker thread and returns
+    (rows, last key or None). The page after the visible ones is always
+    fetched ahead, so scrolling usually appends it without waiting.
+    """
+
+    def __init__(self, headers, fetch_page, page_size=ADMIN_PAGE_SIZE, parent=None):
+        super().__init__(headers, parent)
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.loader = BackgroundLoader(workers=1, parent=self)
+        self.loader.loaded.connect(self.on_page_loaded)
+        self.loader.failed.connect(self.on_page_failed)
+        self._next_key = None
+        self._prefetched = None  # next page, fetched but not shown yet
+        self._wanted = False     # the view asked for more while the page was loading
+        self._failed = False
+        self._generation = 0     # bumped on reset; pages from before it are dropped
+
+    def reset_pages(self, rows, next_key):
+        """Show the first page; next_key is None if there is nothing after it."""
+        self._generation += 1
+        self._next_key = next_key
+        self._prefetched = None
+        self._wanted = self._failed = False
+        self.set_rows(rows)
+        self.prefetch()
+
+    def prefetch(self):
+        if self._next_key is None or self._prefetched is not None or self._failed:
+            return
+        generation, key = self._generation, self._next_key
+        self.loader.submit("page", lambda: (generation, self.fetch_page(key, self.page_size)))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._failed:
+            return False
+        return self._prefetched is not None or self._next_key is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        if self._prefetched is not None:
+            rows, self._prefetched = self._prefetched, None
+            self.append_rows(rows)
+            self.prefetch()
+        else:
+            self._wanted = True
+            self.prefetch()
+
+    def append_rows(self, rows):
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        if self._text is not None:
+            self._text.extend("\t".join("" if v is None else str(v) for v in r).casefold() for r in rows)
+        self.endInsertRows()
+
+    def on_page_loaded(self, source, result, elapsed):
+        generation, (rows, next_key) = result
+        if generation != self._generation:
+            return
+        self._next_key = next_key
+        if self._wanted:
+            self._wanted = False
+            self.append_rows(rows)
+            self.prefetch()
+        else:
+            self._prefetched = rows
+
+    def on_page_failed(self, source, error, elapsed):
+        # Stop asking until the next refresh rather than retrying on every scroll
+        print(f"Error loading appointments page: {error}")
+        self._failed = True
+
+
+def make_table(model, layout):
+    """Add a filter box and a sortable QTableView over model to layout; returns (view, model)."""
+    proxy = RowFilterProxy()
+    proxy.setSourceModel(model)
+    model.setParent(proxy)
+
+    filter_box = QLineEdit()
+    filter_box.setPlaceholderText("Filter...")
+    filter_box.textChanged.connect(proxy.set_filter_text)
+    layout.addWidget(filter_box)
+
+    view = QTableView()
+    view.setModel(proxy)
+    proxy.setParent(view)
+    view.setSortingEnabled(True)
+    view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+    # Fixed row heights: the view never measures rows it doesn't show
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setDefaultSectionSize(24)
+    layout.addWidget(view)
+    return view, model
+
+
 class AdminPanel(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("HILOM Admin Panel")
         self.setGeometry(100, 100, 1200, 800)
+        # source -> (title, fetch on a worker thread, show on the GUI thread)
+        self.sources = {
+            "logins": ("Login records", self.fetch_login_records, self.show_login_records),
+            "users": ("Users", self.fetch_registered_users, self.show_registered_users),
+            "appointments": ("Appointments", self.fetch_appointments, self.show_appointments),
+            "status": ("System status", self.fetch_system_status, self.show_system_status),
+            "logs": ("System logs", self.fetch_system_logs, self.show_system_logs),
+        }
+        self.source_state = {}  # source -> (finished at, seconds taken, error or None)
+        self.loader = BackgroundLoader(parent=self)
+        self.loader.loaded.connect(self.on_source_loaded)
+        self.loader.failed.connect(self.on_source_failed)
+        # Control-socket calls block for up to CONTROL_TIMEOUT per step, so they get a worker too
+        self.control_loader = BackgroundLoader(workers=1, parent=self)
+        self.control_loader.loaded.connect(self.on_control_done)
+        self.control_loader.failed.connect(self.on_control_failed)
         self.initUI()
 
     def initUI(self):
@@ -62,6 +371,22 @@ class AdminPanel(QWidget):
         refresh_btn.clicked.connect(self.refresh_all_data)
         main_layout.addWidget(refresh_btn, alignment=Qt.AlignCenter)
 
+        # How fresh each source is
+        sources_layout = QHBoxLayout()
+        self.source_labels = {}
+        for source in self.sources:
+            label = QLabel()
+            label.setFont(QFont("Arial", 9))
+            sources_layout.addWidget(label)
+            self.source_labels[source] = label
+        main_layout.addLayout(sources_layout)
+        self.source_timer = QTimer(self)
+        self.source_timer.timeout.connect(self.update_source_labels)
+        self.source_timer.start(ADMIN_STATUS_INTERVAL)
+        self.liveness_timer = QTimer(self)
+        self.liveness_timer.timeout.connect(self.check_system_status)
+        self.liveness_timer.start(ADMIN_LIVENESS_INTERVAL)
+
         self.setLayout(main_layout)
 
         # Load initial data
@@ -75,10 +400,8 @@ class AdminPanel(QWidget):
         title.setFont(QFont("Arial", 16, QFont.Bold))
         layout.addWidget(title)
 
-        self.login_table = QTableWidget()
-        self.login_table.setColumnCount(4)
-        self.login_table.setHorizontalHeaderLabels(["Username", "Timestamp", "IP Address", "Status"])
-        layout.addWidget(self.login_table)
+        self.login_table, self.login_model = make_table(
+            RowTableModel(["Username", "Timestamp", "IP Address", "Status"]), layout)
 
         tab.setLayout(layout)
         self.tab_widget.addTab(tab, "Login Records")
@@ -101,10 +424,8 @@ class AdminPanel(QWidget):
         csv_label.setFont(QFont("Arial", 12, QFont.Bold))
         csv_layout.addWidget(csv_label)
 
-        self.csv_users_table = QTableWidget()
-        self.csv_users_table.setColumnCount(3)
-        self.csv_users_table.setHorizontalHeaderLabels(["Name", "Password", "Email"])
-        csv_layout.addWidget(self.csv_users_table)
+        self.csv_users_table, self.csv_users_model = make_table(
+            RowTableModel(["Name", "Password", "Email"]), csv_layout)
         csv_frame.setLayout(csv_layout)
         splitter.addWidget(csv_frame)
 
@@ -115,10 +436,8 @@ class AdminPanel(QWidget):
         mysql_label.setFont(QFont("Arial", 12, QFont.Bold))
         mysql_layout.addWidget(mysql_label)
 
-        self.mysql_users_table = QTableWidget()
-        self.mysql_users_table.setColumnCount(4)
-        self.mysql_users_table.setHorizontalHeaderLabels(["ID", "Name", "Password", "Email"])
-        mysql_layout.addWidget(self.mysql_users_table)
+        self.mysql_users_table, self.mysql_users_model = make_table(
+            RowTableModel(["ID", "Name", "Password", "Email"]), mysql_layout)
         mysql_frame.setLayout(mysql_layout)
         splitter.addWidget(mysql_frame)
 
@@ -134,12 +453,11 @@ class AdminPanel(QWidget):
         title.setFont(QFont("Arial", 16, QFont.Bold))
         layout.addWidget(title)
 
-        self.appointments_table = QTableWidget()
-        self.appointments_table.setColumnCount(8)
-        self.appointments_table.setHorizontalHeaderLabels([
+        self.appointments_table, self.appointments_model = make_table(KeysetTableModel([
             "Name", "Date", "Time", "Type", "Price", "Contact", "Concern", "Status"
-        ])
-        layout.addWidget(self.appointments_table)
+        ], fetch_appointment_page), layout)
+        # Rows arrive newest first a page at a time; sorting only what's loaded would mislead
+        self.appointments_table.setSortingEnabled(False)
 
         tab.setLayout(layout)
         self.tab_widget.addTab(tab, "Appointments")
@@ -210,27 +528,66 @@ class AdminPanel(QWidget):
         self.tab_widget.addTab(tab, "System Control")
 
     def refresh_all_data(self):
-        self.load_login_records()
-        self.load_registered_users()
-        self.load_appointments()
-        self.check_system_status()
-        self.load_system_logs()
-
-    def load_login_records(self):
+        # Every source loads on its own worker; results arrive through on_source_loaded
+        for source in self.sources:
+            self.refresh(source)
+
+    def refresh(self, source):
+        self.loader.submit(source, self.sources[source][1])
+        self.update_source_labels()
+
+    def on_source_loaded(self, source, result, elapsed):
+        self.source_state[source] = (time.time(), elapsed, None)
+        self.sources[source][2](result)
+        self.update_source_labels()
+
+    def on_source_failed(self, source, error, elapsed):
+        print(f"Error loading {self.sources[source][0].lower()}: {error}")
+        self.source_state[source] = (time.time(), elapsed, error)
+        self.update_source_labels()
+
+    def update_source_labels(self):
+        now = time.time()
+        for source, label in self.source_labels.items():
+            title = self.sources[source][0]
+            finished, elapsed, error = self.source_state.get(source, (None, 0.0, None))
+            if self.loader.is_running(source):
+                text, color = f"{title}: loading...", "gray"
+            elif finished is None:
+                text, color = f"{title}: not loaded", "gray"
+            else:
+                age = int(now - finished)
+                if error:
+                    text, color = f"{title}: failed {age}s ago", "red"
+                else:
+                    text = f"{title}: {elapsed * 1000:.0f} ms, {age}s ago"
+                    color = "orange" if age >= ADMIN_STALE_AFTER else "green"
+            label.setToolTip(error or "")
+            label.setText(text)
+            label.setStyleSheet(f"color: {color};")
+
+    def closeEvent(self, event):
+        self.source_timer.stop()
+        self.liveness_timer.stop()
+        self.loader.shutdown()
+        self.control_loader.shutdown()
+        self.appointments_model.loader.shutdown()
+        super().closeEvent(event)
+
+    # The fetch_* methods run on worker threads: no widgets in them.
+    def fetch_login_records(self):
         # For now, create sample login records
         # In a real implementation, you'd read from a log file
-        sample_logins = [
+        return [
             ["user1", "2025-12-14 10:30:00", "192.168.1.1", "Success"],
             ["admin", "2025-12-14 11:15:00", "192.168.1.1", "Success"],
             ["user2", "2025-12-14 12:00:00", "192.168.1.1", "Failed"]
         ]
 
-        self.login_table.setRowCount(len(sample_logins))
-        for row, login in enumerate(sample_logins):
-            for col, data in enumerate(login):
-                self.login_table.setItem(row, col, QTableWidgetItem(data))
+    def show_login_records(self, logins):
+        self.login_model.set_rows(logins)
 
-    def load_registered_users(self):
+    def fetch_registered_users(self):
         # Load CSV users
         csv_users = []
         try:
@@ -249,20 +606,10 @@ class AdminPanel(QWidget):
                 ["Jane Smith", "pass456", "jane@example.com"]
             ]
 
-        self.csv_users_table.setRowCount(len(csv_users))
-        for row, user in enumerate(csv_users):
-            for col, data in enumerate(user):
-                self.csv_users_table.setItem(row, col, QTableWidgetItem(data))
-
         # Load MySQL users
         mysql_users = []
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                database="HILOM"
-            )
+            conn = get_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT id, name, password, email FROM registered_users")
             mysql_users = cursor.fetchall()
@@ -274,30 +621,18 @@ class AdminPanel(QWidget):
                 [1, "Admin User", "admin123", "admin@hilom.com"],
                 [2, "Test User", "test456", "test@hilom.com"]
             ]
+        return csv_users, mysql_users
 
-        self.mysql_users_table.setRowCount(len(mysql_users))
-        for row, user in enumerate(mysql_users):
-            for col, data in enumerate(user):
-                self.mysql_users_table.setItem(row, col, QTableWidgetItem(str(data)))
+    def show_registered_users(self, users):
+        csv_users, mysql_users = users
+        self.csv_users_model.set_rows(csv_users)
+        self.mysql_users_model.set_rows(mysql_users)
 
-    def load_appointments(self):
-        appointments = []
+    def fetch_appointments(self):
+        """First page of appointments and the key to continue from."""
+        appointments, next_key = [], None
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                database="hilom"
-            )
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT patient_name, schedule, time_slot, consultation_type, price,
-                       contact, concern, 'Active' as status
-                FROM appointments
-                ORDER BY created_at DESC
-            """)
-            appointments = cursor.fetchall()
-            conn.close()
+            appointments, next_key = fetch_appointment_page()
         except Exception as e:
             print(f"Error loading appointments: {e}")
             # Fallback: try to load from history.csv
@@ -317,37 +652,35 @@ class AdminPanel(QWidget):
                 ["John Doe", "2025-12-15", "10:00 AM", "Online", "$100", "123-456-7890", "Anxiety", "Active"],
                 ["Jane Smith", "2025-12-16", "2:00 PM", "Face-to-Face", "$150", "987-654-3210", "Depression", "Active"]
             ]
+        return appointments, next_key
 
-        self.appointments_table.setRowCount(len(appointments))
-        for row, apt in enumerate(appointments):
-            for col, data in enumerate(apt):
-                self.appointments_table.setItem(row, col, QTableWidgetItem(str(data)))
+    def show_appointments(self, page):
+        self.appointments_model.reset_pages(*page)
 
     def check_system_status(self):
-        # Check if dashboard is running
-        try:
-            import psutil
-            dashboard_running = False
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    if proc.info['name'] == 'python.exe' and proc.info['cmdline']:
-                        if 'dashboard.py' in ' '.join(proc.info['cmdline']):
-                            dashboard_running = True
-                            break
-                except:
-                    continue
-
-            if dashboard_running:
-                self.status_label.setText("🟢 System Status: Dashboard is RUNNING")
-                self.status_label.setStyleSheet("color: green; font-weight: bold;")
-            else:
-                self.status_label.setText("🔴 System Status: Dashboard is NOT RUNNING")
-                self.status_label.setStyleSheet("color: red; font-weight: bold;")
-        except ImportError:
-            self.status_label.setText("⚠️ System Status: Cannot check (psutil not installed)")
+        self.refresh("status")
+
+    def fetch_system_status(self):
+        # Lock file and heartbeat record: no process table scan (see heartbeat.py)
+        return heartbeat.read_status()
+
+    def show_system_status(self, status):
+        if not status["running"]:
+            self.status_label.setText("🔴 System Status: Dashboard is NOT RUNNING")
+            self.status_label.setStyleSheet("color: red; font-weight: bold;")
+        elif not status["responding"]:
+            age = status.get("age")
+            since = f" for {age:.0f}s" if age is not None else ""
+            self.status_label.setText(f"🟠 System Status: Dashboard (PID {status['pid']}) is NOT RESPONDING{since}")
             self.status_label.setStyleSheet("color: orange; font-weight: bold;")
-
-    def load_system_logs(self):
+        else:
+            self.status_label.setText(
+                f"🟢 System Status: Dashboard is RUNNING (PID {status['pid']}, "
+                f"up {format_duration(time.time() - status['started'])}, "
+                f"event loop lag {status['lag_ms']:.0f} ms, memory {status['rss'] / 1024 / 1024:.0f} MB)")
+            self.status_label.setStyleSheet("color: green; font-weight: bold;")
+
+    def fetch_system_logs(self):
         logs = []
         try:
             if os.path.exists("history.csv"):
@@ -355,8 +688,10 @@ class AdminPanel(QWidget):
                     reader = csv.reader(file)
                     logs = list(reader)[-20:]  # Last 20 entries
         except Exception as e:
-            logs = [f"Error loading logs: {e}"]
+            logs = [[f"Error loading logs: {e}"]]
+        return logs
 
+    def show_system_logs(self, logs):
         log_text = "\n".join([", ".join(row) for row in logs])
         self.logs_text.setPlainText(log_text)
 
@@ -368,27 +703,46 @@ class AdminPanel(QWidget):
         )
 
         if reply == QMessageBox.Yes:
+            status = heartbeat.read_status()
+            if not status["running"] or not status["pid"]:
+                QMessageBox.warning(self, "Not Found", "No running dashboard instance found")
+                return
+            self.run_control("shutdown", lambda: (status, self.stop_dashboard(status)))
+
+    def run_control(self, action, fn):
+        # Results come back through on_control_done / on_control_failed
+        if not self.control_loader.submit(action, fn):
+            QMessageBox.information(self, "Busy", f"A dashboard {action} is already in progress")
+
+    def on_control_done(self, action, result, elapsed):
+        if action == "shutdown":
+            status, how = result
+            QMessageBox.information(self, "Success", f"Shutdown dashboard (PID {status['pid']}) {how}")
+            QTimer.singleShot(1000, self.check_system_status)  # the lock is released once it has exited
+        elif action == "restart":
+            reload_result = result
+            if reload_result is not None:
+                QMessageBox.information(self, "Success",
+                                        f"Dashboard reloaded in {reload_result['elapsed_ms']:.0f} ms")
+                self.check_system_status()
+            else:
+                self.start_dashboard_when_stopped(time.monotonic() + ADMIN_RESTART_TIMEOUT)
+
+    def on_control_failed(self, action, error, elapsed):
+        QMessageBox.warning(self, "Error", f"{action.capitalize()} failed: {error}")
+
+    def stop_dashboard(self, status):
+        """Ask the dashboard to exit cleanly (it flushes history first); kill it
+        if it isn't answering. Returns how it was stopped. Blocks, so it runs
+        on the control worker."""
+        if status["responding"]:
             try:
-                import psutil
-                shutdown_count = 0
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                    try:
-                        if proc.info['name'] == 'python.exe' and proc.info['cmdline']:
-                            if 'dashboard.py' in ' '.join(proc.info['cmdline']):
-                                proc.terminate()
-                                shutdown_count += 1
-                    except:
-                        continue
-
-                if shutdown_count > 0:
-                    QMessageBox.information(self, "Success", f"Shutdown {shutdown_count} dashboard instance(s)")
-                    self.check_system_status()
-                else:
-                    QMessageBox.warning(self, "Not Found", "No running dashboard instances found")
-            except ImportError:
-                QMessageBox.warning(self, "Error", "Cannot shutdown (psutil not installed)")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Shutdown failed: {e}")
+                control.send_command("shutdown")
+                return "cleanly"
+            except control.ControlError as e:
+                print(f"Control shutdown failed, terminating instead: {e}")
+        os.kill(status["pid"], signal.SIGTERM)
+        return "by terminating it"
 
     def restart_dashboard(self):
         reply = QMessageBox.question(
@@ -398,16 +752,54 @@ class AdminPanel(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            # First shutdown
-            self.shutdown_dashboard()
-            # Then restart
+            status = heartbeat.read_status()
+            self.run_control("restart", lambda: self.reload_or_stop_dashboard(status))
+
+    def reload_or_stop_dashboard(self, status):
+        """Runs on the control worker. Returns the reload result, or None once a
+        dashboard that couldn't reload (or wasn't running) has been stopped."""
+        # A responsive dashboard reloads its content in place: no cold start, caches stay warm
+        if status["running"] and status["responding"]:
+            try:
+                return control.send_command("reload")
+            except control.ControlError as e:
+                print(f"Warm reload failed, restarting the process: {e}")
+        # Otherwise stop it (if it runs at all); a new process starts once the lock is free
+        if status["running"] and status["pid"]:
+            self.stop_dashboard(status)
+        return None
+
+    def start_dashboard_when_stopped(self, deadline, forced=False):
+        if heartbeat.is_locked():
+            if time.monotonic() < deadline:
+                QTimer.singleShot(200, lambda: self.start_dashboard_when_stopped(deadline, forced))
+                return
+            # Still running: starting another one now would give two dashboards
+            pid = heartbeat.read_status().get("pid")
+            if forced or not pid:
+                QMessageBox.warning(self, "Error", "The dashboard did not exit; it was not restarted.")
+                return
+            reply = QMessageBox.question(
+                self, "Dashboard Did Not Exit",
+                f"The dashboard (PID {pid}) did not exit within {ADMIN_RESTART_TIMEOUT:.0f} seconds.\n"
+                "Force it to quit and start a new one?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
             try:
-                import os
-                os.startfile("dashboard.py")
-                QMessageBox.information(self, "Success", "Dashboard restart initiated")
-                QTimer.singleShot(2000, self.check_system_status)  # Check status after 2 seconds
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Restart failed: {e}")
+                os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+            except OSError as e:
+                QMessageBox.warning(self, "Error", f"Could not stop the dashboard: {e}")
+                return
+            self.start_dashboard_when_stopped(time.monotonic() + ADMIN_RESTART_TIMEOUT, forced=True)
+            return
+        try:
+            subprocess.Popen([sys.executable, DASHBOARD_SCRIPT], cwd=os.path.dirname(DASHBOARD_SCRIPT))
+            QMessageBox.information(self, "Success", "Dashboard restart initiated")
+            QTimer.singleShot(2000, self.check_system_status)  # Check status after 2 seconds
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Restart failed: {e}")
 
 
 if __name__ == "__main__":
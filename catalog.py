@@ -0,0 +1,232 @@
+import os
+import re
+import sys
+import json
+import sqlite3
+import argparse
+from collections import OrderedDict
+
+# Songs, videos and books per mood. catalog.json is the editable source;
+# the app reads catalog.db, a SQLite copy built from it on first use (or
+# with `python catalog.py`) and rebuilt whenever catalog.json changes.
+
+# Next to the code, so the app finds them whatever directory it is started from
+CATALOG_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_SOURCE = os.path.join(CATALOG_DIR, "catalog.json")
+CATALOG_DB = os.path.join(CATALOG_DIR, "catalog.db")
+CATALOG_SCHEMA_VERSION = "1"
+CATALOG_MMAP_SIZE = 64 * 1024 * 1024   # bytes of catalog.db SQLite may memory-map
+CATALOG_CACHED_MOODS = 4                # moods kept in memory after being read
+
+KINDS = ("songs", "videos", "books")
+YOUTUBE_ID = re.compile(r"(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/)([A-Za-z0-9_-]+)")
+YOUTUBE_ID_LENGTH = 11
+
+COLUMNS = ("id", "mood", "kind", "title", "artist", "description", "youtube", "spotify", "link")
+
+
+class CatalogError(Exception):
+    pass
+
+
+def flatten(content):
+    """Flatten {mood: {kind: [...]}} into one list of entries; an entry's id is its index.
+
+    Returns (entries, mood_ids) where mood_ids[mood][kind] lists the ids of
+    that mood's songs/videos/books in their original order.
+    """
+    entries, mood_ids = [], {}
+    for mood, groups in content.items():
+        mood_ids[mood] = {}
+        for kind in KINDS:
+            ids = mood_ids[mood][kind] = []
+            for raw in groups.get(kind, []):
+                entry = {"id": len(entries), "kind": kind, "mood": mood}
+                if kind == "songs":
+                    artist, _, title = raw.partition(" – ")
+                    entry.update(title=raw, artist=artist if title else "")
+                else:
+                    entry.update(raw)
+                ids.append(entry["id"])
+                entries.append(entry)
+    return entries, mood_ids
+
+
+def validate(entry):
+    """Problems with one flattened entry, as (field, message) pairs."""
+    problems = []
+    if not (entry.get("title") or "").strip():
+        problems.append(("title", "missing title"))
+    youtube = entry.get("youtube") or ""
+    if youtube:
+        match = YOUTUBE_ID.search(youtube)
+        if not match:
+            problems.append(("youtube", f"not a YouTube video link: {youtube}"))
+        elif len(match.group(1)) != YOUTUBE_ID_LENGTH:
+            problems.append(("youtube", f"YouTube id {match.group(1)!r} is not {YOUTUBE_ID_LENGTH} characters "
+                                        f"(truncated link?): {youtube}"))
+    for field in ("spotify", "link"):
+        url = entry.get(field) or ""
+        if url and not url.startswith("https://"):
+            problems.append((field, f"{field} is not an https link: {url}"))
+    if entry["kind"] == "books" and not entry.get("link"):
+        problems.append(("link", "book without a link"))
+    return problems
+
+
+def check(content):
+    """Every problem in the catalog as (entry, message) pairs."""
+    entries, _ = flatten(content)
+    return [(entry, message) for entry in entries for _, message in validate(entry)]
+
+
+def build(source=CATALOG_SOURCE, db_path=CATALOG_DB):
+    """Validate source and write db_path from it. Returns the problems found.
+
+    A broken link is left out (the app falls back to a search by title)
+    rather than keeping the whole entry out of the catalog.
+    """
+    try:
+        with open(source, encoding="utf-8") as f:
+            content = json.load(f)
+    except (OSError, ValueError) as e:
+        raise CatalogError(f"Cannot read {source}: {e}")
+
+    entries, _ = flatten(content)
+    problems = []
+    for entry in entries:
+        for field, message in validate(entry):
+            problems.append((entry, message))
+            if field != "title":
+                entry[field] = ""
+
+    tmp = db_path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE moods (name TEXT PRIMARY KEY, position INTEGER);
+            CREATE TABLE items (
+                id INTEGER PRIMARY KEY, mood TEXT, kind TEXT, title TEXT, artist TEXT,
+                description TEXT, youtube TEXT, spotify TEXT, link TEXT
+            );
+            CREATE INDEX items_by_mood ON items (mood, id);
+        """)
+        conn.executemany("INSERT INTO moods VALUES (?, ?)", ((mood, i) for i, mood in enumerate(content)))
+        conn.executemany(
+            f"INSERT INTO items VALUES ({', '.join('?' * len(COLUMNS))})",
+            ([entry["id"]] + [entry.get(col) or "" for col in COLUMNS[1:]] for entry in entries))
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("schema", CATALOG_SCHEMA_VERSION),
+            ("source_mtime_ns", str(os.stat(source).st_mtime_ns)),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, db_path)
+    return problems
+
+
+class Catalog:
+    """Read-only access to catalog.db, opened on first use and read a mood at a time."""
+
+    def __init__(self, db_path=CATALOG_DB, source=CATALOG_SOURCE, cached_moods=CATALOG_CACHED_MOODS):
+        self.db_path = db_path
+        self.source = source
+        self.cached_moods = cached_moods
+        self._conn = None
+        self._moods = None
+        self._cache = OrderedDict()  # mood -> entries, least recently used first
+
+    def _open(self):
+        if self._conn is not None:
+            return self._conn
+        if self._stale():
+            for entry, message in build(self.source, self.db_path):
+                print(f"Catalog: {entry['mood']} {entry['kind']} {entry.get('title')!r}: {message}")
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA mmap_size = {CATALOG_MMAP_SIZE}")
+        self._conn.execute("PRAGMA query_only = ON")
+        return self._conn
+
+    def _stale(self):
+        if not os.path.exists(self.db_path):
+            return True
+        if not os.path.exists(self.source):
+            return False  # shipped without the source; use the db as it is
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM meta"))
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return True
+        return (meta.get("schema") != CATALOG_SCHEMA_VERSION
+                or meta.get("source_mtime_ns") != str(os.stat(self.source).st_mtime_ns))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._moods = None
+        self._cache.clear()
+
+    def stats(self):
+        return {"open": self._conn is not None, "cached_moods": len(self._cache)}
+
+    def moods(self):
+        if self._moods is None:
+            self._moods = [row[0] for row in self._open().execute("SELECT name FROM moods ORDER BY position")]
+        return self._moods
+
+    def mood_entries(self, mood):
+        """All songs, videos and books of one mood, in catalog order."""
+        entries = self._cache.get(mood)
+        if entries is None:
+            rows = self._open().execute("SELECT * FROM items WHERE mood = ? ORDER BY id", (mood,))
+            entries = [dict(row) for row in rows]
+            self._cache[mood] = entries
+            if len(self._cache) > self.cached_moods:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(mood)
+        return entries
+
+    def get(self, entry_id):
+        row = self._open().execute("SELECT * FROM items WHERE id = ?", (entry_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def iter_entries(self):
+        """Every entry, streamed from disk (for building the search index)."""
+        yield from (dict(row) for row in self._open().execute("SELECT * FROM items ORDER BY id"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate catalog.json and build catalog.db from it.")
+    parser.add_argument("--source", default=CATALOG_SOURCE)
+    parser.add_argument("--db", default=CATALOG_DB)
+    parser.add_argument("--check", action="store_true", help="only validate, don't write the db")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.check:
+            with open(args.source, encoding="utf-8") as f:
+                problems = check(json.load(f))
+        else:
+            problems = build(args.source, args.db)
+    except (OSError, ValueError, CatalogError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    for entry, message in problems:
+        print(f"{entry['mood']} {entry['kind']} {entry.get('title')!r}: {message}")
+    if not args.check:
+        print(f"Wrote {args.db}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import os
+import json
+import hashlib
+from PyQt5.QtCore import QObject
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+from heartbeat import LOCK_FILE
+
+# Admin-to-dashboard commands over a local socket (a Unix domain socket, or a
+# named pipe on Windows). One JSON line each way:
+#   -> {"command": "stats"}
+#   <- {"ok": true, "result": {...}}   or   {"ok": false, "error": "..."}
+# Commands the dashboard serves: reload, flush, stats, shutdown.
+
+# One name per install, like dashboard.lock: two copies of the app never share a socket
+CONTROL_NAME = "hilom-dashboard-" + hashlib.sha1(os.path.normcase(LOCK_FILE).encode()).hexdigest()[:12]
+CONTROL_TIMEOUT = 2000   # ms to connect / get a reply before giving up
+CONTROL_MAX_REQUEST = 64 * 1024
+
+
+class ControlError(Exception):
+    pass
+
+
+class ControlServer(QObject):
+    """Serves commands from handlers ({name: callable returning a dict}) on the Qt event loop."""
+
+    def __init__(self, handlers, name=CONTROL_NAME, parent=None):
+        super().__init__(parent)
+        self.handlers = handlers
+        self.name = name
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)  # only this user may connect
+        self.server.newConnection.connect(self.on_new_connection)
+        self._buffers = {}
+
+    def listen(self):
+        # A socket file left by a dashboard that crashed would block listen().
+        # The name is tied to this install's dashboard.lock and only its holder
+        # starts the server, so the socket removed here is never a live one
+        QLocalServer.removeServer(self.name)
+        if not self.server.listen(self.name):
+            print(f"Control socket unavailable: {self.server.errorString()}")
+            return False
+        return True
+
+    def close(self):
+        self.server.close()
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self.on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self.forget(s))
+
+    def forget(self, socket):
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
+
+    def on_ready_read(self, socket):
+        if socket not in self._buffers:
+            return
+        self._buffers[socket] += bytes(socket.readAll())
+        buffer = self._buffers[socket]
+        if b"\n" not in buffer:
+            if len(buffer) > CONTROL_MAX_REQUEST:
+                socket.abort()
+            return
+        line = buffer.split(b"\n", 1)[0]
+        reply = self.handle(line)
+        socket.write(json.dumps(reply, default=str).encode() + b"\n")
+        socket.flush()
+        socket.disconnectFromServer()
+
+    def handle(self, line):
+        try:
+            command = json.loads(line)["command"]
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "error": "expected {\"command\": ...}"}
+        handler = self.handlers.get(command)
+        if handler is None:
+            return {"ok": False, "error": f"unknown command {command!r}; try {', '.join(self.handlers)}"}
+        try:
+            return {"ok": True, "result": handler()}
+        except Exception as e:
+            print(f"Control command {command} failed: {e}")
+            return {"ok": False, "error": str(e)}
+
+
+def send_command(command, name=CONTROL_NAME, timeout=CONTROL_TIMEOUT):
+    """Send one command and wait for its result; raises ControlError.
+
+    Blocks for at most about `timeout` ms per step, so callers check the
+    heartbeat first rather than waiting on a hung dashboard.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(name)
+    if not socket.waitForConnected(timeout):
+        raise ControlError(f"cannot connect to {name}: {socket.errorString()}")
+    try:
+        socket.write(json.dumps({"command": command}).encode() + b"\n")
+        socket.waitForBytesWritten(timeout)
+        data = b""
+        while b"\n" not in data:
+            ready = socket.waitForReadyRead(timeout)
+            data += bytes(socket.readAll())
+            if not ready and b"\n" not in data:
+                raise ControlError(f"no reply to {command!r}: {socket.errorString()}")
+    finally:
+        socket.abort()
+    try:
+        reply = json.loads(data.split(b"\n", 1)[0])
+    except ValueError:
+        raise ControlError(f"bad reply to {command!r}")
+    if not reply.get("ok"):
+        raise ControlError(reply.get("error") or f"{command!r} failed")
+    return reply.get("result")
+
+
+if __name__ == "__main__":
+    import sys
+    from PyQt5.QtCore import QCoreApplication
+    app = QCoreApplication(sys.argv)
+    if len(sys.argv) != 2:
+        print("Usage: python control.py reload|flush|stats|shutdown", file=sys.stderr)
+        sys.exit(2)
+    try:
+        print(json.dumps(send_command(sys.argv[1]), indent=2))
+    except ControlError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
@@ -1,89 +1,626 @@
 import sys
 import csv
 import random
+import io
 import os
+import locale
+import json
+import re
+import unicodedata
+from bisect import bisect_left
+from array import array
+import time
+import queue
+from collections import deque, Counter
+import atexit
+import threading
 import webbrowser
+from datetime import datetime
 from urllib.parse import quote_plus
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QFrame, QStackedWidget, QTextEdit, QLineEdit,
-    QMessageBox, QGraphicsDropShadowEffect, QGridLayout, QTabWidget, QListWidget, QListWidgetItem, QToolBar, QAction, QScrollArea, QComboBox, QCalendarWidget, QCheckBox
+    QMessageBox, QGraphicsDropShadowEffect, QGridLayout, QTabWidget, QListWidget, QListWidgetItem, QListView, QToolBar, QAction, QScrollArea, QComboBox, QCalendarWidget, QCheckBox
 )
 from PyQt5.QtGui import QFont, QPixmap, QColor, QPainter, QBrush, QPen
-from PyQt5.QtCore import Qt, QTimer, QPointF, QDate, QUrl
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-import mysql.connector
+from PyQt5.QtCore import Qt, QObject, QEvent, pyqtSignal, QTimer, QPointF, QRectF, QDate, QUrl, QFileSystemWatcher, QAbstractListModel, QModelIndex
+import db_pool
+import catalog
+import ranking
+import heartbeat
+import control
+import import_report
+
+# NumPy optional - without it JournalPage animates plain Petal objects
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# ---------- Event Bus ----------
+class EventBus(QObject):
+    """In-process notifications, so open pages update as things happen
+    instead of re-reading their files."""
+
+    history_logged = pyqtSignal(list)       # [category, item, date, time] as written to history.csv
+    favorite_added = pyqtSignal(str, str)   # category, item
+    favorite_removed = pyqtSignal(str, str)
+
+
+event_bus = EventBus()
 
 
 # ---------- Log History ----------
+HISTORY_FILE = "history.csv"
+HISTORY_BATCH_SIZE = 50        # write once this many rows are queued...
+HISTORY_FLUSH_INTERVAL = 1.0   # ...or once the oldest queued row is this many seconds old
+HISTORY_DURABILITY = "flush"   # "buffered", "flush" or "fsync"
+HISTORY_POLL_INTERVAL = 2000   # ms between history.csv checks when file events are missed
+
+
+class HistoryWriter:
+    """Appends history rows to a CSV file in batches from a background thread.
+
+    Durability modes:
+      buffered - rows stay in the file buffer until it fills, flush() or close()
+      flush    - every batch is handed to the OS (survives an app crash)
+      fsync    - every batch is also fsync'd to disk (survives a power loss)
+    """
+
+    DURABILITY_MODES = ("buffered", "flush", "fsync")
+
+    def __init__(self, path=HISTORY_FILE, batch_size=HISTORY_BATCH_SIZE,
+                 flush_interval=HISTORY_FLUSH_INTERVAL, durability=HISTORY_DURABILITY):
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._file = None
+
+    def write(self, row):
+        self._ensure_started()
+        self._queue.put(list(row))
+
+    def flush(self, timeout=5.0):
+        """Write everything queued so far and wait until it reaches the OS."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def pending(self):
+        """Rows (and flush requests) queued but not yet written."""
+        return self._queue.qsize()
+
+    def close(self, timeout=5.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()  # batch is old enough, write it
+
+            if item is None:
+                try:
+                    self._write_batch(pending, force=True)
+                finally:
+                    self._close_file()
+                return
+            if isinstance(item, threading.Event):
+                try:
+                    self._write_batch(pending, force=True)
+                finally:
+                    # flush() is waiting on this whatever happened to the batch
+                    pending, deadline = [], None
+                    item.set()
+                continue
+            if item:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) < self.batch_size:
+                    continue
+            self._write_batch(pending)
+            pending, deadline = [], None
+
+    def _write_batch(self, rows, force=False):
+        # A bad batch is dropped; the thread has to live on for later rows and flush() callers
+        try:
+            self._write_rows(rows, force)
+        except Exception as e:
+            print(f"Error writing history, {len(rows)} row(s) dropped: {e!r}")
+            self._close_file()
+
+    def _write_rows(self, rows, force=False):
+        try:
+            if rows:
+                if self._file is None:
+                    self._file = open(self.path, "a", newline="")
+                csv.writer(self._file).writerows(rows)
+            if self._file is not None and (force or self.durability != "buffered"):
+                self._file.flush()
+                if self.durability == "fsync":
+                    os.fsync(self._file.fileno())
+        except OSError as e:
+            print(f"Error writing history: {e}")
+            self._close_file()
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+history_writer = HistoryWriter()
+atexit.register(history_writer.close)
+
+
 def log_history(cat, item):
-    from datetime import datetime
     now = datetime.now()
-    date = now.strftime("%Y-%m-%d")
-    time = now.strftime("%H:%M:%S")
-    with open("history.csv", "a", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow([cat, item, date, time])
+    row = [cat, item, now.strftime("%Y-%m-%d"), now.strftime("%H:%M:%S")]
+    history_writer.write(row)
+    event_bus.history_logged.emit(row)
 
 
 # ---------- MySQL Helper ----------
 def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",        # <-- your MySQL username
-        password="",        # <-- your MySQL password
-        database="hilom",   # <-- make sure this database exists
-        connection_timeout=5  # 5 second timeout
-    )
+    # Pooled; close() returns the connection to db_pool instead of disconnecting
+    return db_pool.get_connection()
+
+APPOINTMENT_OUTBOX_FILE = "appointment_outbox.jsonl"
+APPOINTMENT_DEAD_LETTER_FILE = "appointment_failed.jsonl"   # appointments that can never be inserted
+OUTBOX_RETRY_BASE = 2.0    # seconds before the first retry of a failed insert
+OUTBOX_RETRY_MAX = 300.0   # backoff doubles up to this cap while MySQL stays down
+
+
+def insert_appointment(info):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO appointments(
+                patient_name, age, contact, gender, address, concern,
+                doctor_id, hospital_id, schedule, time_slot,
+                consultation_type, price
+            )
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        """, (
+            info['name'], info['age'], info['contact'], info['gender'],
+            info['address'], info['concern'], info['doctor_id'],
+            info['hospital_id'], info['schedule'], info['time_slot'],
+            info['consultation_type'], info['price']
+        ))
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def is_transient_error(error):
+    """Connection-level failures worth retrying. Anything else (a constraint
+    violation, bad data, a malformed appointment) fails the same way every time."""
+    if isinstance(error, OSError):
+        return True
+    # Only a driver that is loaded can have raised a driver error. Don't import it
+    # here: if it is missing, that ImportError would end the outbox thread
+    driver = sys.modules.get("mysql.connector")
+    if driver is None:
+        return False
+    return isinstance(error, (driver.InterfaceError, driver.OperationalError, db_pool.PoolExhausted))
+
+
+class AppointmentOutbox(QObject):
+    """Appointments waiting to be inserted into MySQL.
+
+    submit() writes the appointment to a local JSON-lines outbox and returns
+    straight away; a background thread inserts it, retrying with exponential
+    backoff while MySQL is unreachable. Anything still in the outbox when the
+    app exits is retried on the next start. An appointment that fails for any
+    other reason is moved to the dead-letter file so the ones behind it go through.
+    """
+
+    saved = pyqtSignal(dict)              # appointment info, once it is in MySQL
+    failed = pyqtSignal(dict, str, bool)  # appointment info, error, whether it will be retried
+
+    def __init__(self, path=APPOINTMENT_OUTBOX_FILE, insert=insert_appointment,
+                 retry_base=OUTBOX_RETRY_BASE, retry_max=OUTBOX_RETRY_MAX,
+                 dead_letter_path=APPOINTMENT_DEAD_LETTER_FILE):
+        super().__init__()
+        self.path = path
+        self.dead_letter_path = dead_letter_path
+        self.insert = insert
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._pending = None  # loaded from the outbox file on first use
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def submit(self, info):
+        info = dict(info)
+        with self._lock:
+            self._load()
+            self._pending.append(info)
+            self._append(info)
+        self.start()
+        self._wake.set()
+
+    def start(self):
+        """Start the retry thread; also resumes appointments left from a previous run."""
+        with self._lock:
+            self._load()
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="appointment-outbox", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        self._wake.set()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+
+    def pending_count(self):
+        with self._lock:
+            self._load()
+            return len(self._pending)
+
+    def _run(self):
+        delay = 0.0
+        while True:
+            with self._lock:
+                if self._stopping:
+                    return
+                info = self._pending[0] if self._pending else None
+            if info is None:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            try:
+                self.insert(info)
+            except Exception as e:
+                if not is_transient_error(e):
+                    print(f"Appointment can't be saved to MySQL: {e!r}. Moved to {self.dead_letter_path}.")
+                    with self._lock:
+                        self._dead_letter(info, e)
+                        self._pending.pop(0)
+                        self._rewrite()
+                    self.failed.emit(info, str(e), False)
+                    continue
+                delay = min(self.retry_max, delay * 2 if delay else self.retry_base)
+                print(f"Failed to save appointment to MySQL: {e}. Retrying in {delay:.0f}s.")
+                self.failed.emit(info, str(e), True)
+                # A new submission wakes us early, which is as good a time to retry as any
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+
+            delay = 0.0
+            with self._lock:
+                self._pending.pop(0)
+                self._rewrite()
+            print("Appointment saved to MySQL!")
+            self.saved.emit(info)
+
+    def _load(self):
+        if self._pending is not None:
+            return
+        self._pending = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self._pending.append(json.loads(line))
+                    except ValueError:
+                        # A line cut short by a crash mid-write
+                        print(f"Skipping unreadable outbox entry: {line[:40]}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error reading appointment outbox: {e}")
+
+    def _append(self, info):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(info) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Error writing appointment outbox: {e}")
+
+    def _dead_letter(self, info, error):
+        entry = {"info": info, "error": repr(error), "failed_at": datetime.now().isoformat(timespec="seconds")}
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Error writing {self.dead_letter_path}: {e}")
+
+    def _rewrite(self):
+        try:
+            if not self._pending:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for info in self._pending:
+                    f.write(json.dumps(info) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Error writing appointment outbox: {e}")
+
+
+appointment_outbox = AppointmentOutbox()
+
 
 def init_database():
-    # For now, skip MySQL initialization to avoid hanging
-    print("Skipping MySQL initialization for now.")
-    global MYSQL_AVAILABLE
-    MYSQL_AVAILABLE = False
-    print("Database initialization skipped. Appointments will be saved to history only.")
+    # MySQL is only reached from the outbox thread, so startup never waits on it
+    pending = appointment_outbox.pending_count()
+    if pending:
+        print(f"{pending} appointment(s) from the last session are waiting to be saved to MySQL.")
+    print("Appointments are saved to MySQL in the background.")
 
-MYSQL_AVAILABLE = True
 
 def save_appointment(info):
-    global MYSQL_AVAILABLE   # ✅ REQUIRED
+    # Never blocks on MySQL; the outbox thread does the insert and retries
+    appointment_outbox.submit(info)
 
-    if MYSQL_AVAILABLE:
+    # Always log to history; this also publishes it to the History page's Appointment tab
+    log_history("appointment", f"Appointment for {info['name']} - {info['consultation_type']} - ${info['price']}")
+
+# ---------- Quotes ----------
+QUOTES_FILE = "day-by-day.csv"
+QUOTE_ROTATE_INTERVAL = 60 * 60 * 1000   # ms between quote changes on the dashboard
+DEFAULT_QUOTE = ("Every day is a fresh start.", "")
+
+
+class QuoteStore:
+    """(quote, author) pairs from day-by-day.csv.
+
+    The file is parsed once and only re-read when its mtime/size change.
+    Some lines in it are two rows glued together with the next row's number
+    stuck to the author (`"Leonard Cohen"11,"Your present..."`); those are
+    split back into separate quotes.
+    """
+
+    def __init__(self, path=QUOTES_FILE):
+        self.path = path
+        self._stamp = None
+        self._quotes = ()
+
+    def _refresh(self):
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO appointments(
-                    patient_name, age, contact, gender, address, concern,
-                    doctor_id, hospital_id, schedule, time_slot,
-                    consultation_type, price
-                )
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """, (
-                info['name'], info['age'], info['contact'], info['gender'],
-                info['address'], info['concern'], info['doctor_id'],
-                info['hospital_id'], info['schedule'], info['time_slot'],
-                info['consultation_type'], info['price']
-            ))
-            conn.commit()
-            cursor.close()
-            conn.close()
-            print("Appointment saved to MySQL!")
+            st = os.stat(self.path)
+        except OSError:
+            self._stamp, self._quotes = None, ()
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+        quotes = []
+        try:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header and header[0].strip().lower() != "quote":
+                    reader = [header] + list(reader)  # no header line after all
+                for row in reader:
+                    fields = [field.strip() for field in row]
+                    for i in range(0, len(fields), 2):
+                        text = fields[i]
+                        author = fields[i + 1] if i + 1 < len(fields) else ""
+                        if i + 2 < len(fields):
+                            author = re.sub(r"\d+$", "", author).strip()
+                        if text:
+                            quotes.append((text, author))
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            print("Error reading CSV:", e)
+            return
+        self._quotes = tuple(quotes)
+        self._stamp = stamp
+
+    def __len__(self):
+        self._refresh()
+        return len(self._quotes)
+
+    def get(self, index):
+        self._refresh()
+        if not self._quotes:
+            return DEFAULT_QUOTE
+        return self._quotes[index % len(self._quotes)]
+
+    def index_for_day(self, day=None):
+        """Same quote all day, a different one tomorrow."""
+        day = day or datetime.now().date()
+        self._refresh()
+        return day.toordinal() % len(self._quotes) if self._quotes else 0
+
+
+quote_store = QuoteStore()
+
+
+# ---------- Favorites ----------
+FAVORITES_FILE = "favorites.csv"
+FAVORITES_COMPACT_MIN = 200     # compact once there are at least this many dead lines...
+FAVORITES_COMPACT_RATIO = 0.5   # ...making up at least this share of the file
+FAVORITE_REMOVED = "-"          # third column of a line that removes a favorite
+
+
+class FavoritesStore:
+    """Favorites per category, shared by every page.
+
+    favorites.csv is only ever appended to: `category,item` adds a favorite
+    and `category,item,-` removes it. Lines that no longer matter (removed
+    items, repeats) are counted while loading and the file is rewritten
+    once they outnumber the live ones, so adding a favorite never costs
+    more than one appended line.
+    """
+
+    def __init__(self, path=FAVORITES_FILE, compact_min=FAVORITES_COMPACT_MIN,
+                 compact_ratio=FAVORITES_COMPACT_RATIO):
+        self.path = path
+        self.compact_min = compact_min
+        self.compact_ratio = compact_ratio
+        self._items = None  # category -> {item: None}; a dict keeps insertion order
+        self._lines = 0
+        self._readable = True  # never compact a file we could not fully read
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._items is not None:
+            return
+        items, lines = {}, 0
+        try:
+            with open(self.path, "r", newline="") as f:
+                for row in csv.reader(f):
+                    if len(row) < 2:
+                        continue
+                    lines += 1
+                    if len(row) > 2 and row[2] == FAVORITE_REMOVED:
+                        items.get(row[0], {}).pop(row[1], None)
+                    else:
+                        items.setdefault(row[0], {})[row[1]] = None
+        except FileNotFoundError:
+            pass
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            print(f"Error reading favorites: {e}")
+            self._readable = False
+        self._items, self._lines = items, lines
+        self._maybe_compact()
+
+    def __contains__(self, key):
+        cat, item = key
+        with self._lock:
+            self._load()
+            return item in self._items.get(cat, ())
+
+    def items(self, cat):
+        with self._lock:
+            self._load()
+            return list(self._items.get(cat, ()))
+
+    def count(self, cat=None):
+        with self._lock:
+            self._load()
+            if cat is not None:
+                return len(self._items.get(cat, ()))
+            return sum(len(items) for items in self._items.values())
+
+    def add(self, cat, item):
+        """Returns False if it was already a favorite."""
+        with self._lock:
+            self._load()
+            items = self._items.setdefault(cat, {})
+            if item in items:
+                return False
+            items[item] = None
+            self._append([cat, item])
+        event_bus.favorite_added.emit(cat, item)
+        return True
+
+    def remove(self, cat, item):
+        with self._lock:
+            self._load()
+            items = self._items.get(cat, {})
+            if item not in items:
+                return False
+            del items[item]
+            self._append([cat, item, FAVORITE_REMOVED])
+            self._maybe_compact()
+        event_bus.favorite_removed.emit(cat, item)
+        return True
+
+    def reload(self):
+        """Forget what was loaded; the next use re-reads favorites.csv."""
+        with self._lock:
+            self._items, self._lines, self._readable = None, 0, True
+
+    def compact(self):
+        """Rewrite favorites.csv with one line per current favorite."""
+        with self._lock:
+            self._load()
+            self._compact()
+
+    def _append(self, row):
+        try:
+            with open(self.path, "a", newline="") as f:
+                csv.writer(f).writerow(row)
+            self._lines += 1
+        except OSError as e:
+            print(f"Error saving favorite: {e}")
+
+    def _maybe_compact(self):
+        if not self._readable:
+            return
+        live = sum(len(items) for items in self._items.values())
+        dead = self._lines - live
+        if dead >= self.compact_min and dead >= self.compact_ratio * self._lines:
+            self._compact()
+
+    def _compact(self):
+        if not self._readable:
+            print("Not compacting favorites: the file could not be read completely.")
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", newline="") as f:
+                writer = csv.writer(f)
+                for cat, items in self._items.items():
+                    writer.writerows([cat, item] for item in items)
+            os.replace(tmp, self.path)
+            self._lines = sum(len(items) for items in self._items.values())
+        except OSError as e:
+            print(f"Error compacting favorites: {e}")
+
+
+favorites_store = FavoritesStore()
 
-        except mysql.connector.Error as e:
-            print(f"Failed to save to MySQL: {e}. Saving to history only.")
-            MYSQL_AVAILABLE = False  # now safe ✅
-    else:
-        print("MySQL not available. Appointment details logged to history.")
-    
-    # Always log to history
-    log_history("appointment", f"Appointment for {info['name']} - {info['consultation_type']} - ${info['price']}")
 
 # ---------- Sample Data ----------
 HOSPITALS = [
-    {"id":1,"name":"South Haven Mental Wellness Center", "address":"Nasugbu, Batangas, Brgy Uno", "rating":4.5, "distance":"1.8 km", "open_hours":"7:00 AM - 10:00 PM"},
-    {"id":2,"name":"We Care Hospital", "address":"Nasugbu, Batangas, Brgy Dos", "rating":4.1, "distance":"2.3 km", "open_hours":"8:00 AM - 9:00 PM"},
-    {"id":3,"name":"Find Hope Clinic", "address":"Nasugbu, Batangas, Brgy Cinco", "rating":4.3, "distance":"3.5 km", "open_hours":"6:00 AM - 11:00 PM"},
+    {"id":1,"name":"South Haven Mental Wellness Center", "address":"Nasugbu, Batangas, Brgy Uno", "rating":4.5, "distance":"1.8 km", "open_hours":"7:00 AM - 10:00 PM",
+     "yearly_ratings":[(2020, 3.8), (2021, 4.1), (2022, 4.3), (2023, 4.5), (2024, 4.2), (2025, 4.7)]},
+    {"id":2,"name":"We Care Hospital", "address":"Nasugbu, Batangas, Brgy Dos", "rating":4.1, "distance":"2.3 km", "open_hours":"8:00 AM - 9:00 PM",
+     "yearly_ratings":[(2018, 3.5), (2019, 3.7), (2020, 3.6), (2021, 3.9), (2022, 4.0), (2023, 4.2), (2024, 4.0), (2025, 4.1)]},
+    {"id":3,"name":"Find Hope Clinic", "address":"Nasugbu, Batangas, Brgy Cinco", "rating":4.3, "distance":"3.5 km", "open_hours":"6:00 AM - 11:00 PM",
+     "yearly_ratings":[(2022, 4.0), (2023, 4.4), (2024, 4.2), (2025, 4.3)]},
 ]
 
 DOCTORS = [
@@ -116,6 +653,75 @@ class Petal:
             self.pos.setX(random.randint(0, max_width))
 
 
+# ---------- Petal Field ----------
+PETAL_COUNT = int(os.environ.get("HILOM_PETALS", "25"))   # petals falling on the journal page
+PETAL_FRAME_INTERVAL = 16   # ms per frame (~60 FPS) when NumPy is available
+PETAL_BASE_INTERVAL = 50    # ms per frame the Petal speeds were tuned for
+PETAL_MIN_SIZE, PETAL_MAX_SIZE = 10, 20
+PETAL_ANGLE_STEP = 10       # degrees between pre-rendered rotations
+PETAL_COLOR = QColor(255, 192, 203, 180)  # Pink, semi-transparent
+
+
+def build_petal_atlas():
+    """One pixmap holding every petal size (rows) at every rotation (columns)."""
+    cell = PETAL_MAX_SIZE + 4
+    sizes = PETAL_MAX_SIZE - PETAL_MIN_SIZE + 1
+    angles = 360 // PETAL_ANGLE_STEP
+    atlas = QPixmap(cell * angles, cell * sizes)
+    atlas.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(atlas)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setBrush(QBrush(PETAL_COLOR))
+    painter.setPen(Qt.PenStyle.NoPen)
+    for row in range(sizes):
+        w = PETAL_MIN_SIZE + row
+        h = w / 2
+        for col in range(angles):
+            painter.save()
+            painter.translate(col * cell + cell / 2, row * cell + cell / 2)
+            painter.rotate(col * PETAL_ANGLE_STEP)
+            painter.drawEllipse(QRectF(-w / 2, -h / 2, w, h))
+            painter.restore()
+    painter.end()
+    return atlas, cell
+
+
+class PetalField:
+    """All petals of the journal animation as NumPy arrays, moved in one step."""
+
+    def __init__(self, count, width, height, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.x = self.rng.uniform(0, width, count)
+        self.y = self.rng.uniform(0, height, count)
+        self.size = self.rng.integers(PETAL_MIN_SIZE, PETAL_MAX_SIZE + 1, count)
+        self.speed = self.rng.uniform(1, 3, count)
+        self.angle = self.rng.uniform(0, 360, count)
+
+    def __len__(self):
+        return len(self.x)
+
+    def step(self, width, height, dt=1.0):
+        """Advance one frame; dt is the frame length in Petal.fall() frames."""
+        n = len(self.x)
+        self.y += self.speed * dt
+        self.x += 0.5 * dt * self.rng.choice((-1.0, 1.0), n)
+        self.angle = (self.angle + 2 * dt) % 360
+
+        # Reset the ones that went off screen
+        gone = self.y > height
+        if gone.any():
+            self.y[gone] = -10
+            self.x[gone] = self.rng.uniform(0, max(width, 1), int(gone.sum()))
+
+    def fragments(self, cell):
+        """Where to draw each petal and which atlas cell to draw it from."""
+        cols = (self.angle // PETAL_ANGLE_STEP).astype(int) * cell
+        rows = (self.size - PETAL_MIN_SIZE) * cell
+        create = QPainter.PixmapFragment.create
+        return [create(QPointF(x, y), QRectF(sx, sy, cell, cell))
+                for x, y, sx, sy in zip(self.x.tolist(), self.y.tolist(), cols.tolist(), rows.tolist())]
+
+
 # ==========================================
 #  PAGE 1: DASHBOARD (HOME)
 # ==========================================
@@ -215,31 +821,165 @@ class DashboardPage(QWidget):
         q_layout = QVBoxLayout(quote_card)
         q_layout.setContentsMargins(20, 20, 20, 20)
 
-        # Quote Logic
-        quotes = []
-        try:
-            if os.path.exists("day-by-day.csv"):
-                with open("day-by-day.csv", newline="", encoding="utf-8") as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if row: quotes.append(row[0].strip())
-        except Exception as e:
-            print("Error reading CSV:", e)
-
-        selected_quote = random.choice(quotes) if quotes else "Every day is a fresh start."
+        # Quote Logic - today's quote, moving on to the next one every QUOTE_ROTATE_INTERVAL
+        self.quote_index = quote_store.index_for_day()
 
-        quote_label = QLabel(f'"{selected_quote}"')
-        quote_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Medium))
-        quote_label.setWordWrap(True)
-        quote_label.setStyleSheet("color: #37474f; background: transparent;")
-        q_layout.addWidget(quote_label)
+        self.quote_label = QLabel()
+        self.quote_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Medium))
+        self.quote_label.setWordWrap(True)
+        self.quote_label.setStyleSheet("color: #37474f; background: transparent;")
+        q_layout.addWidget(self.quote_label)
 
-        source_label = QLabel("— Daily Inspiration")
-        source_label.setStyleSheet("color: #78909c; font-size: 12px; background: transparent;")
-        q_layout.addWidget(source_label)
+        self.source_label = QLabel()
+        self.source_label.setStyleSheet("color: #78909c; font-size: 12px; background: transparent;")
+        q_layout.addWidget(self.source_label)
 
         self.layout.addWidget(quote_card)
         self.layout.addStretch()
+        self.show_quote()
+
+        self.quote_timer = QTimer(self)
+        self.quote_timer.timeout.connect(self.next_quote)
+        self.quote_timer.start(QUOTE_ROTATE_INTERVAL)
+
+    def show_quote(self):
+        text, author = quote_store.get(self.quote_index)
+        self.quote_label.setText(f'"{text}"')
+        self.source_label.setText(f"— {author or 'Daily Inspiration'}")
+
+    def next_quote(self):
+        self.quote_index += 1
+        self.show_quote()
+
+
+# ---------- Frame Timing ----------
+FRAME_STATS_SAMPLES = 120   # frames averaged by FrameTimer
+SHOW_FRAME_STATS = os.environ.get("HILOM_FRAME_STATS") == "1"   # print paint times to the console
+
+
+class FrameTimer:
+    """Rolling paint-time statistics for an animated widget, in milliseconds."""
+
+    def __init__(self, name, samples=FRAME_STATS_SAMPLES, report=SHOW_FRAME_STATS):
+        self.name = name
+        self.samples = deque(maxlen=samples)
+        self.report = report
+        self._start = None
+        self._frames = 0
+
+    def begin(self):
+        self._start = time.perf_counter()
+
+    def end(self):
+        if self._start is None:
+            return
+        self.samples.append((time.perf_counter() - self._start) * 1000.0)
+        self._start = None
+        self._frames += 1
+        if self.report and self._frames % self.samples.maxlen == 0:
+            print(f"{self.name}: {self.average_ms():.2f} ms/frame avg, {self.worst_ms():.2f} ms worst")
+
+    def average_ms(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def worst_ms(self):
+        return max(self.samples) if self.samples else 0.0
+
+
+# ---------- Heartbeat ----------
+class HeartbeatTimer(QObject):
+    """Writes the heartbeat the admin panel reads (see heartbeat.py) from the
+    event loop. How late each tick fires is the event-loop lag."""
+
+    def __init__(self, beat, interval=heartbeat.HEARTBEAT_INTERVAL, parent=None):
+        super().__init__(parent)
+        self.beat = beat
+        self.interval = interval
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self._last = None
+
+    def start(self):
+        self._last = time.monotonic()
+        self.timer.start(self.interval)
+
+    def stop(self):
+        self.timer.stop()
+        self.beat.close()
+
+    def tick(self):
+        now = time.monotonic()
+        lag_ms = max(0.0, (now - self._last) * 1000.0 - self.interval)
+        self._last = now
+        self.beat.beat(lag_ms)
+
+
+# ---------- Animation Scheduler ----------
+class AnimationScheduler(QObject):
+    """Runs animation timers only while their widget is on screen.
+
+    Pages register(widget, timer) instead of starting the timer themselves.
+    The timer is started when the widget is shown and stopped when it is
+    hidden (another page in a stack is selected) or the window is minimized.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._animations = {}  # id(widget) -> (widget, timer)
+        self._on_destroyed = {}  # id(widget) -> slot connected to widget.destroyed
+        self._paused = False
+
+    def register(self, widget, timer):
+        key = id(widget)
+        if key not in self._animations:
+            self._animations[key] = (widget, timer)
+            widget.installEventFilter(self)
+            self._on_destroyed[key] = lambda *_, key=key: self._forget(key)
+            widget.destroyed.connect(self._on_destroyed[key])
+        self._update(widget, timer)
+
+    def unregister(self, widget):
+        """Stop and forget a widget's animation, e.g. once it has played to the end."""
+        key = id(widget)
+        entry = self._animations.get(key)
+        if entry is not None:
+            widget.removeEventFilter(self)
+            widget.destroyed.disconnect(self._on_destroyed[key])
+            self._forget(key)
+            entry[1].stop()
+
+    def _forget(self, key):
+        self._animations.pop(key, None)
+        self._on_destroyed.pop(key, None)
+
+    def set_paused(self, paused):
+        # Window minimized/restored
+        self._paused = paused
+        for widget, timer in list(self._animations.values()):
+            self._update(widget, timer)
+
+    def active_count(self):
+        return sum(1 for _, timer in self._animations.values() if timer.isActive())
+
+    def registered_count(self):
+        return len(self._animations)
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.Show, QEvent.Type.Hide):
+            entry = self._animations.get(id(obj))
+            if entry is not None and entry[0] is obj:
+                self._update(obj, entry[1])
+        return False
+
+    def _update(self, widget, timer):
+        running = not self._paused and widget.isVisible()
+        if running and not timer.isActive():
+            timer.start()
+        elif not running and timer.isActive():
+            timer.stop()
+
+
+animation_scheduler = AnimationScheduler()
 
 
 # ==========================================
@@ -250,16 +990,27 @@ class JournalPage(QWidget):
         super().__init__()
         self.setStyleSheet("background: transparent;")
 
-        # Background Image Loading
+        # Background Image Loading - scaled once per widget size in resizeEvent, not every frame
         self.bg_pixmap = QPixmap("cherry-blossom.jpg")
-
-        # Petal Animation Setup
-        self.petals = [
-            Petal(random.randint(0, 800), random.randint(0, 600), random.randint(10, 20), random.uniform(1, 3)) for _ in
-            range(25)]
+        self.bg_cache = None
+        self.frame_timer = FrameTimer("JournalPage")
+
+        # Petal Animation Setup - one vectorized field drawn from a sprite atlas, or Petal objects without NumPy
+        if np is not None:
+            self.petal_field = PetalField(PETAL_COUNT, 800, 600)
+            self.petal_atlas, self.petal_cell = build_petal_atlas()
+            self.petals = []
+            interval = PETAL_FRAME_INTERVAL
+        else:
+            self.petal_field = None
+            self.petals = [
+                Petal(random.randint(0, 800), random.randint(0, 600), random.randint(10, 20), random.uniform(1, 3)) for _ in
+                range(PETAL_COUNT)]
+            interval = PETAL_BASE_INTERVAL
         self.timer = QTimer(self)
+        self.timer.setInterval(interval)
         self.timer.timeout.connect(self.update_animation)
-        self.timer.start(50)  # ~20 FPS
+        animation_scheduler.register(self, self.timer)  # only ticks while the page is shown
 
         self.setup_ui()
 
@@ -355,22 +1106,43 @@ class JournalPage(QWidget):
         # Trigger a repaint to move petals
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-
-        # 1. Draw Background
+    def render_background(self):
+        # Scale and center the photo once for the current size; paintEvent just blits it
+        cache = QPixmap(self.size())
+        cache.fill(QColor("#e0f2f7"))
         if not self.bg_pixmap.isNull():
             scaled_bg = self.bg_pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding,
                                               Qt.TransformationMode.SmoothTransformation)
             # Center the image
             x = (self.width() - scaled_bg.width()) // 2
             y = (self.height() - scaled_bg.height()) // 2
+            painter = QPainter(cache)
             painter.drawPixmap(x, y, scaled_bg)
-        else:
-            painter.fillRect(self.rect(), QColor("#e0f2f7"))
+            painter.end()
+        self.bg_cache = cache
+
+    def resizeEvent(self, event):
+        self.render_background()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        self.frame_timer.begin()
+        if self.bg_cache is None or self.bg_cache.size() != self.size():
+            self.render_background()
+        painter = QPainter(self)
+
+        # 1. Draw Background
+        painter.drawPixmap(0, 0, self.bg_cache)
 
         # 2. Draw Petals
-        brush = QBrush(QColor(255, 192, 203, 180))  # Pink, semi-transparent
+        if self.petal_field is not None:
+            painter.drawPixmapFragments(self.petal_field.fragments(self.petal_cell), self.petal_atlas)
+            painter.end()
+            self.petal_field.step(self.width(), self.height(), self.timer.interval() / PETAL_BASE_INTERVAL)
+            self.frame_timer.end()
+            return
+
+        brush = QBrush(PETAL_COLOR)
         painter.setBrush(brush)
         painter.setPen(Qt.PenStyle.NoPen)
 
@@ -386,6 +1158,9 @@ class JournalPage(QWidget):
             # Update petal position for next frame
             petal.fall(self.width(), self.height())
 
+        painter.end()
+        self.frame_timer.end()
+
     def save_journal(self):
         content = self.main_text.toPlainText()
         if not content.strip():
@@ -399,6 +1174,119 @@ class JournalPage(QWidget):
         self.main_text.clear()
 
 
+# ---------- History / Favorite list models ----------
+def pack_timestamp(date, time):
+    """Pack "YYYY-MM-DD" and "HH:MM:SS" into one int (YYYYMMDDHHMMSS), 0 if malformed."""
+    digits = date.replace("-", "") + time.replace(":", "")
+    return int(digits) if len(digits) == 14 and digits.isdigit() else 0
+
+
+def format_timestamp(packed):
+    s = str(packed)
+    return f"{s[0:4]}-{s[4:6]}-{s[6:8]} {s[8:10]}:{s[10:12]}:{s[12:14]}"
+
+
+class HistoryStore:
+    """Columnar store for history/favorite rows.
+
+    Each row costs one byte of category code, four bytes of interned title id
+    and eight bytes of packed timestamp, instead of one Qt item object.
+    """
+
+    CATEGORIES = ("music", "video", "podcast", "book", "journal", "appointment")
+    CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORIES)}
+
+    def __init__(self):
+        self.categories = array("B")
+        self.title_ids = array("I")
+        self.timestamps = array("q")
+        self.titles = []
+        self._title_ids = {}
+
+    def __len__(self):
+        return len(self.categories)
+
+    def append(self, cat, title, timestamp=0):
+        title_id = self._title_ids.get(title)
+        if title_id is None:
+            title_id = self._title_ids[title] = len(self.titles)
+            self.titles.append(title)
+        self.categories.append(self.CATEGORY_CODES[cat])
+        self.title_ids.append(title_id)
+        self.timestamps.append(timestamp)
+        return len(self.categories) - 1
+
+    def clear(self):
+        self.__init__()
+
+    def category(self, row):
+        return self.CATEGORIES[self.categories[row]]
+
+    def title(self, row):
+        return self.titles[self.title_ids[row]]
+
+    def timestamp(self, row):
+        return self.timestamps[row]
+
+
+class HistoryListModel(QAbstractListModel):
+    """List model over the rows of one category in a HistoryStore.
+
+    Only row indexes are kept here; display text is built on demand for the
+    rows the view actually paints.
+    """
+
+    def __init__(self, store, show_time=True, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.show_time = show_time
+        self.rows = array("I")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.rows[index.row()]
+        title = self.store.title(row)
+        timestamp = self.store.timestamp(row)
+        if self.show_time and timestamp:
+            return f"{title} - {format_timestamp(timestamp)}"
+        return title
+
+    def append_rows(self, rows):
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def remove_row(self, row):
+        """Take one store row out of the list; False if it isn't shown."""
+        try:
+            position = self.rows.index(row)
+        except ValueError:
+            return False
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self.rows[position]
+        self.endRemoveRows()
+        return True
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows = array("I")
+        self.endResetModel()
+
+
+def make_history_view(model):
+    view = QListView()
+    view.setUniformItemSizes(True)  # lets Qt skip measuring every row
+    view.setModel(model)
+    return view
+
+
 # ---------- Favorite Page ----------
 class FavoritePage(QWidget):
     def __init__(self):
@@ -462,11 +1350,15 @@ class FavoritePage(QWidget):
         self.content_layout.setContentsMargins(20, 20, 20, 20)
 
         # Lists for each tab
-        self.music_list = QListWidget()
-        self.video_list = QListWidget()
-        self.podcast_list = QListWidget()
-        self.book_list = QListWidget()
-        self.journal_list = QListWidget()
+        self.store = HistoryStore()
+        self.favorite_rows = {}  # (category, item) -> its row in self.store
+        self.category_models = {cat: HistoryListModel(self.store, show_time=False, parent=self)
+                                for cat in ("music", "video", "podcast", "book", "journal")}
+        self.music_list = make_history_view(self.category_models["music"])
+        self.video_list = make_history_view(self.category_models["video"])
+        self.podcast_list = make_history_view(self.category_models["podcast"])
+        self.book_list = make_history_view(self.category_models["book"])
+        self.journal_list = make_history_view(self.category_models["journal"])
 
         # Placeholder content
         self.placeholder = QLabel("No favorite content loaded yet")
@@ -477,9 +1369,13 @@ class FavoritePage(QWidget):
 
         self.layout.addWidget(self.content_frame)
 
+        self.current_tab = "Music"
         self.load_favorites()
+        event_bus.favorite_added.connect(self.on_favorite_added)
+        event_bus.favorite_removed.connect(self.on_favorite_removed)
 
     def select_tab(self, tab_name):
+        self.current_tab = tab_name
         for name, btn in self.tabs.items():
             if name == tab_name:
                 btn.setStyleSheet("""
@@ -512,51 +1408,75 @@ class FavoritePage(QWidget):
         
         # Add the appropriate list
         if tab_name == "Music":
-            if self.music_list.count() > 0:
+            if self.music_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.music_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
                 self.placeholder.setText("No favorite music loaded yet")
         elif tab_name == "Video":
-            if self.video_list.count() > 0:
+            if self.video_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.video_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
                 self.placeholder.setText("No favorite videos loaded yet")
         elif tab_name == "Podcast":
-            if self.podcast_list.count() > 0:
+            if self.podcast_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.podcast_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
                 self.placeholder.setText("No favorite podcasts loaded yet")
         elif tab_name == "Book":
-            if self.book_list.count() > 0:
+            if self.book_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.book_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
                 self.placeholder.setText("No favorite books loaded yet")
         elif tab_name == "Journal":
-            if self.journal_list.count() > 0:
+            if self.journal_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.journal_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
                 self.placeholder.setText("No favorite journals loaded yet")
 
+    def store_row(self, cat, item):
+        # A favorite keeps its store row across remove and re-add, so the store
+        # only grows with favorites never seen before
+        row = self.favorite_rows.get((cat, item))
+        if row is None:
+            row = self.favorite_rows[(cat, item)] = self.store.append(cat, item)
+        return row
+
     def load_favorites(self):
-        try:
-            with open("favorites.csv", "r") as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) == 2:
-                        cat, item = row
-                        if cat == "music":
-                            self.music_list.addItem(QListWidgetItem(item))
-                        elif cat == "video":
-                            self.video_list.addItem(QListWidgetItem(item))
-                        elif cat == "book":
-                            self.book_list.addItem(QListWidgetItem(item))
-        except FileNotFoundError:
-            pass
+        for cat, model in self.category_models.items():
+            rows = array("I", (self.store_row(cat, item) for item in favorites_store.items(cat)))
+            if rows:
+                model.append_rows(rows)
+
+    def reload(self):
+        self.store.clear()
+        self.favorite_rows.clear()
+        for model in self.category_models.values():
+            model.clear()
+        self.load_favorites()
+        self.select_tab(self.current_tab)
+
+    def on_favorite_added(self, cat, item):
+        model = self.category_models.get(cat)
+        if model is None:
+            return
+        model.append_rows(array("I", [self.store_row(cat, item)]))
+        if cat == self.current_tab.lower() and model.rowCount() == 1:
+            self.select_tab(self.current_tab)  # swap the placeholder for the list
+
+    def on_favorite_removed(self, cat, item):
+        model = self.category_models.get(cat)
+        if model is None:
+            return
+        row = self.favorite_rows.get((cat, item))
+        if row is None or not model.remove_row(row):
+            return
+        if cat == self.current_tab.lower() and model.rowCount() == 0:
+            self.select_tab(self.current_tab)  # swap the list for the placeholder
 
 
 # ---------- History Page ----------
@@ -622,10 +1542,14 @@ class HistoryPage(QWidget):
         self.content_layout.setContentsMargins(20, 20, 20, 20)
 
         # Lists for each tab
-        self.music_list = QListWidget()
-        self.video_list = QListWidget()
-        self.journal_list = QListWidget()
-        self.appointment_list = QListWidget()
+        self.store = HistoryStore()
+        self.category_models = {cat: HistoryListModel(self.store, parent=self)
+                                for cat in ("music", "video", "journal", "appointment")}
+        self.music_list = make_history_view(self.category_models["music"])
+        self.video_list = make_history_view(self.category_models["video"])
+        self.journal_list = make_history_view(self.category_models["journal"])
+        self.appointment_list = make_history_view(self.category_models["appointment"])
+        self.current_tab = "Music"
 
         # Placeholder content
         self.placeholder = QLabel("No history loaded yet")
@@ -636,9 +1560,30 @@ class HistoryPage(QWidget):
 
         self.layout.addWidget(self.content_frame)
 
+        # Follow history.csv: only rows appended after history_offset get parsed
+        self.history_offset = 0
+        self.history_file_id = None  # (device, inode) of the file history_offset refers to
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.load_history)
+        self.watcher.directoryChanged.connect(self.load_history)
+        self.watcher.addPath(os.path.dirname(os.path.abspath(HISTORY_FILE)))
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.load_history)
+        self.poll_timer.start(HISTORY_POLL_INTERVAL)
+
+        # Rows logged in this process show up right away through the event bus;
+        # they are counted here so the copy read back from history.csv is skipped
+        self.pending_rows = Counter()
+        event_bus.history_logged.connect(self.on_history_logged)
+
+        self.load_history()
+
+    def showEvent(self, event):
+        super().showEvent(event)
         self.load_history()
 
     def select_tab(self, tab_name):
+        self.current_tab = tab_name
         for name, btn in self.tabs.items():
             if name == tab_name:
                 btn.setStyleSheet("""
@@ -671,25 +1616,25 @@ class HistoryPage(QWidget):
         
         # Add the appropriate list
         if tab_name == "Music":
-            if self.music_list.count() > 0:
+            if self.music_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.music_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
                 self.placeholder.setText("No music history yet")
         elif tab_name == "Video":
-            if self.video_list.count() > 0:
+            if self.video_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.video_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
                 self.placeholder.setText("No video history yet")
         elif tab_name == "Journal":
-            if self.journal_list.count() > 0:
+            if self.journal_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.journal_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
                 self.placeholder.setText("No journal history yet")
         elif tab_name == "Appointment":
-            if self.appointment_list.count() > 0:
+            if self.appointment_list.model().rowCount() > 0:
                 self.content_layout.addWidget(self.appointment_list)
             else:
                 self.content_layout.addWidget(self.placeholder)
@@ -697,22 +1642,73 @@ class HistoryPage(QWidget):
 
     def load_history(self):
         try:
-            with open("history.csv", "r") as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) == 4:
-                        cat, item, date, time = row
-                        entry = f"{item} - {date} {time}"
-                        if cat == "music":
-                            self.music_list.addItem(QListWidgetItem(entry))
-                        elif cat == "video":
-                            self.video_list.addItem(QListWidgetItem(entry))
-                        elif cat == "journal":
-                            self.journal_list.addItem(QListWidgetItem(entry))
-                        elif cat == "appointment":
-                            self.appointment_list.addItem(QListWidgetItem(entry))
-        except FileNotFoundError:
-            pass
+            st = os.stat(HISTORY_FILE)
+        except OSError:
+            return
+        size, file_id = st.st_size, (st.st_dev, st.st_ino)
+        path = os.path.abspath(HISTORY_FILE)
+        if path not in self.watcher.files():
+            self.watcher.addPath(path)
+
+        replaced = self.history_file_id is not None and file_id != self.history_file_id
+        self.history_file_id = file_id
+        if size < self.history_offset or replaced:
+            # File was truncated or replaced, start over
+            self.history_offset = 0
+            self.pending_rows.clear()  # the rows shown so far are dropped with the store
+            self.store.clear()
+            for model in self.category_models.values():
+                model.clear()
+        if size == self.history_offset:
+            return
+
+        try:
+            with open(HISTORY_FILE, "rb") as f:
+                f.seek(self.history_offset)
+                chunk = f.read(size - self.history_offset)
+        except OSError as e:
+            print("Error reading history:", e)
+            return
+
+        # Leave a half-written last line for the next round
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return
+        chunk = chunk[:end + 1]
+        self.history_offset += len(chunk)
+
+        text = chunk.decode(locale.getpreferredencoding(False), errors="replace")
+        rows = []
+        for row in csv.reader(io.StringIO(text, newline="")):
+            if len(row) != 4:
+                continue
+            key = tuple(row)
+            if self.pending_rows[key]:
+                # Already shown via the bus
+                self.pending_rows[key] -= 1
+                if not self.pending_rows[key]:
+                    del self.pending_rows[key]
+                continue
+            rows.append(row)
+        self.add_rows(rows)
+
+    def on_history_logged(self, row):
+        self.pending_rows[tuple(row)] += 1
+        self.add_rows([row])
+
+    def add_rows(self, rows):
+        current = self.category_models.get(self.current_tab.lower())
+        was_empty = current is not None and current.rowCount() == 0
+        new_rows = {}
+        for cat, item, date, time in rows:
+            if cat in self.category_models:
+                new_rows.setdefault(cat, array("I")).append(
+                    self.store.append(cat, item, pack_timestamp(date, time)))
+        for cat, rows in new_rows.items():
+            self.category_models[cat].append_rows(rows)
+
+        if was_empty and current.rowCount() > 0:
+            self.select_tab(self.current_tab)
 
 
 # ---------- Profile Page ----------
@@ -1229,34 +2225,70 @@ class HospitalList(QWidget):
         layout.addWidget(scroll); layout.addWidget(back, alignment=Qt.AlignRight)
         self.setLayout(layout)
 
-class HospitalDetail(QWidget):
-    def __init__(self, hospital, goto_doctors_cb, back_cb):
+class RatingChart(QWidget):
+    """Year-over-year rating line chart that draws itself in over time.
+
+    The frame (title, axes, scale, year labels) is rendered once per series
+    into a cached pixmap; each animation tick only draws the part of the
+    line reached so far (set_progress) on top of it.
+    """
+
+    LEFT, RIGHT, TOP, BOTTOM = 80, 420, 30, 120   # plot area; BOTTOM is the x-axis
+    PX_PER_STAR = 18
+    MAX_YEAR_LABELS = 8
+
+    def __init__(self, width=500, height=150, title="Year-over-Year Patient Satisfaction"):
         super().__init__()
-        self.hospital = hospital
-        self.goto_doctors_cb = goto_doctors_cb
-        self.back_cb = back_cb
-        # Year-over-year ratings data (2020-2025)
-        self.yearly_ratings = [3.8, 4.1, 4.3, 4.5, 4.2, 4.7]  # Sample ratings for each year
+        self.setFixedSize(width, height)
+        self.title = title
+        self.years = []
+        self.ratings = []
+        self.points = []
+        self.labels = []
         self.progress = 0.0
-        self._build()
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.animate_graph)
-        self.timer.start(50)
+        self.frame = None
+        self.line_pen = QPen(Qt.blue, 3)
+        self.point_pen = QPen(Qt.red, 1)
+        self.text_pen = QPen(Qt.black, 1)
+        self.value_font = QFont("Arial", 9)
+
+    def set_series(self, series):
+        """series: [(year, rating), ...] in year order, any length."""
+        years = [year for year, _ in series]
+        self.ratings = [rating for _, rating in series]
+        if years != self.years:
+            self.years = years
+            self.frame = None
+        step = (self.RIGHT - self.LEFT) / (len(series) - 1) if len(series) > 1 else 0
+        self.points = [QPointF(self.LEFT + i * step, self.BOTTOM - rating * self.PX_PER_STAR)
+                       for i, rating in enumerate(self.ratings)]
+        self.labels = [f"{rating}★" for rating in self.ratings]
+        self.set_progress(0.0)
+
+    def segment_count(self):
+        return max(len(self.points) - 1, 0)
+
+    def set_progress(self, progress):
+        # progress counts line segments drawn: 2.5 = two segments and half of the third
+        self.progress = min(progress, self.segment_count())
+        self.update()
 
-    def draw_graph(self):
-        pixmap = QPixmap(500, 150)
-        pixmap.fill(Qt.white)
-        painter = QPainter(pixmap)
+    def render_frame(self):
+        frame = QPixmap(self.size())
+        frame.fill(Qt.white)
+        painter = QPainter(frame)
+        painter.setPen(QPen(QColor("#e0e0e0"), 2))
+        painter.drawRoundedRect(1, 1, self.width() - 2, self.height() - 2, 10, 10)
 
         # Title
         painter.setPen(QPen(Qt.black, 1))
         painter.setFont(QFont("Arial", 12, QFont.Bold))
-        painter.drawText(180, 20, "Year-over-Year Patient Satisfaction")
+        painter.drawText(QRectF(0, 5, self.width(), 20), Qt.AlignmentFlag.AlignHCenter, self.title)
 
         # Draw axes
         painter.setPen(QPen(Qt.black, 2))
-        painter.drawLine(50, 120, 450, 120)  # x-axis
-        painter.drawLine(50, 30, 50, 120)    # y-axis
+        painter.drawLine(50, self.BOTTOM, 450, self.BOTTOM)  # x-axis
+        painter.drawLine(50, self.TOP, 50, self.BOTTOM)      # y-axis
 
         # Axis labels
         painter.setFont(QFont("Arial", 10))
@@ -1266,90 +2298,107 @@ class HospitalDetail(QWidget):
         # Y-axis scale (1-5 stars)
         painter.setPen(QPen(Qt.gray, 1))
         for i in range(1, 6):
-            y = 120 - (i * 18)
+            y = self.BOTTOM - (i * self.PX_PER_STAR)
             painter.drawLine(45, y, 50, y)
             painter.drawText(30, y + 5, str(i))
 
-        # X-axis years
-        years = ["2020", "2021", "2022", "2023", "2024", "2025"]
-        for i, year in enumerate(years):
-            x = 80 + (i * 60)
-            painter.drawLine(x, 115, x, 120)
-            painter.drawText(x - 15, 135, year)
-
-        # Convert ratings to points (rating 1-5 mapped to y-coordinates)
-        points = []
-        for i, rating in enumerate(self.yearly_ratings):
-            x = 80 + (i * 60)
-            y = 120 - (rating * 18)  # 18 pixels per rating point
-            points.append((x, y))
-
-        # Draw lines smoothly
-        painter.setPen(QPen(Qt.blue, 3))
-        for i in range(len(points) - 1):
-            if i < int(self.progress):
-                painter.drawLine(int(points[i][0]), int(points[i][1]), int(points[i + 1][0]), int(points[i + 1][1]))
-            elif i == int(self.progress):
-                frac = self.progress - int(self.progress)
-                x2 = int(points[i][0] + frac * (points[i + 1][0] - points[i][0]))
-                y2 = int(points[i][1] + frac * (points[i + 1][1] - points[i][1]))
-                painter.drawLine(int(points[i][0]), int(points[i][1]), x2, y2)
-
-        # Draw points up to current progress
-        painter.setPen(QPen(Qt.red, 1))
-        painter.setBrush(Qt.red)
-        for i in range(int(self.progress) + 1):
-            if i < len(points):
-                painter.drawEllipse(int(points[i][0]) - 4, int(points[i][1]) - 4, 8, 8)
+        # X-axis years; long series only label every few years
+        every = max(1, -(-len(self.years) // self.MAX_YEAR_LABELS))
+        step = (self.RIGHT - self.LEFT) / (len(self.years) - 1) if len(self.years) > 1 else 0
+        for i, year in enumerate(self.years):
+            x = int(self.LEFT + i * step)
+            painter.drawLine(x, self.BOTTOM - 5, x, self.BOTTOM)
+            if i % every == 0:
+                painter.drawText(x - 15, 135, str(year))
+        painter.end()
+        self.frame = frame
 
-        # Draw rating values above points
-        painter.setPen(QPen(Qt.black, 1))
-        painter.setFont(QFont("Arial", 9))
-        for i in range(int(self.progress) + 1):
-            if i < len(self.yearly_ratings):
-                rating_text = f"{self.yearly_ratings[i]}★"
-                painter.drawText(int(points[i][0]) - 10, int(points[i][1]) - 10, rating_text)
+    def paintEvent(self, event):
+        if self.frame is None or self.frame.size() != self.size():
+            self.render_frame()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.frame)
+        if not self.points:
+            return
 
+        done = int(self.progress)
+        painter.setPen(self.line_pen)
+        for i in range(min(done, self.segment_count())):
+            painter.drawLine(self.points[i], self.points[i + 1])
+        if done < self.segment_count():
+            start, end = self.points[done], self.points[done + 1]
+            frac = self.progress - done
+            painter.drawLine(start, start + (end - start) * frac)
+
+        # Points and their ratings up to current progress
+        painter.setPen(self.point_pen)
+        painter.setBrush(Qt.red)
+        for point in self.points[:done + 1]:
+            painter.drawEllipse(point, 4, 4)
+        painter.setPen(self.text_pen)
+        painter.setFont(self.value_font)
+        for point, label in zip(self.points[:done + 1], self.labels):
+            painter.drawText(int(point.x()) - 10, int(point.y()) - 10, label)
         painter.end()
-        self.graph.setPixmap(pixmap)
+
+
+class HospitalDetail(QWidget):
+    def __init__(self, hospital, goto_doctors_cb, back_cb):
+        super().__init__()
+        self.goto_doctors_cb = goto_doctors_cb
+        self.back_cb = back_cb
+        self.progress = 0.0
+        self.timer = QTimer(self)
+        self.timer.setInterval(50)
+        self.timer.timeout.connect(self.animate_graph)
+        self._build()
+        self.set_hospital(hospital)
+
+    def set_hospital(self, hospital):
+        """Show another hospital on this page and replay the graph animation."""
+        self.hospital = hospital
+        self.name_label.setText(hospital['name'])
+        self.addr_label.setText(hospital['address'])
+        self.hours_label.setText(f"🕐 Operating Hours: {hospital['open_hours']}")
+        rating_value = round(hospital['rating'] + random.uniform(-0.2,0.2),1)
+        self.yearly_ratings = [rating for _, rating in hospital['yearly_ratings']]
+        self.rating_label.setText(f"★ {rating_value} ({len(self.yearly_ratings)} reviews)")
+        self.progress = 0.0
+        self.graph.set_series(hospital['yearly_ratings'])
+        animation_scheduler.register(self, self.timer)
 
     def animate_graph(self):
         self.progress += 0.1
-        self.draw_graph()
-        if self.progress >= len(self.yearly_ratings) - 1:
-            self.timer.stop()
+        self.graph.set_progress(self.progress)
+        if self.progress >= self.graph.segment_count():
+            animation_scheduler.unregister(self)
 
     def _build(self):
         layout = QVBoxLayout()
         layout.setContentsMargins(40, 40, 40, 40)
         layout.setSpacing(20)
 
-        # Hospital name and rating
-        name = QLabel(self.hospital['name'])
-        name.setFont(QFont("Segoe UI", 24, QFont.Weight.Bold))
-        name.setStyleSheet("color: #1f2d3d; background: transparent;")
+        # Hospital name and rating (text filled in by set_hospital)
+        self.name_label = QLabel()
+        self.name_label.setFont(QFont("Segoe UI", 24, QFont.Weight.Bold))
+        self.name_label.setStyleSheet("color: #1f2d3d; background: transparent;")
 
-        addr = QLabel(self.hospital['address'])
-        addr.setStyleSheet('color:#666; font-size:14px; background: transparent;')
+        self.addr_label = QLabel()
+        self.addr_label.setStyleSheet('color:#666; font-size:14px; background: transparent;')
 
-        hours = QLabel(f"🕐 Operating Hours: {self.hospital['open_hours']}")
-        hours.setStyleSheet('color:#666; font-size:14px; margin-top:5px; background: transparent;')
+        self.hours_label = QLabel()
+        self.hours_label.setStyleSheet('color:#666; font-size:14px; margin-top:5px; background: transparent;')
 
         top_row = QHBoxLayout()
-        top_row.addWidget(name)
+        top_row.addWidget(self.name_label)
         top_row.addStretch()
 
-        rating_value = round(self.hospital['rating'] + random.uniform(-0.2,0.2),1)
-        rating = QLabel(f"★ {rating_value} ({len(self.yearly_ratings)} reviews)")
-        rating.setStyleSheet('font-size:18px; color:#c79f10; background: transparent;')
-        top_row.addWidget(rating)
+        self.rating_label = QLabel()
+        self.rating_label.setStyleSheet('font-size:18px; color:#c79f10; background: transparent;')
+        top_row.addWidget(self.rating_label)
 
         # Year-over-year ratings graph
-        self.graph = QLabel()
-        self.graph.setFixedHeight(150)
-        self.graph.setFixedWidth(500)
-        self.graph.setStyleSheet('border:2px solid #e0e0e0; background: white; border-radius: 10px; padding: 10px;')
-        self.draw_graph()  # initial draw
+        self.graph = RatingChart()
 
         # Patient comments section
         comments_title = QLabel("Patient Reviews & Comments")
@@ -1456,8 +2505,8 @@ class HospitalDetail(QWidget):
 
         # Add all elements to main layout
         layout.addLayout(top_row)
-        layout.addWidget(addr)
-        layout.addWidget(hours)
+        layout.addWidget(self.addr_label)
+        layout.addWidget(self.hours_label)
         layout.addWidget(self.graph, alignment=Qt.AlignCenter)
         layout.addWidget(comments_title)
         layout.addWidget(comments_scroll)
@@ -1796,11 +2845,19 @@ class ScheduleSelection(QWidget):
 class ConsultationTypeSelection(QWidget):
     def __init__(self, appointment_info, back_cb, next_cb):
         super().__init__()
-        self.appointment_info = appointment_info
         self.back_cb = back_cb
         self.next_cb = next_cb
-        self.selected_type = None
         self._build()
+        self.set_appointment(appointment_info)
+
+    def set_appointment(self, appointment_info):
+        """Start over for another booking: nothing selected yet."""
+        self.appointment_info = appointment_info
+        self.selected_type = None
+        self.selected_price = None
+        self.online_btn.setChecked(False)
+        self.face_btn.setChecked(False)
+        self.next_btn.setEnabled(False)
 
     def _build(self):
         layout = QVBoxLayout()
@@ -1842,7 +2899,7 @@ class ConsultationTypeSelection(QWidget):
         online_price.setStyleSheet("color: #55c79a;")
         online_layout.addWidget(online_price, alignment=Qt.AlignRight)
 
-        online_btn = QPushButton('Select Online')
+        self.online_btn = online_btn = QPushButton('Select Online')
         online_btn.setCheckable(True)
         online_btn.setStyleSheet("""
             QPushButton {
@@ -1891,7 +2948,7 @@ class ConsultationTypeSelection(QWidget):
         face_price.setStyleSheet("color: #55c79a;")
         face_layout.addWidget(face_price, alignment=Qt.AlignRight)
 
-        face_btn = QPushButton('Select Face-to-Face')
+        self.face_btn = face_btn = QPushButton('Select Face-to-Face')
         face_btn.setCheckable(True)
         face_btn.setStyleSheet("""
             QPushButton {
@@ -1969,12 +3026,27 @@ class ConsultationTypeSelection(QWidget):
 
 
 class ConfirmationScreen(QWidget):
+    DETAIL_FIELDS = ["Name", "Age", "Contact", "Gender", "Address", "Concern", "Date", "Time", "Type", "Price"]
+
     def __init__(self, appointment_info, back_cb, accept_cb):
         super().__init__()
-        self.appointment_info = appointment_info
         self.back_cb = back_cb
         self.accept_cb = accept_cb
         self._build()
+        self.set_appointment(appointment_info)
+
+    def set_appointment(self, appointment_info):
+        self.appointment_info = appointment_info
+        if appointment_info is None:
+            return
+        values = [
+            appointment_info['name'], appointment_info['age'], appointment_info['contact'],
+            appointment_info['gender'], appointment_info['address'], appointment_info['concern'],
+            appointment_info['schedule'], appointment_info['time_slot'],
+            appointment_info['consultation_type'].title(), f"${appointment_info['price']}"
+        ]
+        for label, field, value in zip(self.detail_labels, self.DETAIL_FIELDS, values):
+            label.setText(f"{field}: {value}")
 
     def _build(self):
         layout = QVBoxLayout()
@@ -2002,23 +3074,13 @@ class ConfirmationScreen(QWidget):
         details_layout = QVBoxLayout(details_frame)
         details_layout.setContentsMargins(20, 20, 20, 20)
 
-        details = [
-            f"Name: {self.appointment_info['name']}",
-            f"Age: {self.appointment_info['age']}",
-            f"Contact: {self.appointment_info['contact']}",
-            f"Gender: {self.appointment_info['gender']}",
-            f"Address: {self.appointment_info['address']}",
-            f"Concern: {self.appointment_info['concern']}",
-            f"Date: {self.appointment_info['schedule']}",
-            f"Time: {self.appointment_info['time_slot']}",
-            f"Type: {self.appointment_info['consultation_type'].title()}",
-            f"Price: ${self.appointment_info['price']}"
-        ]
-
-        for detail in details:
-            label = QLabel(detail)
+        # One label per field; set_appointment fills them in
+        self.detail_labels = []
+        for _ in self.DETAIL_FIELDS:
+            label = QLabel()
             label.setStyleSheet("color: #1f2d3d; font-size: 14px; margin: 5px 0;")
             details_layout.addWidget(label)
+            self.detail_labels.append(label)
 
         layout.addWidget(details_frame)
 
@@ -2066,9 +3128,18 @@ class ConfirmationScreen(QWidget):
 # ==========================================
 #  MAIN WINDOW (CONTAINER)
 # ==========================================
+PREWARM_ORDER = [5, 4, 1, 6, 3]      # pages built while idle after startup; the web-engine
+                                     # page (2) starts Chromium, so it waits for its first visit
+PREWARM_DELAY = 1000                 # ms after the first paint before prewarming starts
+PREWARM_STEP_DELAY = 200             # ms between prewarmed pages
+PREWARM_PAGES = os.environ.get("HILOM_PREWARM", "1") == "1"
+
+
 class HilomMainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, eager_pages=False, prewarm=True, started=None):
         super().__init__()
+        # perf_counter() when startup began; first paint and uptime are measured from it
+        self.started = time.perf_counter() if started is None else started
         self.setWindowTitle("HILOM - Holistic Wellness")
         # self.setFixedSize(1100, 720)  # Removed to allow full screen
 
@@ -2159,19 +3230,77 @@ class HilomMainWindow(QMainWindow):
         self.stack = QStackedWidget()
         self.stack.setStyleSheet("background: transparent;")
 
-        # Initialize Pages
+        # Pages are built the first time they are opened (see page()); until then
+        # the stack holds an empty placeholder so the sidebar indexes stay put.
+        self.page_factories = [
+            self.build_home_page,         # Index 0
+            self.build_journal_page,      # Index 1
+            self.build_recommend_page,    # Index 2
+            self.build_appointment_page,  # Index 3
+            self.build_favorite_page,     # Index 4
+            self.build_history_page,      # Index 5
+            self.build_profile_page,      # Index 6
+        ]
+        self.pages = [None] * len(self.page_factories)
+        for _ in self.page_factories:
+            self.stack.addWidget(QWidget())
+
+        if eager_pages:
+            for index in range(len(self.page_factories)):
+                self.page(index)
+        else:
+            self.page(0)
+        self.stack.setCurrentIndex(0)
+        # Opened-on-demand pages, then the search index, are built in the background once the window is up
+        self.prewarm_queue = deque() if eager_pages or not prewarm else deque(PREWARM_ORDER + [get_search_index])
+        self.first_paint_done = False
+        self.home_page.installEventFilter(self)
+
+        main_layout.addWidget(self.stack)
+
+        # Set initial page style
+        self.highlight_sidebar(0)
+
+        # Appointment inserts finish in the background; report how they went
+        appointment_outbox.saved.connect(self.on_appointment_saved)
+        appointment_outbox.failed.connect(self.on_appointment_failed)
+
+    def page(self, index):
+        """The page at a sidebar index, built on first use."""
+        if self.pages[index] is None:
+            placeholder = self.stack.widget(index)
+            widget = self.page_factories[index]()
+            self.pages[index] = widget
+            self.stack.insertWidget(index, widget)
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+        return self.pages[index]
+
+    def build_home_page(self):
         self.home_page = DashboardPage()
+        return self.home_page
+
+    def build_journal_page(self):
         self.journal_page = JournalPage()
+        return self.journal_page
+
+    def build_recommend_page(self):
         self.recommend_page = RecommendationApp()
+        return self.recommend_page
+
+    def build_favorite_page(self):
         self.favorite_page = FavoritePage()
+        return self.favorite_page
 
-        # History Page
+    def build_history_page(self):
         self.history_page = HistoryPage()
+        return self.history_page
 
-        # Profile Page
+    def build_profile_page(self):
         self.profile_page = ProfilePage()
+        return self.profile_page
 
-        # Appointment Pages
+    def build_appointment_page(self):
         self.appointment_stack = QStackedWidget()
         self.appointment_location = LocationEntry(lambda: self.appointment_stack.setCurrentIndex(1))
         self.appointment_hospitals = HospitalList(lambda h: self.show_appointment_detail(h), lambda: self.appointment_stack.setCurrentIndex(0))
@@ -2179,33 +3308,122 @@ class HilomMainWindow(QMainWindow):
         self.appointment_doctors = DoctorSelection(lambda: self.appointment_stack.setCurrentIndex(4), lambda: self.appointment_stack.setCurrentIndex(2))
         self.appointment_personal = PersonalInfoForm(lambda: self.appointment_stack.setCurrentIndex(5), lambda: self.appointment_stack.setCurrentIndex(3))
         self.appointment_schedule = ScheduleSelection(self.appointment_personal, lambda: self.appointment_stack.setCurrentIndex(4), self.show_consultation_type)
-        self.appointment_consultation = None  # Will be created dynamically
-        self.appointment_confirmation = None  # Will be created dynamically
         self.appointment_stack.addWidget(self.appointment_location)
         self.appointment_stack.addWidget(self.appointment_hospitals)
         self.appointment_stack.addWidget(self.appointment_detail)
         self.appointment_stack.addWidget(self.appointment_doctors)
         self.appointment_stack.addWidget(self.appointment_personal)
+        # Consultation type and confirmation are built once and re-bound to each booking
+        self.appointment_consultation = ConsultationTypeSelection(None, lambda: self.appointment_stack.setCurrentIndex(5), self.show_confirmation)
+        self.appointment_confirmation = ConfirmationScreen(None, lambda: self.appointment_stack.setCurrentIndex(6), lambda: self.stack.setCurrentIndex(0))
         self.appointment_stack.addWidget(self.appointment_schedule)
-
-        # Add Pages to Stack
-        self.stack.addWidget(self.home_page)  # Index 0
-        self.stack.addWidget(self.journal_page)  # Index 1
-        self.stack.addWidget(self.recommend_page)  # Index 2
-        self.stack.addWidget(self.appointment_stack)  # Index 3
-        self.stack.addWidget(self.favorite_page)  # Index 4
-        self.stack.addWidget(self.history_page)  # Index 5
-        self.stack.addWidget(self.profile_page)  # Index 6
-
-        main_layout.addWidget(self.stack)
-
-        # Set initial page style
-        self.highlight_sidebar(0)
+        self.appointment_stack.addWidget(self.appointment_consultation)
+        self.appointment_stack.addWidget(self.appointment_confirmation)
+        return self.appointment_stack
 
     def switch_page(self, index):
+        self.page(index)
         self.stack.setCurrentIndex(index)
         self.highlight_sidebar(index)
 
+    def eventFilter(self, obj, event):
+        # Watches the Home page for its first paint (see __init__)
+        if event.type() == QEvent.Type.Paint and not self.first_paint_done:
+            self.first_paint_done = True
+            obj.removeEventFilter(self)
+            print(f"Startup: first paint after {(time.perf_counter() - self.started) * 1000:.0f} ms")
+            import_report.report()
+            if self.prewarm_queue:
+                QTimer.singleShot(PREWARM_DELAY, self.prewarm_next)
+        return super().eventFilter(obj, event)
+
+    def prewarm_next(self):
+        # One page per turn of the event loop, so clicks in between stay responsive
+        while self.prewarm_queue:
+            step = self.prewarm_queue.popleft()
+            if callable(step):
+                step()
+                break
+            if self.pages[step] is None:
+                self.page(step)
+                break
+        if self.prewarm_queue:
+            QTimer.singleShot(PREWARM_STEP_DELAY, self.prewarm_next)
+
+    def changeEvent(self, event):
+        # Nothing is on screen while minimized; stop animating until restored
+        if event.type() == QEvent.Type.WindowStateChange:
+            animation_scheduler.set_paused(self.isMinimized())
+        super().changeEvent(event)
+
+    def on_appointment_saved(self, info):
+        self.statusBar().showMessage(f"Appointment for {info['name']} saved.", 5000)
+
+    def on_appointment_failed(self, info, error, will_retry):
+        name = info.get('name', '?')
+        if will_retry:
+            self.statusBar().showMessage(
+                f"Couldn't reach the database - appointment for {name} is queued and will be retried.", 10000)
+        else:
+            self.statusBar().showMessage(
+                f"Appointment for {name} couldn't be saved ({error}); it was set aside in "
+                f"{appointment_outbox.dead_letter_path}.", 15000)
+
+    def closeEvent(self, event):
+        # Make sure every queued history row is on disk before the window goes away
+        history_writer.flush()
+        super().closeEvent(event)
+
+    # Control commands from the admin panel (see control.py)
+    def reload_content(self):
+        """Re-read the catalog, favorites and play history in place and refresh
+        the pages already built. Unlike a restart, pages and caches stay warm."""
+        start = time.perf_counter()
+        history_writer.flush()
+        content_catalog.close()
+        content_catalog.moods()  # reopens, rebuilding catalog.db if catalog.json changed
+        reset_search_index()
+        favorites_store.reload()
+        reload_ranker()
+        if self.pages[0] is not None:
+            self.home_page.show_quote()
+        if self.pages[2] is not None:
+            self.recommend_page.search(self.recommend_page.search_box.text())
+        if self.pages[4] is not None:
+            self.favorite_page.reload()
+        return {"elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+    def flush_caches(self):
+        """Write queued history rows and drop caches that rebuild on next use."""
+        flushed = history_writer.flush()
+        content_catalog.close()
+        reset_search_index()
+        return {"history_flushed": flushed}
+
+    def control_stats(self):
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.perf_counter() - self.started, 1),
+            "rss": heartbeat.current_rss(),
+            "pages_built": [i for i, page in enumerate(self.pages) if page is not None],
+            "animations_active": animation_scheduler.active_count(),
+            "history_queued": history_writer.pending(),
+            "appointments_pending": appointment_outbox.pending_count(),
+            "favorites": favorites_store.count(),
+            "catalog": content_catalog.stats(),
+            "search_index_built": _search_index is not None,
+            "db_pool": db_pool.pool.stats(),
+        }
+
+    def control_shutdown(self):
+        # After the reply is sent: close() flushes history, then the app exits
+        QTimer.singleShot(0, self.shutdown)
+        return {"pid": os.getpid()}
+
+    def shutdown(self):
+        self.close()
+        QApplication.quit()
+
     def highlight_sidebar(self, active_index):
         # Reset all buttons
         for i, btn in enumerate(self.btn_group):
@@ -2238,198 +3456,18 @@ class HilomMainWindow(QMainWindow):
 
 
     def show_appointment_detail(self, hospital):
-        idx = 2
-        old = self.appointment_stack.widget(idx)
-        self.appointment_stack.removeWidget(old)
-        old.deleteLater()
-        self.appointment_detail = HospitalDetail(hospital, lambda: self.appointment_stack.setCurrentIndex(3), lambda: self.appointment_stack.setCurrentIndex(1))
-        self.appointment_stack.insertWidget(idx, self.appointment_detail)
-        self.appointment_stack.setCurrentIndex(idx)
+        self.appointment_detail.set_hospital(hospital)
+        self.appointment_stack.setCurrentIndex(2)
 
     def show_consultation_type(self, appointment_info):
-        if self.appointment_consultation:
-            self.appointment_consultation.deleteLater()
-        self.appointment_consultation = ConsultationTypeSelection(appointment_info, lambda: self.appointment_stack.setCurrentIndex(5), self.show_confirmation)
-        self.appointment_stack.addWidget(self.appointment_consultation)
+        self.appointment_consultation.set_appointment(appointment_info)
         self.appointment_stack.setCurrentIndex(6)
 
     def show_confirmation(self, appointment_info):
-        if self.appointment_confirmation:
-            self.appointment_confirmation.deleteLater()
-        self.appointment_confirmation = ConfirmationScreen(appointment_info, lambda: self.appointment_stack.setCurrentIndex(6), lambda: self.stack.setCurrentIndex(0))
-        self.appointment_stack.addWidget(self.appointment_confirmation)
+        self.appointment_confirmation.set_appointment(appointment_info)
         self.appointment_stack.setCurrentIndex(7)
 
 
-# ---------- Mood Content (songs + videos + books) ----------
-mood_content = {
-    "HAPPY": {
-        "songs": [
-            "Bruno Mars – 24K Magic", "Bruno Mars – Treasure", "Katy Perry – Last Friday Night (T.G.I.F.)",
-            "Katy Perry – California Gurls", "Taylor Swift – 22", "Taylor Swift – Shake It Off",
-            "Ariana Grande – Break Free", "Ariana Grande – Into You", "Justin Timberlake – Can’t Stop The Feeling!",
-            "Walk The Moon – Shut Up and Dance", "BLACKPINK – JUMP", "BLACKPINK – Boombayah",
-            "TWICE – Likey", "TWICE – Cheer Up", "TWICE – What Is Love?", "BTS – Dynamite",
-            "BTS – Permission to Dance", "SEVENTEEN – Very Nice (아주 NICE)", "Red Velvet – Red Flavor",
-            "NewJeans – Super Shy", "Dua Lipa – Don’t Start Now", "Carly Rae Jepsen – Call Me Maybe",
-            "Justin Bieber, Nicki Minaj – Beauty and A Beat", "Meghan Trainor – Me Too", "Icona Pop – I Love It",
-            "BINI – Pantropiko", "BINI – Salamin, Salamin", "SB19 – Gento", "Maymay Entrata – Amakabogera",
-            "Vice Ganda – Karakaraka"
-        ],
-        "videos": [
-            {"title": "The Simple Secret of Being Happier | Tia Graham | TEDxManitouSprings", "youtube": "https://www.youtube.com/watch?v=gYeHV_nA36c", "spotify": ""},
-            {"title": "How To Be Happy & Remove Negative Thoughts in ANY Situation | Tony Robbins", "youtube": "https://youtu.be/r4ZdyS6v3qA?si=h-kcEKnlaHajWcQC", "spotify": ""},
-            {"title": "You can be happy without changing your life | Cassie Holmes | TEDxManhattanBeach", "youtube": "https://youtu.be/VOC44gKRTI4?si=_v4Fk17JazdrkM9R", "spotify": ""},
-            {"title": "How to Be Happy Every Day: It Will Change the World | Jacqueline Way | TEDxStanleyPark", "youtube": "https://youtu.be/78nsxRxbf4w?si=aunmqh6uvv_XKy-5", "spotify": ""},
-            {"title": "You Don't Find Happiness, You Create It | Katarina Blom | TEDxGöteborg", "youtube": "https://youtu.be/9DtcSCFwDdw?si=QrpA2gLoyq43SIvp", "spotify": ""},
-            {"title": "How To be Happy", "youtube": "", "spotify": "https://open.spotify.com/episode/1buRk9XQH7c6zfYhQuPOQo?si=f48247f0b23248f9"},
-            {"title": "How to Push Yourself to be happy even when life is hard", "youtube": "", "spotify": "https://open.spotify.com/episode/6qFAIe1McmITlhFPPklw8i?si=NhlFbZDgQbONzvPabp7oCw"},
-            {"title": "A happy & healthy life", "youtube": "", "spotify": "https://open.spotify.com/episode/4uTLnCklbPIA2RDozUfTbT?si=h2zLVG9oRH2CbQRAvbVxyg"}
-        ],
-        "books": [
-            {"title": "The Art of Happiness by the Dalai Lama & Howard Cutler", "description": "A classic blending Buddhist wisdom and psychological insight, arguing that happiness comes more from the state of our minds than external conditions.", "link": "https://www.amazon.com/Art-Happiness-Handbook-Living/dp/1573221112"},
-            {"title": "The Happiness Hypothesis by Jonathan Haidt", "description": "Explores ancient philosophical ideas about happiness and compares them with modern psychology research; good for understanding what really makes people fulfilled.", "link": "https://www.amazon.com/Happiness-Hypothesis-Finding-Modern-Ancient/dp/0465028020"},
-            {"title": "Authentic Happiness by Martin E. P. Seligman", "description": "A foundational book in positive psychology, showing how happiness can be cultivated by discovering and using your personal strengths, finding meaning, and building well-being.", "link": "https://www.amazon.com/Authentic-Happiness-Using-Positive-Psychology/dp/0743222989"},
-            {"title": "The Power of Positive Thinking by Norman Vincent Peale", "description": "A self-help classic that emphasizes optimism, affirmations, and mindset as tools for improving daily life and emotional well-being.", "link": "https://www.amazon.com/Power-Positive-Thinking/dp/0743234804"},
-            {"title": "Happiness Becomes You by Tina Turner", "description": "A more personal and spiritual take: the author shares her life journey and insights on how to find inner peace and happiness despite hardships.", "link": "https://www.amazon.com/Happiness-Becomes-You-Tina-Turner/dp/0062686726"}
-        ]
-    },
-    "SAD": {
-        "songs": [
-            "Angela Ken – Ako Naman Muna", "Angela Ken – It’s Okay Not Be Okay", "Coldplay – Fix You",
-            "Coldplay – The Scientist", "Coldplay – Sparks", "Coldplay – Yellow", "Coldplay – Everglow",
-            "Eraserheads – With a Smile", "Eraserheads – Alapaap", "Eraserheads – Huwag Kang Matakot",
-            "Adie – You’ll be safe here", "NIKI – You’ll be in My Heart", "TONEEJAY – 711", "Ben&Ben – Leaves",
-            "Jan Roberts – Sagip", "Emman – Teka Lang", "Orange & Lemons – Heaven Knows", "Dilaw – Janice",
-            "Munimuni – Minsan", "beabadoobee – Glue Song", "Amiel Sol – Sa Bawat Sandali",
-            "Wave to Earth – Seasons", "Wave to Earth – Bad", "Rex Orange County – Happiness", "Yung Kai – blue",
-            "Hale – Blue Sky", "Billie Eilish – Birds Of A Feather", "Ed Sheeran – Supermarket Flowers",
-            "Taylor Swift – My tears ricochet", "Taylor Swift – This is me trying"
-        ],
-        "videos": [
-            {"title": "\"I'm Fine\" - Learning To Live With Depression | Jake Tyler | TEDxBrighton", "youtube": "https://youtu.be/IDPDEKtd2yM?si=H-jNV1lu0ZeyuPaX", "spotify": ""},
-            {"title": "How to talk to the worst parts of yourself | Karen Faith | TEDxKC", "youtube": "https://youtu.be/gUV5DJb6KGs?si=nrhWRfM47i7NN9p2", "spotify": ""},
-            {"title": "Getting stuck in the negatives (and how to get unstuck) | Alison Ledgerwood | TEDxUCDavis", "youtube": "https://youtu.be/7XFLTDQ4JMk?si=4e8xVvIjZowTymXe", "spotify": ""},
-            {"title": "Listen To This When You Are Feeling Down | Buddhism In English", "youtube": "https://youtu.be/BloutcYWbJg?si=83T_Vl_98cxTJbOU", "spotify": ""},
-            {"title": "How to Deal with Negative Emotions - Distress Tolerance", "youtube": "https://youtu.be/puoddnGTAJk?si=IZ7q4eiwm_meUziU", "spotify": ""},
-            {"title": "mga habits that make you sad", "youtube": "", "spotify": "https://open.spotify.com/episode/2CVCpJI0AN7pMFlsJZXrhV?si=8N74pp3GRlaLsLNm61xZ7A"},
-            {"title": "Lungkot? Lungkot.", "youtube": "", "spotify": "https://open.spotify.com/episode/0zTnUc1tLgi3yN4dhKROKL?si=zZMqBCVMSYagtSXjnrWoMg"},
-            {"title": "I found comfort in sadness", "youtube": "", "spotify": "https://open.spotify.com/episode/12k9esN1hOFn5A3zBNQplL?si=oBdwTpfxTFmucKMkvWmVWA"},
-            {"title": "It’s okay to not be okay", "youtube": "", "spotify": "https://open.spotify.com/show/0ueXNkUlQsDxSRNTLZHnLZ?si=9628a29af7e342b0"}
-        ],
-        "books": [
-            {"title": "The Comfort Book — Matt Haig", "description": "Gentle reminders, short reflections, and soft motivation when you're overwhelmed.", "link": "https://www.amazon.com/Comfort-Book-Matt-Haig/dp/052556630X"},
-            {"title": "The Mountain Is You — Brianna Wiest", "description": "About healing, emotional growth, and turning pain into strength.", "link": "https://www.amazon.com/Mountain-You-Overcoming-Internal-Resistance/dp/1949759339"},
-            {"title": "The Happiness Trap — Dr. Russ Harris", "description": "Teaches you healthy ways to handle sadness and negative thoughts through acceptance.", "link": "https://www.amazon.com/Happiness-Trap-Stop-Struggling-Live/dp/1590305841"},
-            {"title": "Reasons to Stay Alive — Matt Haig", "description": "A hopeful, real story about surviving depression and finding light again.", "link": "https://www.amazon.com/Reasons-Stay-Alive-Matt-Haig/dp/052556396X"},
-            {"title": "The Courage to Be Disliked — Ichiro Kishimi & Fumitake Koga", "description": "Motivational lessons on freeing yourself from past pain, expectations, and self-doubt.", "link": "https://www.amazon.com/Courage-Be-Disliked-Phenomenon-Psychology/dp/1501197274"}
-        ]
-    },
-    "ANGER": {
-        "songs": [
-            "Dua Lipa – IDGAF", "Olivia Rodrigo – good 4 u", "Dua Lipa – Don’t Start Now", "Taylor Swift – Bad Blood",
-            "Taylor Swift – Sorry Not Sorry", "Madison Beer – Reckless", "Olivia Rodrigo – happier",
-            "Taylor Swift – Look What You Made Me Do", "Olivia Rodrigo – vampire", "Olivia Rodrigo – traitor",
-            "Taylor Swift – Better Than Revenge", "Taylor Swift – Don’t Blame Me", "Conan Gray – Maniac",
-            "Billie Eilish – Happier Than Ever", "Katy Perry – Dark Horse", "Olivia Rodrigo – get him back",
-            "Leyla Blue – What A Shame", "Olivia Rodrigo – Jealousy Jealousy", "Olivia Rodrigo – brutal",
-            "Billie Eilish – Therefore I Am", "SZA – Kill Bill", "Maroon 5 – Animals", "Rihanna – Breakin’ Dishes",
-            "SZA – I Hate U", "Conan Gray – Wish You Were Sober", "Taylor Swift – Karma", "Olivia Rodrigo – love is embarrassing",
-            "Olivia Rodrigo – all-american bitch", "Gracie Abrams – That’s So True", "Imagine Dragons – Enemy"
-        ],
-        "videos": [
-            {"title": "5 Ways to Diffuse Your anger", "youtube": "https://youtu.be/H4WYp9a6Yzg?si=Qb5nvlXVbCPRouBt", "spotify": ""},
-            {"title": "A simple Practice to deal with Anger | Buddhism In English", "youtube": "https://youtu.be/tV2Ecd7m6Tc?si=v9MTAxrgT9x_93Fn", "spotify": ""},
-            {"title": "How to let go of the anger in your heart | Buddhism In English", "youtube": "https://youtu.be/gKiv2ot3-Eg?si=frEk5Sun7wSD1gjd", "spotify": ""},
-            {"title": "Dr. Gabor Maté — How to Process Your Anger and Rage", "youtube": "https://youtu.be/Yh1-y3TzSO4?si=vHo2h6v8fYRgg0", "spotify": ""},
-            {"title": "The Antidote to Anger | Mike Goldman | TEDxGainesville", "youtube": "https://youtu.be/hCIfi-xvjgE?si=CFStT6KaSPVw2WgV", "spotify": ""},
-            {"title": "How to use anger as a force for good | Marcia Reynolds | TEDxAtlanta", "youtube": "https://youtu.be/owZb9qub-RU?si=5T_SA4gIVqI3nESG", "spotify": ""},
-            {"title": "Anger Is Your Ally: A Mindful Approach to Anger | Juna Mustad | TEDxWabashCollege", "youtube": "https://youtu.be/sbVBsrNnBy8?si=AELBtrmDo8jTT4td", "spotify": ""},
-            {"title": "How to Let Go of Anger and Resentment", "youtube": "", "spotify": "https://open.spotify.com/episode/2Qy7OewGPMHLoXmaICHnR5?si=bbb6a13321e543d6"},
-            {"title": "How to Get your Anger under control", "youtube": "", "spotify": "https://open.spotify.com/episode/1TgivM1vPsyJp92B5hvqqX?si=3ebef14332da49cf"},
-            {"title": "Anger Management techniques", "youtube": "", "spotify": "https://open.spotify.com/episode/3hJ4WwWXcA3DH4luFnjlll?si=4d69f2c144884ae7"}
-        ],
-        "books": [
-            {"title": "The Dance of Anger — Harriet Lerner", "description": "Explains that anger is a signal, not a problem. Helps you recognize patterns, express feelings assertively, and set healthy boundaries.", "link": "https://www.amazon.com/Dance-Anger-Women-Change-Relationship/dp/0062319690"},
-            {"title": "Anger Management for Everyone — Raymond Chip Tafrate", "description": "Uses psychology-based techniques to help you understand the root causes of anger. Offers exercises to respond thoughtfully rather than react impulsively.", "link": "https://www.amazon.com/Anger-Management-Everyone-Practical-Techniques/dp/1626257117"},
-            {"title": "The Cow in the Parking Lot — Susan Edmiston & Leonard Scheff", "description": "A humorous, easy-to-read guide for staying patient in frustrating situations. Teaches simple daily strategies to keep calm in small and big conflicts.", "link": "https://www.amazon.com/Cow-Parking-Lot-Simple-Strategies/dp/1569754923"},
-            {"title": "Emotional Intelligence 2.0 — Travis Bradberry & Jean Greaves", "description": "Teaches self-awareness, empathy, and emotional regulation. Includes strategies to manage anger and other strong emotions in real-time.", "link": "https://www.amazon.com/Emotional-Intelligence-2-0-Travis-Bradberry/dp/0974320625"},
-            {"title": "Mind Over Mood — Dennis Greenberger & Christine A. Padesky", "description": "Practical exercises to manage anger, mood, and emotional responses.", "link": "https://www.amazon.com/Mind-Over-Mood-Change-Depression/dp/1626251259"}
-        ]
-    },
-    "FEAR": {
-        "songs": [
-            "Billie Eilish – bury a friend", "Imagine Dragons – Demons", "Linkin Park – In the End",
-            "Coldplay – Trouble", "Radiohead – Creep", "The Weeknd – Save Your Tears", "Kodaline – All I Want",
-            "Twenty One Pilots – Stressed Out", "Sia – Breathe Me", "Adele – Hello"
-        ],
-        "videos": [
-            {"title": "How Fear Works | Tony Robbins", "youtube": "https://youtu.be/Z0_Jx3_QPUE", "spotify": ""},
-            {"title": "Facing Your Fears | Jocko Willink | TEDx", "youtube": "https://youtu.be/9NhTshcUZcM", "spotify": ""},
-            {"title": "Overcoming Fear | Jordan Peterson", "youtube": "https://youtu.be/3GRS0nDq8vM", "spotify": ""}
-        ],
-        "books": [
-            {"title": "Feel the Fear and Do It Anyway – Susan Jeffers", "description": "A classic guide on confronting fear and moving past it into action.", "link": "https://www.amazon.com/Feel-Fear-Do-Anyway/dp/0345487427"},
-            {"title": "Daring Greatly – Brené Brown", "description": "Encourages vulnerability and courage to overcome fear in personal and professional life.", "link": "https://www.amazon.com/Daring-Greatly-Courage-Vulnerable-Transforms/dp/1592408419"},
-            {"title": "The Gift of Fear – Gavin de Becker", "description": "A practical book on understanding fear as a protective tool.", "link": "https://www.amazon.com/Gift-Fear-Survival-Signals-Violence/dp/0440226198"}
-        ]
-    },
-    "STRESS": {
-        "songs": [
-            "Calm – Weightless", "Coldplay – Fix You", "Norah Jones – Don’t Know Why", "Ed Sheeran – Photograph",
-            "Enya – Only Time", "Sade – By Your Side"
-        ],
-        "videos": [
-            {"title": "Stress Management Techniques", "youtube": "https://youtu.be/hnpQrMqDoqE", "spotify": ""},
-            {"title": "Guided Meditation for Stress", "youtube": "https://youtu.be/MIr3RsUWrdo", "spotify": ""}
-        ],
-        "books": [
-            {"title": "Why Zebras Don’t Get Ulcers – Robert M. Sapolsky", "description": "Explains stress physiology and practical coping mechanisms.", "link": "https://www.amazon.com/Why-Zebras-Dont-Get-Ulcers/dp/0805073698"},
-            {"title": "The Relaxation and Stress Reduction Workbook – Martha Davis", "description": "Provides exercises and techniques to manage stress effectively.", "link": "https://www.amazon.com/Relaxation-Stress-Reduction-Workbook/dp/0898623920"}
-        ]
-    },
-    "LOVE": {
-        "songs": [
-            "Ed Sheeran – Perfect", "Adele – Make You Feel My Love", "Beyoncé – Halo",
-            "John Legend – All of Me", "Taylor Swift – Lover", "Maroon 5 – Sugar"
-        ],
-        "videos": [
-            {"title": "The Science of Love | TED-Ed", "youtube": "https://youtu.be/0kOPrP7zE0", "spotify": ""}
-        ],
-        "books": [
-            {"title": "The 5 Love Languages – Gary Chapman", "description": "Explains how different people express and feel love differently.", "link": "https://www.amazon.com/Love-Languages-Secret-Lasting-Relationships/dp/080241270X"},
-            {"title": "Attached – Amir Levine", "description": "Explores attachment styles in relationships.", "link": "https://www.amazon.com/Attached-Science-Adult-Attachment-Relationships/dp/1585428485"}
-        ]
-    },
-    "CALM": {
-        "songs": [
-            "Enya – Only Time", "Ludovico Einaudi – Nuvole Bianche", "Yiruma – River Flows in You",
-            "Norah Jones – Come Away with Me", "Coldplay – Paradise"
-        ],
-        "videos": [
-            {"title": "Guided Relaxation for Calm", "youtube": "https://youtu.be/mG2P7sw6YwA", "spotify": ""}
-        ],
-        "books": [
-            {"title": "The Book of Calm – Paul Wilson", "description": "Practical advice and reflections for inner calm.", "link": "https://www.amazon.com/Book-Calm-Paul-Wilson/dp/1842226996"},
-            {"title": "Calm – Michael Acton Smith", "description": "Insights into meditation and relaxation techniques.", "link": "https://www.amazon.com/Calm-Michael-Acton-Smith/dp/1444715233"}
-        ]
-    },
-    "HOPE": {
-        "songs": [
-            "Katy Perry – Firework", "Rachel Platten – Fight Song", "Andra Day – Rise Up",
-            "Coldplay – A Sky Full of Stars", "U2 – Beautiful Day"
-        ],
-        "videos": [
-            {"title": "Finding Hope in Difficult Times", "youtube": "https://youtu.be/5Cp2p3rsmGk", "spotify": ""}
-        ],
-        "books": [
-            {"title": "Man’s Search for Meaning – Viktor E. Frankl", "description": "Finding purpose and hope even in dire circumstances.", "link": "https://www.amazon.com/Mans-Search-Meaning-Viktor-Frankl/dp/080701429X"},
-            {"title": "Option B – Sheryl Sandberg", "description": "How to build resilience and hope after adversity.", "link": "https://www.amazon.com/Option-B-Facing-Adversity-Building/dp/1524732680"}
-        ]
-    }
-}
-
-
 # ---------- helper functions ----------
 def youtube_search_url(query_text: str) -> str:
     return "https://www.youtube.com/results?search_query=" + quote_plus(query_text)
@@ -2440,6 +3478,151 @@ def spotify_search_url(query_text: str) -> str:
 def spotify_uri_search(query_text: str) -> str:
     return "spotify:search:" + query_text
 
+# ---------- Search ----------
+SEARCH_RESULT_LIMIT = 200
+
+
+def fold_text(text):
+    """Lower-case and strip accents so "Bruyère" matches "bruyere"; Hangul is kept as syllables."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return unicodedata.normalize("NFC", stripped).casefold()
+
+
+def search_tokens(text):
+    return re.findall(r"\w+", fold_text(text))
+
+
+class SearchIndex:
+    """Inverted token index over catalog entries.
+
+    Titles, artists, descriptions and moods are split into accent-folded
+    tokens; every query token is matched as a prefix (via bisect over the
+    sorted vocabulary) and the results of all query tokens are intersected.
+    """
+
+    FIELDS = ("title", "artist", "description", "mood")
+
+    def __init__(self, entries):
+        self.entries = {entry["id"]: entry for entry in entries}  # id -> entry, for clicks
+        postings = {}
+        for entry in entries:
+            for field in self.FIELDS:
+                for token in search_tokens(entry.get(field) or ""):
+                    postings.setdefault(token, set()).add(entry["id"])
+        self.postings = {token: frozenset(ids) for token, ids in postings.items()}
+        self.vocabulary = sorted(self.postings)
+        self._prefix_cache = {}
+
+    def _prefix_ids(self, prefix):
+        ids = self._prefix_cache.get(prefix)
+        if ids is None:
+            start = bisect_left(self.vocabulary, prefix)
+            end = bisect_left(self.vocabulary, prefix + "\U0010ffff")
+            ids = frozenset().union(*(self.postings[t] for t in self.vocabulary[start:end]))
+            if len(self._prefix_cache) > 4096:
+                self._prefix_cache.clear()
+            self._prefix_cache[prefix] = ids
+        return ids
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Entries matching every word of the query, in catalog order."""
+        tokens = search_tokens(query)
+        if not tokens:
+            return []
+        # Rarest token first keeps the intersection small
+        sets = sorted((self._prefix_ids(t) for t in tokens), key=len)
+        ids = set(sets[0])
+        for other in sets[1:]:
+            ids &= other
+            if not ids:
+                return []
+        return [self.entries[i] for i in sorted(ids)[:limit]]
+
+    def get(self, entry_id):
+        return self.entries.get(entry_id)
+
+
+content_catalog = catalog.Catalog()
+_search_index = None
+
+
+def get_search_index():
+    # Built while the app is idle after startup (see HilomMainWindow.prewarm_next),
+    # or by the first search if that comes sooner
+    global _search_index
+    if _search_index is None:
+        _search_index = SearchIndex(list(content_catalog.iter_entries()))
+    return _search_index
+
+
+def catalog_entry(entry_id):
+    """An entry by id: a dict lookup once the search index is built, a catalog.db query before."""
+    if _search_index is not None:
+        return _search_index.get(entry_id)
+    return content_catalog.get(entry_id)
+
+
+# ---------- Ranking ----------
+# history.csv / favorites.csv category of each kind of catalog entry
+ENTRY_CATEGORIES = {"songs": "music", "videos": "video", "books": "book"}
+
+_ranker = None
+
+
+def entry_rank_key(entry):
+    return ENTRY_CATEGORIES[entry["kind"]], entry["title"]
+
+
+def get_ranker():
+    """The shared Ranker: history.csv and favorites are read once, then kept
+    current from the event bus."""
+    global _ranker
+    if _ranker is None:
+        _ranker = load_ranker()
+        event_bus.history_logged.connect(on_history_ranked)
+        event_bus.favorite_added.connect(on_favorite_ranked)
+        event_bus.favorite_removed.connect(on_unfavorite_ranked)
+    return _ranker
+
+
+def load_ranker():
+    ranker = ranking.Ranker()
+    # Rows still queued in the writer would be missed by the file and by the bus
+    history_writer.flush()
+    ranker.load_history(HISTORY_FILE, set(ENTRY_CATEGORIES.values()))
+    for cat in ENTRY_CATEGORIES.values():
+        for item in favorites_store.items(cat):
+            ranker.set_favorite(cat, item)
+    return ranker
+
+
+def reload_ranker():
+    """Re-read history and favorites into a fresh Ranker (if one was in use)."""
+    global _ranker
+    if _ranker is not None:
+        _ranker = load_ranker()
+
+
+def on_history_ranked(row):
+    cat, item, date, time_ = row
+    if cat in ENTRY_CATEGORIES.values():
+        _ranker.record_play(cat, item, ranking.parse_history_time(date, time_))
+
+
+def on_favorite_ranked(cat, item):
+    _ranker.set_favorite(cat, item)
+
+
+def on_unfavorite_ranked(cat, item):
+    _ranker.set_favorite(cat, item, False)
+
+
+def reset_search_index():
+    global _search_index
+    _search_index = None
+
+
 # ---------- Embedded Player Widget ----------
 class EmbeddedPlayer(QWidget):
     def __init__(self, parent=None):
@@ -2456,6 +3639,9 @@ class EmbeddedPlayer(QWidget):
         self.toolbar.addAction(self.btn_spotify_app)
         layout.addWidget(self.toolbar)
 
+        # Loaded on first use: the web engine is the slowest import in the app and
+        # only this player needs it (main() sets AA_ShareOpenGLContexts so a late import works)
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
         self.web = QWebEngineView()
         layout.addWidget(self.web, 1)
 
@@ -2524,7 +3710,7 @@ class RecommendationApp(QWidget):
         music_tab = QWidget()
         music_v = QVBoxLayout()
         grid = QGridLayout()
-        moods = list(mood_content.keys())
+        moods = content_catalog.moods()
         for i, m in enumerate(moods):
             c = Card(m, m, parent=self)
             wrapper = QWidget()
@@ -2555,6 +3741,13 @@ class RecommendationApp(QWidget):
         ctrl.addStretch()
         music_v.addLayout(ctrl)
 
+        # Search across every mood's songs, videos and books
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search songs, videos, books or moods...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.search)
+        music_v.addWidget(self.search_box)
+
         # Song list
         self.song_list = QListWidget()
         self.song_list.itemClicked.connect(self.song_single_click)
@@ -2597,27 +3790,44 @@ class RecommendationApp(QWidget):
         # State
         self.current_mood = None
         self.current_titles = []
-        self.favorites = {"music": [], "video": [], "book": []}
-        self.load_favorites()
+        self.favorites = favorites_store
 
     # Show playlist
     def show_playlist(self, mood):
         self.current_mood = mood
-        content = mood_content.get(mood, {})
-        self.current_titles = content.get("songs", [])
-        self.song_list.clear()
-        self.video_list.clear()
-        self.book_list.clear()
-
-        for t in content.get("songs", []):
-            self.song_list.addItem(QListWidgetItem(t))
-        for v in content.get("videos", []):
-            self.video_list.addItem(QListWidgetItem(v["title"]))
-        for b in content.get("books", []):
-            self.book_list.addItem(QListWidgetItem(b["title"]))
-
+        if self.search_box.text():
+            self.search_box.blockSignals(True)
+            self.search_box.clear()
+            self.search_box.blockSignals(False)
+        # Most played / recently played / favorited first
+        self.show_entries(get_ranker().rank(content_catalog.mood_entries(mood), key=entry_rank_key))
         self.tabs.setCurrentIndex(0)
 
+    def show_entries(self, entries):
+        # Each list item carries its catalog id, so clicks look the entry up directly
+        lists = {"songs": self.song_list, "videos": self.video_list, "books": self.book_list}
+        for widget in lists.values():
+            widget.clear()
+        self.current_titles = []
+        for entry in entries:
+            item = QListWidgetItem(entry["title"])
+            item.setData(Qt.ItemDataRole.UserRole, entry["id"])
+            if entry["kind"] == "books" and not entry.get("link"):
+                # Its link failed validation and there is no search to fall back on
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEnabled)
+                item.setToolTip("No link available for this book")
+            lists[entry["kind"]].addItem(item)
+            if entry["kind"] == "songs":
+                self.current_titles.append(entry["title"])
+
+    def search(self, text):
+        if text.strip():
+            self.show_entries(get_search_index().search(text))
+        elif self.current_mood:
+            self.show_playlist(self.current_mood)
+        else:
+            self.show_entries([])
+
     # Song click
     def song_single_click(self, item):
         title = item.text()
@@ -2635,30 +3845,35 @@ class RecommendationApp(QWidget):
     def video_single_click(self, item):
         title = item.text()
         if not title: return
-        vids = mood_content.get(self.current_mood, {}).get("videos", [])
-        for v in vids:
-            if v["title"] == title:
-                self.player.load_youtube_search_and_autoplay(v["youtube"])
-                log_history("video", title)
-                break
+        video = catalog_entry(item.data(Qt.ItemDataRole.UserRole))
+        # Links that failed validation are stored empty; search by title instead
+        self.player.load_youtube_search_and_autoplay((video and video["youtube"]) or title)
+        log_history("video", title)
 
     # Book click
     def book_click(self, item):
-        title = item.text()
-        books = mood_content.get(self.current_mood, {}).get("books", [])
-        for b in books:
-            if b["title"] == title:
-                webbrowser.open(b["link"])
-                log_history("book", title)
-                break
+        book = catalog_entry(item.data(Qt.ItemDataRole.UserRole))
+        if not book or not book["link"]:
+            return
+        webbrowser.open(book["link"])
+        log_history("book", book["title"])
 
     # Random pick
     def random_pick(self):
-        if self.current_mood:
-            pick = random.choice(self.current_titles)
+        ranker = get_ranker()
+        if self.current_titles:
+            pick = ranker.pick(self.current_titles, key=lambda title: ("music", title))
         else:
-            mood = random.choice(list(mood_content.keys()))
-            pick = random.choice(mood_content[mood]["songs"])
+            # A random mood that has songs; moods with only videos or books are skipped
+            moods = list(content_catalog.moods())
+            random.shuffle(moods)
+            for mood in moods:
+                songs = [e for e in content_catalog.mood_entries(mood) if e["kind"] == "songs"]
+                if songs:
+                    break
+            else:
+                return
+            pick = ranker.pick(songs, key=entry_rank_key)["title"]
             self.show_playlist(mood)
         self.player.load_youtube_search_and_autoplay(pick)
         matches = self.song_list.findItems(pick, Qt.MatchExactly)
@@ -2667,42 +3882,19 @@ class RecommendationApp(QWidget):
 
     def favorite_song(self):
         item = self.song_list.currentItem()
-        if item and item.text() not in self.favorites["music"]:
-            self.favorites["music"].append(item.text())
+        if item and self.favorites.add("music", item.text()):
             print(f"Favorited song: {item.text()}")
 
     def favorite_video(self):
         item = self.video_list.currentItem()
-        if item and item.text() not in self.favorites["video"]:
-            self.favorites["video"].append(item.text())
+        if item and self.favorites.add("video", item.text()):
             print(f"Favorited video: {item.text()}")
 
     def favorite_book(self):
         item = self.book_list.currentItem()
-        if item and item.text() not in self.favorites["book"]:
-            self.favorites["book"].append(item.text())
-            self.save_favorites()
+        if item and self.favorites.add("book", item.text()):
             print(f"Favorited book: {item.text()}")
 
-    def load_favorites(self):
-        try:
-            with open("favorites.csv", "r") as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) == 2:
-                        cat, item = row
-                        if cat in self.favorites:
-                            self.favorites[cat].append(item)
-        except FileNotFoundError:
-            pass
-
-    def save_favorites(self):
-        with open("favorites.csv", "w", newline="") as f:
-            writer = csv.writer(f)
-            for cat, items in self.favorites.items():
-                for item in items:
-                    writer.writerow([cat, item])
-
     # Toolbar wrappers
     def _player_play_youtube_current(self):
         title = self._current_title_or_selected()
@@ -2734,11 +3926,42 @@ class RecommendationApp(QWidget):
 
 
 if __name__ == "__main__":
+    started = time.perf_counter()
+    # One dashboard at a time: take the lock before building anything, so a second
+    # copy never opens a window or touches history.csv, favorites.csv or the outbox
+    beat = heartbeat.Heartbeat()
+    try:
+        acquired = beat.acquire()
+    except OSError as e:
+        print(f"Heartbeat disabled: {e}")
+        acquired = None
+    if acquired is False:
+        print("Another dashboard holds dashboard.lock; not starting a second one.")
+        sys.exit(1)
     try:
         init_database()
+        # Lets QtWebEngineWidgets be imported after the QApplication exists (see EmbeddedPlayer)
+        QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
         app = QApplication(sys.argv)
-        window = HilomMainWindow()
+        # --eager-pages builds every page before showing the window (the old startup) for comparison
+        window = HilomMainWindow(eager_pages="--eager-pages" in sys.argv, prewarm=PREWARM_PAGES, started=started)
         window.showFullScreen()
+        appointment_outbox.start()  # retry anything left over from last time
+        app.aboutToQuit.connect(appointment_outbox.stop)
+        if acquired:
+            # Lets the admin panel see this dashboard is up (and responsive) without a process scan
+            heartbeat_timer = HeartbeatTimer(beat, parent=app)
+            heartbeat_timer.start()
+            app.aboutToQuit.connect(heartbeat_timer.stop)
+            # Only the lock holder serves the control socket, so a stale socket can be replaced safely
+            control_server = control.ControlServer({
+                "reload": window.reload_content,
+                "flush": window.flush_caches,
+                "stats": window.control_stats,
+                "shutdown": window.control_shutdown,
+            }, parent=app)
+            control_server.listen()
+            app.aboutToQuit.connect(control_server.close)
         sys.exit(app.exec_())
     except Exception as e:
         print(f"Error starting dashboard: {e}")
@@ -1,67 +1,130 @@
+import sys
+import json
+import time
+import argparse
+import tracemalloc
 import mysql.connector
+from db_pool import DB_CONFIG
 
-conn = mysql.connector.connect(
-    host="localhost",
-    user="root",
-    password="",
-    database="hilom_db"
-)
-
-cursor = conn.cursor(dictionary=True)
-
-query = """
-SELECT 
-    u.id AS user_id,
-    u.name AS user_name,
-    u.email AS user_email,
-    u.created_at AS user_created,
-
-    j.id AS journal_id,
-    j.title AS journal_title,
-    j.content AS journal_content,
-    j.mood AS journal_mood,
-    j.date AS journal_date,
-    j.created_at AS journal_created,
-
-    mh.id AS music_history_id,
-    mh.song_title AS music_title,
-    mh.mood AS music_mood,
-    mh.timestamp AS music_timestamp,
-
-    f.id AS favorite_id,
-    f.song_title AS favorite_item,
-    f.type AS favorite_type,
-
-    lh.id AS login_event_id,
-    lh.action AS login_action,
-    lh.timestamp AS login_time,
-
-    a.id AS appointment_id,
-    a.hospital,
-    a.doctor,
-    a.schedule_date,
-    a.time_slot,
-    a.patient_name,
-    a.age,
-    a.contact,
-    a.concern,
-    a.status,
-    a.created_at AS appointment_created
-
-FROM hilom_db_users u
-LEFT JOIN hilom_db_journals j ON u.id = j.user_id
-LEFT JOIN hilom_db_music_history mh ON u.id = mh.user_id
-LEFT JOIN hilom_db_favorites f ON u.id = f.user_id
-LEFT JOIN hilom_db_login_history lh ON u.id = lh.user_id
-LEFT JOIN hilom_db_appointments a ON u.id = a.user_id
-ORDER BY u.id;
-"""
-
-cursor.execute(query)
-rows = cursor.fetchall()
-
-for row in rows:
-    print(row)
-
-cursor.close()
-conn.close()
+# Export every user with their journals, plays, favorites, logins and appointments
+# as one JSON document per line. Each table is read on its own connection with an
+# unbuffered cursor, ordered by user id, and the streams are merged user by user,
+# so only one user's rows are ever held in memory.
+
+EXPORT_DB_CONFIG = {**DB_CONFIG, "database": "hilom_db"}
+EXPORT_BATCH_SIZE = 1000   # rows fetched from the server per round trip
+
+USER_COLUMNS = ["id", "name", "email", "created_at"]
+
+# (key in the user document, table, columns)
+CHILD_TABLES = [
+    ("journals", "hilom_db_journals", ["id", "title", "content", "mood", "date", "created_at"]),
+    ("music_history", "hilom_db_music_history", ["id", "song_title", "mood", "timestamp"]),
+    ("favorites", "hilom_db_favorites", ["id", "song_title", "type"]),
+    ("login_history", "hilom_db_login_history", ["id", "action", "timestamp"]),
+    ("appointments", "hilom_db_appointments", [
+        "id", "hospital", "doctor", "schedule_date", "time_slot", "patient_name",
+        "age", "contact", "concern", "status", "created_at"
+    ]),
+]
+
+
+def stream_rows(conn, query, batch_size):
+    # Unbuffered cursor: rows stay on the server until fetched
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute(query)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield from batch
+    finally:
+        cursor.close()
+
+
+class ChildStream:
+    """Rows of one child table, handed out a user at a time."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._next = next(rows, None)
+
+    def take(self, user_id):
+        found = []
+        # Skip rows whose user no longer exists
+        while self._next is not None and self._next["user_id"] < user_id:
+            self._next = next(self._rows, None)
+        while self._next is not None and self._next["user_id"] == user_id:
+            row = self._next
+            del row["user_id"]
+            found.append(row)
+            self._next = next(self._rows, None)
+        return found
+
+
+def export_users(out, config=EXPORT_DB_CONFIG, batch_size=EXPORT_BATCH_SIZE):
+    """Write one JSON line per user to out; returns (users, rows) exported."""
+    connections = []
+    try:
+        conn = mysql.connector.connect(**config)
+        connections.append(conn)
+        users = stream_rows(
+            conn, f"SELECT {', '.join(USER_COLUMNS)} FROM hilom_db_users ORDER BY id", batch_size)
+
+        children = []
+        for key, table, columns in CHILD_TABLES:
+            # An unbuffered result ties up its connection until fully read
+            conn = mysql.connector.connect(**config)
+            connections.append(conn)
+            query = f"SELECT user_id, {', '.join(columns)} FROM {table} ORDER BY user_id, id"
+            children.append((key, ChildStream(stream_rows(conn, query, batch_size))))
+
+        user_count = row_count = 0
+        for user in users:
+            doc = dict(user)
+            row_count += 1
+            for key, stream in children:
+                doc[key] = stream.take(user["id"])
+                row_count += len(doc[key])
+            out.write(json.dumps(doc, default=str) + "\n")
+            user_count += 1
+        return user_count, row_count
+    finally:
+        for conn in connections:
+            try:
+                conn.close()
+            except mysql.connector.Error:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export HILOM users and their data as JSON Lines.")
+    parser.add_argument("--out", help="output file (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE,
+                        help=f"rows fetched per round trip (default: {EXPORT_BATCH_SIZE})")
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        users, rows = export_users(out, batch_size=args.batch_size)
+    except mysql.connector.Error as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rate = rows / elapsed if elapsed > 0 else 0
+    print(f"Exported {users} users ({rows} rows) in {elapsed:.2f}s - "
+          f"{rate:,.0f} rows/sec, peak memory {peak / 1024 / 1024:.1f} MB", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import threading
+import time
+
+
+# ---------- MySQL Config ----------
+# The one place the dashboard, admin panel and login window read their MySQL settings from
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",         # <-- your MySQL username
+    "password": "",         # <-- your MySQL password
+    "database": "hilom",    # <-- make sure this database exists
+    "connection_timeout": 5,
+}
+
+POOL_SIZE = 5             # max connections open at once
+POOL_IDLE_TIMEOUT = 300   # seconds an unused connection is kept before it is closed
+POOL_PING_AFTER = 30      # seconds idle before a connection is health-checked on checkout
+POOL_WAIT_TIMEOUT = 10    # seconds to wait for a free connection when the pool is full
+
+
+_driver_lock = threading.Lock()
+
+
+def load_driver():
+    """Import mysql.connector on first use; it takes a while to load and no window needs it to open.
+
+    Also defines PoolExhausted, which is a mysql.connector.Error so callers
+    catching driver errors catch it too.
+    """
+    global mysql, PoolExhausted
+    with _driver_lock:
+        if "PoolExhausted" not in globals():
+            import mysql.connector
+
+            class PoolExhausted(mysql.connector.Error):
+                pass
+    return mysql.connector
+
+
+def __getattr__(name):
+    # db_pool.mysql / db_pool.PoolExhausted from outside load the driver
+    if name in ("mysql", "PoolExhausted"):
+        load_driver()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class PooledConnection:
+    """A checked-out MySQL connection. close() gives it back to the pool."""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise load_driver().InterfaceError("Connection already returned to the pool")
+        return getattr(self._conn, name)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        # Callers that bail out on an error without close() still give the slot back
+        self.close()
+
+
+class ConnectionPool:
+    def __init__(self, config=None, size=POOL_SIZE, idle_timeout=POOL_IDLE_TIMEOUT,
+                 ping_after=POOL_PING_AFTER, wait_timeout=POOL_WAIT_TIMEOUT):
+        self.config = dict(config or DB_CONFIG)
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.wait_timeout = wait_timeout
+        self._idle = []  # (connection, last_used) - most recently used last
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+    def get_connection(self):
+        load_driver()
+        conn, last_used = None, None
+        with self._cond:
+            expired = self._take_expired()
+            deadline = time.monotonic() + self.wait_timeout
+            while not self._idle and self._in_use >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    raise PoolExhausted(f"No free MySQL connection after {self.wait_timeout}s")
+            if self._idle:
+                conn, last_used = self._idle.pop()
+            self._in_use += 1
+        for stale in expired:
+            self._close_quietly(stale)
+
+        try:
+            if conn is not None and time.monotonic() - last_used >= self.ping_after:
+                try:
+                    conn.ping(reconnect=True, attempts=1, delay=0)
+                except mysql.connector.Error:
+                    self._close_quietly(conn)
+                    conn = None
+            if conn is None:
+                conn = mysql.connector.connect(**self.config)
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        healthy = True
+        try:
+            # Don't hand the next caller an open transaction (and its stale snapshot)
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            healthy = False
+        with self._cond:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if not healthy:
+            self._close_quietly(conn)
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            return {"size": self.size, "in_use": self._in_use, "idle": len(self._idle)}
+
+    def _take_expired(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [conn for conn, last_used in self._idle if last_used < cutoff]
+        if expired:
+            self._idle = [(conn, last_used) for conn, last_used in self._idle if last_used >= cutoff]
+        return expired
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+pool = ConnectionPool()
+
+
+def get_connection():
+    return pool.get_connection()
+
+
+def connect_server():
+    """Unpooled connection without a default database, for CREATE DATABASE."""
+    config = {k: v for k, v in DB_CONFIG.items() if k != "database"}
+    return load_driver().connect(**config)
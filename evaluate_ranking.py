@@ -0,0 +1,101 @@
+import sys
+import csv
+import time
+import locale
+import argparse
+from catalog import Catalog, CATALOG_DB, CATALOG_SOURCE
+from ranking import Ranker, title_key, parse_history_time
+
+# Replays history.csv in time order. Before each song play, the songs of that
+# song's mood are ranked from the plays seen so far; a hit is the played song
+# landing in the top K. The catalog's own order is scored the same way as a
+# baseline.
+
+EVAL_TOP_K = 5
+EVAL_WARMUP = 0   # plays recorded before scoring starts
+
+
+def read_plays(path, cat="music"):
+    """(timestamp, title) of every play of one category, oldest first."""
+    plays = []
+    with open(path, "r", newline="", encoding=locale.getpreferredencoding(False), errors="replace") as f:
+        for row in csv.reader(f):
+            if len(row) >= 4 and row[0] == cat:
+                when = parse_history_time(row[2], row[3])
+                if when is not None:
+                    plays.append((when, row[1]))
+    plays.sort(key=lambda play: play[0])
+    return plays
+
+
+def evaluate(plays, catalog, top_k=EVAL_TOP_K, warmup=EVAL_WARMUP):
+    """Returns a dict of hit rates, latency and counts."""
+    songs_by_mood, mood_of = {}, {}
+    for mood in catalog.moods():
+        songs = [e["title"] for e in catalog.mood_entries(mood) if e["kind"] == "songs"]
+        songs_by_mood[mood] = songs
+        for title in songs:
+            mood_of.setdefault(title_key(title), mood)
+
+    ranker = Ranker()
+    hits = baseline_hits = scored = unknown = 0
+    latencies = []
+    for n, (when, title) in enumerate(plays):
+        mood = mood_of.get(title_key(title))
+        if mood is None:
+            unknown += 1
+        elif n >= warmup:
+            candidates = songs_by_mood[mood]
+            start = time.perf_counter()
+            ranked = ranker.rank(candidates, key=lambda t: ("music", t), now=when)
+            latencies.append(time.perf_counter() - start)
+            key = title_key(title)
+            hits += any(title_key(t) == key for t in ranked[:top_k])
+            baseline_hits += any(title_key(t) == key for t in candidates[:top_k])
+            scored += 1
+        ranker.record_play("music", title, when)
+
+    latencies.sort()
+    return {
+        "plays": len(plays),
+        "scored": scored,
+        "not_in_catalog": unknown,
+        "hit_rate": hits / scored if scored else 0.0,
+        "baseline_hit_rate": baseline_hits / scored if scored else 0.0,
+        "latency_mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay history.csv and score the recommendation ranking.")
+    parser.add_argument("--history", default="history.csv")
+    parser.add_argument("--catalog", default=CATALOG_DB)
+    parser.add_argument("--source", default=CATALOG_SOURCE)
+    parser.add_argument("--top-k", type=int, default=EVAL_TOP_K)
+    parser.add_argument("--warmup", type=int, default=EVAL_WARMUP,
+                        help="plays recorded before scoring starts")
+    args = parser.parse_args(argv)
+
+    try:
+        plays = read_plays(args.history)
+    except OSError as e:
+        print(f"Cannot read history: {e}", file=sys.stderr)
+        return 1
+    catalog = Catalog(args.catalog, args.source)
+    try:
+        result = evaluate(plays, catalog, args.top_k, args.warmup)
+    finally:
+        catalog.close()
+
+    print(f"Plays: {result['plays']} ({result['scored']} scored, "
+          f"{result['not_in_catalog']} not in the catalog)")
+    print(f"Hit rate @{args.top_k}: {result['hit_rate']:.1%} "
+          f"(catalog order: {result['baseline_hit_rate']:.1%})")
+    print(f"Ranking latency: mean {result['latency_mean_ms']:.3f} ms, "
+          f"p95 {result['latency_p95_ms']:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import os
+import sys
+import mmap
+import time
+import struct
+
+# How the admin panel finds a running dashboard without scanning processes.
+#
+# dashboard.lock - holds the dashboard's PID and stays locked while it runs;
+#                  the OS drops the lock when the process exits, however it exits.
+# dashboard.heartbeat - a small memory-mapped record the dashboard rewrites every
+#                  second: PID, start time, last beat, event-loop lag and RSS.
+
+# Next to the code, not the working directory, so the admin panel and a
+# dashboard started from anywhere look at the same files
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCK_FILE = os.path.join(APP_DIR, "dashboard.lock")
+HEARTBEAT_FILE = os.path.join(APP_DIR, "dashboard.heartbeat")
+HEARTBEAT_INTERVAL = 1000      # ms between beats
+HEARTBEAT_STALE_AFTER = 5.0    # seconds without a beat before a running dashboard counts as hung
+LOCK_ATTEMPTS = 5              # tries to take the lock, LOCK_RETRY_DELAY apart, before giving up
+LOCK_RETRY_DELAY = 0.025       # seconds; is_locked() holds the lock only for a moment
+
+# magic, sequence (odd while a beat is being written), pid, started, beat, lag ms, rss bytes
+RECORD = struct.Struct("<4sIqdddQ")
+MAGIC = b"HLMH"
+LOCK_OFFSET = 1 << 20  # Windows locks a byte range; lock one past the PID so it stays readable
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(f):
+        try:
+            f.seek(LOCK_OFFSET)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(f):
+        f.seek(LOCK_OFFSET)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(f):
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def current_rss():
+    """Resident memory of this process in bytes, 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return 0
+
+
+class Heartbeat:
+    """The dashboard's side: holds the lock and writes beats."""
+
+    def __init__(self, lock_path=LOCK_FILE, path=HEARTBEAT_FILE):
+        self.lock_path = lock_path
+        self.path = path
+        self._lock_file = None
+        self._file = None
+        self._map = None
+        self._seq = 0
+        self.started = 0.0
+
+    def acquire(self):
+        """Take the lock and map the heartbeat; False if another dashboard holds it."""
+        f = open(self.lock_path, "a+")
+        # is_locked() briefly takes the lock itself; don't mistake that for a running dashboard
+        for attempt in range(LOCK_ATTEMPTS):
+            if _try_lock(f):
+                break
+            if attempt + 1 < LOCK_ATTEMPTS:
+                time.sleep(LOCK_RETRY_DELAY)
+        else:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._lock_file = f
+
+        self._file = open(self.path, "a+b")
+        self._file.truncate(RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), RECORD.size)
+        self.started = time.time()
+        self.beat(0.0)
+        return True
+
+    def beat(self, lag_ms, rss=None):
+        if self._map is None:
+            return
+        rss = current_rss() if rss is None else rss
+        # Odd sequence while the record is half written, so readers retry
+        self._seq += 1
+        struct.pack_into("<I", self._map, 4, self._seq)
+        RECORD.pack_into(self._map, 0, MAGIC, self._seq, os.getpid(), self.started,
+                         time.time(), lag_ms, rss)
+        self._seq += 1
+        struct.pack_into("<I", self._map, 4, self._seq)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+        if self._lock_file is not None:
+            try:
+                _unlock(self._lock_file)
+            except OSError:
+                pass
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def is_locked(lock_path=LOCK_FILE):
+    """True while a dashboard holds the lock - an O(1) check, no process scan."""
+    try:
+        f = open(lock_path, "r+")
+    except OSError:  # no lock file: no dashboard has run here
+        return False
+    try:
+        if _try_lock(f):
+            _unlock(f)
+            return False
+        return True
+    finally:
+        f.close()
+
+
+def read_record(path=HEARTBEAT_FILE, retries=5):
+    """The last beat as a dict, or None if there is no valid record."""
+    try:
+        with open(path, "rb") as f:
+            for _ in range(retries):
+                f.seek(0)
+                data = f.read(RECORD.size)
+                if len(data) < RECORD.size:
+                    return None
+                magic, seq, pid, started, beat, lag_ms, rss = RECORD.unpack(data)
+                if magic != MAGIC:
+                    return None
+                if seq % 2 == 0:
+                    return {"pid": pid, "started": started, "beat": beat, "lag_ms": lag_ms, "rss": rss}
+                time.sleep(0.001)
+    except OSError:
+        pass
+    return None
+
+
+def read_status(lock_path=LOCK_FILE, path=HEARTBEAT_FILE, stale_after=HEARTBEAT_STALE_AFTER, now=None):
+    """{"running": False} if no dashboard holds the lock; otherwise the last beat
+    plus its "age" and whether it is still "responding"."""
+    if not is_locked(lock_path):
+        return {"running": False}
+    status = {"running": True, "responding": False, "pid": None}
+    record = read_record(path)
+    if record:
+        age = (now if now is not None else time.time()) - record["beat"]
+        status.update(record, age=age, responding=age < stale_after)
+    else:
+        try:
+            with open(lock_path) as f:
+                status["pid"] = int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            pass
+    return status
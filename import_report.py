@@ -0,0 +1,101 @@
+import builtins
+import os
+import sys
+import runpy
+import threading
+import time
+
+# Startup import timing, like `python -X importtime` but built into the app.
+# Run a script under it to see what its imports cost:
+#   python import_report.py dashboard.py [args...]
+# The report is printed when the script calls report() (the dashboard and the
+# login window do at first paint), or when it exits.
+
+IMPORT_REPORT_TOP = 15   # slowest imports listed by report()
+
+
+class ImportTimer:
+    """Times every first-time import made on the main thread.
+
+    Each module gets its self time (excluding the imports it triggered) and its
+    cumulative time, in seconds.
+    """
+
+    def __init__(self):
+        self.timings = {}  # module name -> (self, cumulative)
+        self._stack = []   # time spent in child imports of each open import
+        self._original = None
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original or builtins.__import__
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            name_key = f"{package}.{name}" if name else package
+        else:
+            name_key = name
+        if name_key in sys.modules or threading.current_thread() is not threading.main_thread():
+            return original(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.timings.setdefault(name_key, (elapsed - children, elapsed))
+
+    def slowest(self, top=IMPORT_REPORT_TOP):
+        return sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)[:top]
+
+    def report(self, top=IMPORT_REPORT_TOP, out=None):
+        out = out or sys.stderr
+        total = sum(self_time for self_time, _ in self.timings.values())
+        print(f"Import report: {len(self.timings)} modules, {total * 1000:.0f} ms", file=out)
+        print(f"{'self ms':>9} {'cumul ms':>9}  module", file=out)
+        for name, (self_time, cumulative) in self.slowest(top):
+            print(f"{self_time * 1000:9.1f} {cumulative * 1000:9.1f}  {name}", file=out)
+
+
+timer = ImportTimer()
+
+
+def report(top=IMPORT_REPORT_TOP):
+    """Print the slowest imports so far (if timing is on) and stop timing."""
+    if timer._original is not None:
+        timer.uninstall()
+        timer.report(top)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python import_report.py SCRIPT [args...]", file=sys.stderr)
+        return 2
+    script = argv[0]
+    sys.argv = list(argv)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    timer.install()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        report()
+    return 0
+
+
+if __name__ == "__main__":
+    # The script imports this module by name; share that copy's timer rather than __main__'s
+    import import_report
+    sys.exit(import_report.main())
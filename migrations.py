@@ -0,0 +1,73 @@
+import sys
+import argparse
+from db_pool import get_connection, load_driver
+
+# Schema changes applied on top of the existing tables, oldest first. Each one
+# runs once; applied names are recorded in schema_migrations.
+# Run with: python migrations.py
+
+MIGRATIONS = [
+    # Keyset pagination of the admin appointments view (newest first)
+    ("appointments_created_at_id",
+     "CREATE INDEX idx_appointments_created_at_id ON appointments (created_at, id)"),
+]
+
+ER_DUP_KEYNAME = 1061   # the index already exists (e.g. created by hand)
+
+
+def applied_migrations(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations(
+            name VARCHAR(100) PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT name FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(conn, migrations=MIGRATIONS):
+    """Apply the migrations not yet recorded; returns the names applied."""
+    mysql = load_driver()
+    cursor = conn.cursor()
+    try:
+        done = applied_migrations(cursor)
+        applied = []
+        for name, statement in migrations:
+            if name in done:
+                continue
+            try:
+                cursor.execute(statement)
+            except mysql.Error as e:
+                if e.errno != ER_DUP_KEYNAME:
+                    raise
+            cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+            conn.commit()
+            applied.append(name)
+        return applied
+    finally:
+        cursor.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply pending HILOM schema migrations.")
+    parser.parse_args(argv)
+    mysql = load_driver()
+    try:
+        conn = get_connection()
+        try:
+            applied = migrate(conn)
+        finally:
+            conn.close()
+    except mysql.Error as e:
+        print(f"Migration failed: {e}", file=sys.stderr)
+        return 1
+    for name in applied:
+        print(f"Applied {name}")
+    if not applied:
+        print("Schema is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
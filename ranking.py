@@ -0,0 +1,142 @@
+import re
+import csv
+import math
+import random
+import locale
+from datetime import datetime
+
+# Orders recommendations by what this user actually listens to: how often a
+# title was played, how recently, and whether it (or its artist) is a favorite.
+# State is kept per title and updated one event at a time, so ranking a mood
+# never rescans history.csv.
+
+RANK_HALF_LIFE_DAYS = 14      # a play counts half as much for recency after this many days
+RANK_PLAY_WEIGHT = 1.0        # weight of log(1 + play count)
+RANK_RECENCY_WEIGHT = 2.0     # weight of the decayed play score
+RANK_FAVORITE_WEIGHT = 3.0    # the title itself is a favorite
+RANK_ARTIST_WEIGHT = 1.0      # another song by the same artist is a favorite
+RANK_EXPLORE_WEIGHT = 0.5     # pick() weight every title gets, so unplayed ones still come up
+
+_ARTIST_SEPARATOR = re.compile(r"\s[–\-�]\s")
+
+
+def title_key(title):
+    """Case- and punctuation-insensitive key, so "A – B" in the catalog matches a
+    history row whose dash was written in another encoding."""
+    return " ".join(re.findall(r"\w+", title.casefold()))
+
+
+def artist_key(title):
+    parts = _ARTIST_SEPARATOR.split(title, maxsplit=1)
+    return title_key(parts[0]) if len(parts) == 2 else None
+
+
+def parse_history_time(date, time):
+    try:
+        return datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+class TitleStats:
+    __slots__ = ("plays", "score", "updated")
+
+    def __init__(self):
+        self.plays = 0
+        self.score = 0.0     # plays decayed to `updated`
+        self.updated = 0.0   # epoch seconds
+
+
+class Ranker:
+    """Play counts, recency and favorite affinity per (category, title)."""
+
+    def __init__(self, half_life_days=RANK_HALF_LIFE_DAYS):
+        self.decay = math.log(2) / (half_life_days * 86400)
+        self.stats = {}              # (category, title key) -> TitleStats
+        self.favorites = set()       # (category, title key)
+        self.favorite_artists = {}   # (category, artist key) -> number of favorites by that artist
+
+    def record_play(self, cat, title, when=None):
+        when = when if when is not None else datetime.now().timestamp()
+        key = (cat, title_key(title))
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = TitleStats()
+        stats.plays += 1
+        if when >= stats.updated:
+            stats.score = stats.score * math.exp(-self.decay * (when - stats.updated)) + 1.0
+            stats.updated = when
+        else:
+            # Out-of-order row: decay the new play to the latest one instead
+            stats.score += math.exp(-self.decay * (stats.updated - when))
+
+    def set_favorite(self, cat, title, favorite=True):
+        key = (cat, title_key(title))
+        if favorite == (key in self.favorites):
+            return
+        artist = artist_key(title)
+        if favorite:
+            self.favorites.add(key)
+            if artist:
+                self.favorite_artists[(cat, artist)] = self.favorite_artists.get((cat, artist), 0) + 1
+        else:
+            self.favorites.discard(key)
+            if artist:
+                left = self.favorite_artists.get((cat, artist), 1) - 1
+                if left:
+                    self.favorite_artists[(cat, artist)] = left
+                else:
+                    self.favorite_artists.pop((cat, artist), None)
+
+    def score(self, cat, title, now=None):
+        now = now if now is not None else datetime.now().timestamp()
+        key = (cat, title_key(title))
+        total = 0.0
+        stats = self.stats.get(key)
+        if stats is not None:
+            recency = stats.score * math.exp(-self.decay * max(0.0, now - stats.updated))
+            total += RANK_PLAY_WEIGHT * math.log1p(stats.plays) + RANK_RECENCY_WEIGHT * recency
+        if key in self.favorites:
+            total += RANK_FAVORITE_WEIGHT
+        artist = artist_key(title)
+        if artist and (cat, artist) in self.favorite_artists:
+            total += RANK_ARTIST_WEIGHT
+        return total
+
+    def rank(self, items, key=lambda item: item, now=None):
+        """items sorted best first; key(item) gives its (category, title).
+
+        Ties (e.g. everything never played) keep their original order.
+        """
+        now = now if now is not None else datetime.now().timestamp()
+        scores = [self.score(*key(item), now=now) for item in items]
+        order = sorted(range(len(items)), key=lambda i: -scores[i])
+        return [items[i] for i in order]
+
+    def pick(self, items, key=lambda item: item, rng=random, now=None):
+        """One item at random, weighted towards the higher ranked ones."""
+        if not items:
+            return None
+        now = now if now is not None else datetime.now().timestamp()
+        weights = [RANK_EXPLORE_WEIGHT + self.score(*key(item), now=now) for item in items]
+        return rng.choices(items, weights=weights)[0]
+
+    def load_history(self, path, categories=None):
+        """Replay history.csv rows into the play stats; returns how many were read."""
+        count = 0
+        try:
+            with open(path, "r", newline="", encoding=locale.getpreferredencoding(False),
+                      errors="replace") as f:
+                for row in csv.reader(f):
+                    if len(row) < 4 or (categories and row[0] not in categories):
+                        continue
+                    when = parse_history_time(row[2], row[3])
+                    if when is None:
+                        continue
+                    self.record_play(row[0], row[1], when)
+                    count += 1
+        except FileNotFoundError:
+            pass
+        except (OSError, csv.Error) as e:
+            print(f"Error reading history for ranking: {e}")
+        return count
@@ -4,6 +4,8 @@ import os
 import csv
 import tempfile
 import shutil
+import json
+import time
 from unittest.mock import patch, MagicMock, mock_open
 from datetime import datetime
 
@@ -12,6 +14,14 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import the dashboard module
 import dashboard
+import catalog
+import ranking
+import evaluate_ranking
+import admin
+import migrations
+import heartbeat
+import control
+import LOGIN1
 
 
 class TestDashboardData(unittest.TestCase):
@@ -81,21 +91,395 @@ class TestUtilityFunctions(unittest.TestCase):
         shutil.rmtree(self.test_dir)
 
     def test_log_history(self):
-        """Test log_history function."""
-        # Test logging with mocked datetime and file operations
-        with patch('builtins.open', mock_open()) as mock_file, \
-             patch('csv.writer') as mock_writer:
-
-            # Mock the datetime import inside the function
-            with patch('dashboard.log_history') as mock_log_history:
-                # We can't easily mock the local import, so let's just test that the function can be called
-                # without errors for basic structure testing
-                try:
-                    dashboard.log_history("test_category", "test_item")
-                    # If we get here without exception, basic structure is OK
-                    self.assertTrue(True, "log_history function executed without error")
-                except Exception as e:
-                    self.fail(f"log_history function failed: {e}")
+        """Test log_history queues a row that reaches history.csv on flush."""
+        writer = dashboard.HistoryWriter(self.history_file)
+        with patch('dashboard.history_writer', writer):
+            dashboard.log_history("test_category", "test_item")
+            self.assertTrue(writer.flush())
+        writer.close()
+
+        with open(self.history_file, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][:2], ["test_category", "test_item"])
+        datetime.strptime(f"{rows[0][2]} {rows[0][3]}", "%Y-%m-%d %H:%M:%S")
+
+    def test_history_writer_batches_in_order(self):
+        """Test HistoryWriter keeps row order across batches and flushes on close."""
+        writer = dashboard.HistoryWriter(self.history_file, batch_size=3, flush_interval=60)
+        for i in range(7):
+            writer.write(["music", f"song {i}", "2025-12-14", "10:00:00"])
+        writer.close()
+
+        with open(self.history_file, newline="") as f:
+            titles = [row[1] for row in csv.reader(f)]
+        self.assertEqual(titles, [f"song {i}" for i in range(7)])
+
+    def test_history_writer_survives_bad_batch(self):
+        """Test a batch that fails to write doesn't stop the writer thread or hang flush()."""
+        class Unprintable:
+            def __str__(self):
+                raise RuntimeError("no text")
+
+        writer = dashboard.HistoryWriter(self.history_file, batch_size=10, flush_interval=60)
+        with patch('builtins.print') as mock_print:
+            writer.write(["music", Unprintable(), "2025-12-14", "10:00:00"])
+            self.assertTrue(writer.flush(timeout=2))
+            writer.write(["music", "song 1", "2025-12-14", "10:00:01"])
+            self.assertTrue(writer.flush(timeout=2))
+            writer.close()
+        self.assertIn("1 row(s) dropped", mock_print.call_args_list[0][0][0])
+
+        with open(self.history_file, newline="") as f:
+            titles = [row[1] for row in csv.reader(f)]
+        self.assertEqual(titles[-1], "song 1")
+
+    def test_history_writer_durability_modes(self):
+        """Test HistoryWriter accepts the known durability modes only."""
+        for mode in dashboard.HistoryWriter.DURABILITY_MODES:
+            dashboard.HistoryWriter(self.history_file, durability=mode)
+        with self.assertRaises(ValueError):
+            dashboard.HistoryWriter(self.history_file, durability="sometimes")
+
+
+    def test_quote_store_splits_glued_rows(self):
+        """Test QuoteStore skips the header and splits rows glued together with a row number."""
+        path = os.path.join(self.test_dir, 'quotes.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            f.write('Quote,Author\n')
+            f.write('"First.","Ann"\n')
+            f.write('"Second.","Bob"11,"Third.","Cy"\n')
+
+        store = dashboard.QuoteStore(path)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.get(1), ("Second.", "Bob"))
+        self.assertEqual(store.get(2), ("Third.", "Cy"))
+        self.assertEqual(store.get(3), store.get(0))  # wraps around
+
+        day = datetime(2025, 12, 14).date()
+        self.assertEqual(store.index_for_day(day), store.index_for_day(day))
+
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            f.write('"Fourth.","Di"\n')
+        self.assertEqual(len(store), 4)
+
+    def test_quote_store_missing_file(self):
+        """Test QuoteStore falls back to the default quote when the file is missing."""
+        store = dashboard.QuoteStore(os.path.join(self.test_dir, 'missing.csv'))
+        self.assertEqual(store.get(store.index_for_day()), dashboard.DEFAULT_QUOTE)
+
+    def test_frame_timer_rolling_window(self):
+        """Test FrameTimer keeps only the last N frame times."""
+        timer = dashboard.FrameTimer("test", samples=3, report=False)
+        self.assertEqual(timer.average_ms(), 0.0)
+        for _ in range(5):
+            timer.begin()
+            timer.end()
+        timer.end()  # end() without begin() is ignored
+        self.assertEqual(len(timer.samples), 3)
+        self.assertGreaterEqual(timer.worst_ms(), timer.average_ms())
+
+    def test_import_timer_records_first_imports(self):
+        """Test ImportTimer records modules imported while installed, and only the first time."""
+        import import_report
+        with open(os.path.join(self.test_dir, 'slow_module_for_test.py'), 'w') as f:
+            f.write("import time\ntime.sleep(0.01)\n")
+        sys.path.insert(0, self.test_dir)
+        timer = import_report.ImportTimer()
+        timer.install()
+        try:
+            import slow_module_for_test  # noqa: F401
+            import slow_module_for_test  # noqa: F401,F811
+        finally:
+            timer.uninstall()
+            sys.path.remove(self.test_dir)
+            sys.modules.pop('slow_module_for_test', None)
+
+        self_time, cumulative = timer.timings['slow_module_for_test']
+        self.assertGreaterEqual(self_time, 0.01)
+        self.assertGreaterEqual(cumulative, self_time)
+        self.assertEqual(timer.slowest(1)[0][0], 'slow_module_for_test')
+
+    def test_import_report_launcher(self):
+        """Test running a script through import_report times the script's own imports."""
+        import io
+        import import_report
+        with open(os.path.join(self.test_dir, 'launched_module_for_test.py'), 'w') as f:
+            f.write("import time\ntime.sleep(0.01)\n")
+        script = os.path.join(self.test_dir, 'launched_script.py')
+        with open(script, 'w') as f:
+            f.write("import launched_module_for_test\n")
+        err = io.StringIO()
+        saved_argv, saved_path = sys.argv[:], sys.path[:]
+        try:
+            with patch('sys.stderr', err):
+                self.assertEqual(import_report.main([script]), 0)
+        finally:
+            sys.argv[:], sys.path[:] = saved_argv, saved_path
+            sys.modules.pop('launched_module_for_test', None)
+            import_report.timer.timings.clear()
+        self.assertIsNone(import_report.timer._original)
+        self.assertIn("launched_module_for_test", err.getvalue())
+
+class TestHistoryStore(unittest.TestCase):
+    """Test cases for the columnar history store and its list model."""
+
+    def test_pack_timestamp(self):
+        """Test timestamps pack into YYYYMMDDHHMMSS and format back."""
+        packed = dashboard.pack_timestamp("2025-12-14", "11:44:46")
+        self.assertEqual(packed, 20251214114446)
+        self.assertEqual(dashboard.format_timestamp(packed), "2025-12-14 11:44:46")
+        self.assertEqual(dashboard.pack_timestamp("yesterday", "noon"), 0)
+
+    def test_store_interns_titles(self):
+        """Test repeated titles share one interned title id."""
+        store = dashboard.HistoryStore()
+        first = store.append("music", "Bruno Mars – 24K Magic", 20251214114446)
+        second = store.append("music", "Bruno Mars – 24K Magic", 20251214114449)
+        store.append("video", "How To be Happy")
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(len(store.titles), 2)
+        self.assertEqual(store.title_ids[first], store.title_ids[second])
+        self.assertEqual(store.category(2), "video")
+
+    def test_list_model_formats_rows_on_demand(self):
+        """Test the list model only holds row indexes and formats text in data()."""
+        store = dashboard.HistoryStore()
+        model = dashboard.HistoryListModel(store)
+        rows = [store.append("music", "Taylor Swift – 22", 20251214163000),
+                store.append("music", "No Time Song")]
+        model.append_rows(rows)
+
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.data(model.index(0)), "Taylor Swift – 22 - 2025-12-14 16:30:00")
+        self.assertEqual(model.data(model.index(1)), "No Time Song")
+        model.clear()
+        self.assertEqual(model.rowCount(), 0)
+
+
+class TestFavoritesStore(unittest.TestCase):
+    """Test cases for the append-only favorites store."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'favorites.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def read_rows(self):
+        with open(self.path, newline='') as f:
+            return list(csv.reader(f))
+
+    def test_add_appends_one_line(self):
+        """Test adding favorites only appends, ignores repeats and survives a reload."""
+        store = dashboard.FavoritesStore(self.path)
+        for i in range(1000):
+            self.assertTrue(store.add("music", f"song {i}"))
+        self.assertFalse(store.add("music", "song 5"))
+        self.assertTrue(store.add("book", "song 5"))
+
+        self.assertEqual(len(self.read_rows()), 1001)
+        reloaded = dashboard.FavoritesStore(self.path)
+        self.assertIn(("music", "song 999"), reloaded)
+        self.assertNotIn(("video", "song 1"), reloaded)
+        self.assertEqual(reloaded.items("music")[:2], ["song 0", "song 1"])
+        self.assertEqual(reloaded.count(), 1001)
+
+    def test_remove_and_compact(self):
+        """Test removals are appended as tombstones and compacted away once they dominate."""
+        store = dashboard.FavoritesStore(self.path, compact_min=10, compact_ratio=0.5)
+        for i in range(10):
+            store.add("video", f"clip {i}")
+        store.remove("video", "clip 0")
+        self.assertFalse(store.remove("video", "clip 0"))
+        self.assertEqual(self.read_rows()[-1], ["video", "clip 0", "-"])
+
+        for i in range(1, 9):
+            store.remove("video", f"clip {i}")
+        self.assertLess(len(self.read_rows()), 19)  # compacted along the way
+        self.assertEqual(dashboard.FavoritesStore(self.path).items("video"), ["clip 9"])
+
+        store.compact()
+        self.assertEqual(self.read_rows(), [["video", "clip 9"]])
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for the content catalog and its search."""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt5.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        content = {
+            "HAPPY": {
+                "songs": ["SEVENTEEN – Very Nice (아주 NICE)", "Taylor Swift – 22"],
+                "videos": [{"title": "You Don't Find Happiness | TEDxGöteborg",
+                            "youtube": "https://youtu.be/9vBXX1ZkyoQ", "spotify": ""}],
+                "books": [{"title": "Les Caractères", "description": "Jean de La Bruyère on human nature",
+                           "link": "https://example.com/book"}],
+            },
+            "SAD": {
+                "songs": ["Coldplay – Fix You"],
+                "videos": [{"title": "Cut short", "youtube": "https://youtu.be/0kOPrP7zE0", "spotify": ""}],
+            },
+        }
+        self.test_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.test_dir, "catalog.json")
+        with open(self.source, "w", encoding="utf-8") as f:
+            json.dump(content, f, ensure_ascii=False)
+        with patch("builtins.print"):
+            self.catalog = catalog.Catalog(os.path.join(self.test_dir, "catalog.db"), self.source)
+            self.index = dashboard.SearchIndex(list(self.catalog.iter_entries()))
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.test_dir)
+
+    def titles(self, query):
+        return [entry["title"] for entry in self.index.search(query)]
+
+    def test_catalog_ids(self):
+        """Test catalog ids are global and each mood keeps its order."""
+        self.assertEqual(self.catalog.moods(), ["HAPPY", "SAD"])
+        self.assertEqual([e["id"] for e in self.catalog.mood_entries("SAD")], [4, 5])
+        self.assertEqual(self.catalog.get(2)["youtube"], "https://youtu.be/9vBXX1ZkyoQ")
+        self.assertEqual(self.catalog.get(0)["artist"], "SEVENTEEN")
+        self.assertEqual(self.index.get(3)["title"], "Les Caractères")
+
+    def test_catalog_validation(self):
+        """Test a truncated YouTube link is reported and left out, and an edited source is rebuilt."""
+        problems = catalog.check(json.load(open(self.source, encoding="utf-8")))
+        self.assertEqual([entry["title"] for entry, _ in problems], ["Cut short"])
+        self.assertEqual(self.catalog.get(5)["youtube"], "")
+
+        self.catalog.close()
+        with open(self.source, "w", encoding="utf-8") as f:
+            json.dump({"CALM": {"songs": ["Enya – Only Time"]}}, f)
+        os.utime(self.source, ns=(0, 10 ** 18))
+        self.assertEqual(self.catalog.moods(), ["CALM"])
+
+    def test_prefix_and_accent_insensitive(self):
+        """Test queries match word prefixes regardless of case and accents, across fields."""
+        self.assertEqual(self.titles("bruyere"), ["Les Caractères"])
+        self.assertEqual(self.titles("CARACT"), ["Les Caractères"])
+        self.assertEqual(self.titles("tedxgöte"), ["You Don't Find Happiness | TEDxGöteborg"])
+        self.assertEqual(self.titles("아"), ["SEVENTEEN – Very Nice (아주 NICE)"])
+        self.assertEqual(self.titles("sad fix"), ["Coldplay – Fix You"])
+        self.assertEqual(len(self.titles("happy")), 4)
+        self.assertEqual(self.titles("happy coldplay"), [])
+        self.assertEqual(self.titles("  "), [])
+
+    def test_catalog_paths_are_absolute(self):
+        """Test the catalog files don't depend on the working directory."""
+        self.assertEqual(os.path.dirname(catalog.CATALOG_DB), os.path.dirname(os.path.abspath(catalog.__file__)))
+        self.assertTrue(os.path.isabs(catalog.CATALOG_SOURCE))
+
+    def test_book_without_link_is_disabled(self):
+        """Test a book whose link failed validation can't be clicked and never opens an empty URL."""
+        from PyQt5.QtWidgets import QListWidget
+        page = MagicMock()
+        page.song_list, page.video_list, page.book_list = QListWidget(), QListWidget(), QListWidget()
+        books = [{"id": 3, "kind": "books", "title": "Les Caractères", "link": "https://example.com/book"},
+                 {"id": 7, "kind": "books", "title": "Broken", "link": ""}]
+        dashboard.RecommendationApp.show_entries(page, books)
+        self.assertTrue(page.book_list.item(0).flags() & dashboard.Qt.ItemFlag.ItemIsEnabled)
+        self.assertFalse(page.book_list.item(1).flags() & dashboard.Qt.ItemFlag.ItemIsEnabled)
+
+        with patch("dashboard.catalog_entry", return_value=books[1]), \
+             patch("dashboard.webbrowser.open") as mock_open, patch("dashboard.log_history") as mock_log:
+            dashboard.RecommendationApp.book_click(page, page.book_list.item(1))
+        mock_open.assert_not_called()
+        mock_log.assert_not_called()
+
+    def test_random_pick_skips_moods_without_songs(self):
+        """Test a random pick only lands on moods that have songs, and does nothing if none do."""
+        entries = {"READ": [{"id": 0, "kind": "books", "title": "A Book", "link": "https://example.com"}],
+                   "HAPPY": [{"id": 1, "kind": "songs", "title": "Taylor Swift – 22"}]}
+        content = MagicMock()
+        content.moods.return_value = list(entries)
+        content.mood_entries.side_effect = entries.get
+        page = MagicMock(current_titles=[])
+        page.song_list.findItems.return_value = []
+        with patch.object(dashboard, "content_catalog", content), \
+             patch.object(dashboard, "get_ranker", return_value=ranking.Ranker()):
+            for _ in range(10):
+                dashboard.RecommendationApp.random_pick(page)
+            page.player.load_youtube_search_and_autoplay.assert_called_with("Taylor Swift – 22")
+            page.show_playlist.assert_called_with("HAPPY")
+            self.assertEqual(page.player.load_youtube_search_and_autoplay.call_count, 10)
+
+            del entries["HAPPY"]
+            content.moods.return_value = list(entries)
+            page.reset_mock()
+            dashboard.RecommendationApp.random_pick(page)
+            page.player.load_youtube_search_and_autoplay.assert_not_called()
+
+    def test_clicks_use_index_once_built(self):
+        """Test entries clicked after the index is built come from its id map, not catalog.db."""
+        with patch.object(dashboard, "content_catalog", self.catalog):
+            dashboard.reset_search_index()
+            try:
+                self.assertEqual(dashboard.catalog_entry(3)["title"], "Les Caractères")
+                dashboard.get_search_index()
+                with patch.object(self.catalog, "get", side_effect=AssertionError("catalog.db queried")):
+                    self.assertEqual(dashboard.catalog_entry(3)["title"], "Les Caractères")
+                    self.assertEqual(dashboard.catalog_entry(5)["mood"], "SAD")
+            finally:
+                dashboard.reset_search_index()
+
+
+class TestRanker(unittest.TestCase):
+    """Test cases for history-aware ranking."""
+
+    def test_plays_recency_and_favorites(self):
+        """Test play counts and recency raise a title, favorites raise it and its artist."""
+        ranker = ranking.Ranker(half_life_days=1)
+        songs = ["A – One", "A – Two", "B – Three", "C – Four"]
+        day = 86400.0
+        for _ in range(3):
+            ranker.record_play("music", "C – Four", 0.0)
+        ranker.record_play("music", "B – Three", 10 * day)
+        self.assertEqual(ranker.rank(songs, key=lambda t: ("music", t), now=10 * day)[:2],
+                         ["B – Three", "C – Four"])
+        # A history row whose dash was mis-decoded still counts for the same song
+        ranker.record_play("music", "A \ufffd Two", 10 * day)
+        ranker.set_favorite("music", "A – One")
+        ranked = ranker.rank(songs, key=lambda t: ("music", t), now=10 * day)
+        self.assertEqual(ranked, ["A – One", "A – Two", "B – Three", "C – Four"])
+        ranker.set_favorite("music", "A – One", False)
+        self.assertEqual(ranker.score("music", "A – One", now=10 * day), 0.0)
+
+    def test_load_history_and_evaluate(self):
+        """Test history.csv replay feeds the ranker and the offline evaluation."""
+        test_dir = tempfile.mkdtemp()
+        try:
+            history = os.path.join(test_dir, "history.csv")
+            with open(history, "w", newline="") as f:
+                csv.writer(f).writerows([
+                    ["music", "X – Hit", "2025-01-01", "10:00:00"],
+                    ["video", "Some talk", "2025-01-01", "10:05:00"],
+                    ["music", "X – Hit", "2025-01-02", "bad"],
+                    ["music", "X – Hit", "2025-01-03", "10:00:00"],
+                    ["music", "Unknown", "2025-01-04", "10:00:00"],
+                ])
+            ranker = ranking.Ranker()
+            self.assertEqual(ranker.load_history(history, {"music"}), 3)
+            self.assertEqual(ranker.stats[("music", "x hit")].plays, 2)
+
+            source = os.path.join(test_dir, "catalog.json")
+            with open(source, "w", encoding="utf-8") as f:
+                json.dump({"HAPPY": {"songs": ["Y – Other", "X – Hit"]}}, f, ensure_ascii=False)
+            content = catalog.Catalog(os.path.join(test_dir, "catalog.db"), source)
+            result = evaluate_ranking.evaluate(evaluate_ranking.read_plays(history), content, top_k=1)
+            content.close()
+            self.assertEqual((result["scored"], result["not_in_catalog"]), (2, 1))
+            self.assertEqual((result["hit_rate"], result["baseline_hit_rate"]), (0.5, 0.0))
+        finally:
+            shutil.rmtree(test_dir)
 
 
 class TestPetalClass(unittest.TestCase):
@@ -130,16 +514,709 @@ class TestPetalClass(unittest.TestCase):
         self.assertIsInstance(petal.pos.y(), float)
 
 
+    @unittest.skipIf(dashboard.np is None, "NumPy not installed")
+    def test_petal_field_step(self):
+        """Test PetalField moves every petal down and wraps the ones that fall off screen."""
+        field = dashboard.PetalField(200, 800, 600, seed=1)
+        y_before = field.y.copy()
+        field.step(800, 600, dt=2.0)
+
+        moved = y_before + field.speed * 2.0 <= 600
+        self.assertTrue((field.y[moved] > y_before[moved]).all())
+        self.assertTrue((field.y[~moved] == -10).all())
+        self.assertTrue(((field.x[~moved] >= 0) & (field.x[~moved] <= 800)).all())
+        self.assertTrue(((field.angle >= 0) & (field.angle < 360)).all())
+
+class TestAnimationScheduler(unittest.TestCase):
+    """Test cases for pausing animations of hidden pages."""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt5.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_timers_follow_page_visibility(self):
+        """Test only the shown page's timer runs, and none while paused."""
+        from PyQt5.QtWidgets import QStackedWidget, QWidget
+        from PyQt5.QtCore import QTimer
+        scheduler = dashboard.AnimationScheduler()
+        stack = QStackedWidget()
+        pages, timers = [QWidget(), QWidget()], [QTimer(), QTimer()]
+        for page, timer in zip(pages, timers):
+            stack.addWidget(page)
+            timer.setInterval(50)
+            scheduler.register(page, timer)
+        self.assertEqual(scheduler.active_count(), 0)
+
+        stack.show()
+        self.assertEqual([t.isActive() for t in timers], [True, False])
+        stack.setCurrentIndex(1)
+        self.assertEqual([t.isActive() for t in timers], [False, True])
+
+        scheduler.set_paused(True)
+        self.assertEqual(scheduler.active_count(), 0)
+        scheduler.set_paused(False)
+        self.assertEqual(scheduler.active_count(), 1)
+
+        scheduler.unregister(pages[1])
+        self.assertEqual((scheduler.active_count(), scheduler.registered_count()), (0, 1))
+        stack.close()
+
+
+class TestMainWindow(unittest.TestCase):
+    """Test cases for lazy page construction in HilomMainWindow."""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt5.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_pages_built_on_first_switch(self):
+        """Test only the Home page exists at startup and other pages are built when opened."""
+        window = dashboard.HilomMainWindow(prewarm=False)
+        self.assertIsNotNone(window.pages[0])
+        self.assertEqual(window.pages[1:], [None] * 6)
+        self.assertEqual(window.stack.count(), 7)
+
+        window.switch_page(4)
+        self.assertIs(window.stack.currentWidget(), window.favorite_page)
+        self.assertIs(window.stack.widget(4), window.favorite_page)
+        self.assertEqual(window.stack.count(), 7)
+        window.deleteLater()
+
+    def test_window_does_not_start_outbox(self):
+        """Test building a window leaves the outbox thread to __main__."""
+        with patch.object(dashboard.appointment_outbox, 'start') as mock_start:
+            window = dashboard.HilomMainWindow(prewarm=False)
+            window.deleteLater()
+        mock_start.assert_not_called()
+
+    def test_prewarm_skips_web_engine_page(self):
+        """Test idle prewarming builds the other pages and the search index but leaves the web-engine page for its first visit."""
+        with patch.object(dashboard, "content_catalog") as content:
+            content.iter_entries.return_value = iter([{"id": 0, "title": "Fix You", "mood": "SAD"}])
+            dashboard.reset_search_index()
+            try:
+                window = dashboard.HilomMainWindow()
+                while window.prewarm_queue:
+                    window.prewarm_next()
+                self.assertIsNone(window.pages[2])
+                self.assertTrue(all(page is not None for i, page in enumerate(window.pages) if i != 2))
+                # The search index is built while idle too, so the first search doesn't pay for it
+                self.assertEqual(dashboard._search_index.get(0)["title"], "Fix You")
+                window.deleteLater()
+            finally:
+                dashboard.reset_search_index()
+
+    def test_booking_flow_reuses_screens(self):
+        """Test going through the booking screens repeatedly creates no new widgets."""
+        from PyQt5.QtWidgets import QWidget
+        window = dashboard.HilomMainWindow(prewarm=False)
+        window.switch_page(3)
+        info = {"name": "Ana", "age": "30", "contact": "0917", "gender": "F", "address": "Nasugbu",
+                "concern": "stress", "doctor_id": 1, "hospital_id": 1, "schedule": "2025-12-14",
+                "time_slot": "10:00 AM", "consultation_type": "online", "price": 100}
+        stack_count = window.appointment_stack.count()
+        widget_count = len(window.findChildren(QWidget))
+
+        for i in range(1000):
+            window.show_appointment_detail(dashboard.HOSPITALS[i % len(dashboard.HOSPITALS)])
+            window.show_consultation_type(info)
+            window.show_confirmation(info)
+            self.app.processEvents()
+
+        self.assertEqual(window.appointment_stack.count(), stack_count)
+        self.assertEqual(len(window.findChildren(QWidget)), widget_count)
+        self.assertEqual(window.appointment_detail.name_label.text(), dashboard.HOSPITALS[999 % 3]['name'])
+        self.assertEqual(window.appointment_confirmation.detail_labels[0].text(), "Name: Ana")
+        self.assertFalse(window.appointment_consultation.next_btn.isEnabled())
+        window.deleteLater()
+
+
+class TestEventBus(unittest.TestCase):
+    """Test cases for pages following the event bus."""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt5.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_history_page_shows_logged_rows_once(self):
+        """Test a logged row appears at once and is not added again when read back from history.csv."""
+        path = os.path.join(self.test_dir, 'history.csv')
+        writer = dashboard.HistoryWriter(path)
+        with patch('dashboard.HISTORY_FILE', path), patch('dashboard.history_writer', writer):
+            page = dashboard.HistoryPage()
+            dashboard.log_history("music", "Weightless")
+            dashboard.log_history("book", "Atomic Habits")
+            self.assertEqual(page.category_models["music"].rowCount(), 1)
+
+            writer.flush()
+            page.load_history()
+            self.assertEqual(page.category_models["music"].rowCount(), 1)
+            self.assertEqual(len(page.pending_rows), 0)
+            page.deleteLater()
+        writer.close()
+
+    def test_history_page_follows_appends(self):
+        """Test rows appended to history.csv are added once, a half-written line waits, and a truncated or rotated file starts over."""
+        path = os.path.join(self.test_dir, 'history.csv')
+
+        def append(text):
+            with open(path, 'a', newline='') as f:
+                f.write(text)
+
+        def titles(page):
+            model = page.category_models["music"]
+            return [model.data(model.index(r)).split(" - ")[0] for r in range(model.rowCount())]
+
+        append("music,Song A,2025-12-14,10:00:00\r\nmusic,Song B,2025-12-14,10:01:00\r\n")
+        with patch('dashboard.HISTORY_FILE', path):
+            page = dashboard.HistoryPage()
+            self.assertEqual(titles(page), ["Song A", "Song B"])
+
+            append("music,Song C,2025-12-14,10:02:00\r\njournal,Dear di")
+            page.load_history()
+            self.assertEqual(titles(page), ["Song A", "Song B", "Song C"])
+            self.assertEqual(page.category_models["journal"].rowCount(), 0)
+
+            append("ary,2025-12-14,10:03:00\r\n")
+            page.load_history()
+            self.assertEqual(page.category_models["journal"].rowCount(), 1)
+            self.assertEqual(len(titles(page)), 3)
+
+            page.load_history()  # nothing new
+            self.assertEqual(len(titles(page)), 3)
+
+            # Truncated and rewritten; a row shown through the bus before that
+            # must not hide the same row in the new file
+            page.on_history_logged(["music", "Song D", "2025-12-14", "11:00:00"])
+            with open(path, 'w', newline='') as f:
+                f.write("music,Song D,2025-12-14,11:00:00\r\n")
+            page.load_history()
+            self.assertEqual(titles(page), ["Song D"])
+            self.assertEqual(len(page.pending_rows), 0)
+            self.assertEqual(page.category_models["journal"].rowCount(), 0)
+
+            # Rotated: replaced by a different file, even one bigger than what was read
+            rotated = os.path.join(self.test_dir, 'history.new')
+            with open(rotated, 'w', newline='') as f:
+                f.write("".join(f"music,Song {i},2025-12-15,09:00:00\r\n" for i in range(5)))
+            os.replace(rotated, path)
+            page.load_history()
+            self.assertEqual(titles(page), [f"Song {i}" for i in range(5)])
+            page.deleteLater()
+
+    def test_favorite_page_follows_store(self):
+        """Test favorites added elsewhere appear on an open FavoritePage."""
+        store = dashboard.FavoritesStore(os.path.join(self.test_dir, 'favorites.csv'))
+        with patch('dashboard.favorites_store', store):
+            page = dashboard.FavoritePage()
+            store.add("video", "Breathing exercise")
+            store.add("music", "Weightless")
+            self.assertEqual(page.category_models["video"].rowCount(), 1)
+            self.assertIs(page.content_layout.itemAt(0).widget(), page.music_list)
+
+            store.remove("video", "Breathing exercise")
+            self.assertEqual(page.category_models["video"].rowCount(), 0)
+            page.deleteLater()
+
+    def test_favorite_page_removal_reuses_store_rows(self):
+        """Test removing and re-adding favorites doesn't grow the page's store."""
+        store = dashboard.FavoritesStore(os.path.join(self.test_dir, 'favorites.csv'))
+        with patch('dashboard.favorites_store', store):
+            page = dashboard.FavoritePage()
+            for i in range(5):
+                store.add("music", f"Song {i}")
+            size = len(page.store)
+            for _ in range(3):
+                store.remove("music", "Song 2")
+                store.add("music", "Song 2")
+            store.remove("music", "Song 0")
+
+            music = page.category_models["music"]
+            self.assertEqual([music.data(music.index(r)) for r in range(music.rowCount())],
+                             ["Song 1", "Song 3", "Song 4", "Song 2"])
+            self.assertEqual(len(page.store), size)
+            page.deleteLater()
+
+
+class TestRatingChart(unittest.TestCase):
+    """Test cases for the hospital rating chart."""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt5.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_frame_cached_across_ticks(self):
+        """Test the chart frame is rendered once per series, not on every tick."""
+        chart = dashboard.RatingChart()
+        series = [(2010 + i, 3 + (i % 3) * 0.5) for i in range(12)]
+        chart.set_series(series)
+        self.assertEqual(chart.segment_count(), 11)
+
+        chart.grab()
+        frame = chart.frame
+        for tick in range(1, 40):
+            chart.set_progress(tick * 0.3)
+            chart.grab()
+        self.assertIs(chart.frame, frame)
+        self.assertEqual(chart.progress, 11)
+
+        chart.set_series(series[:3])
+        self.assertIsNone(chart.frame)
+        self.assertEqual(chart.progress, 0)
+
+    def test_hospitals_have_yearly_ratings(self):
+        """Test each hospital has a year-ordered ratings series on the 1-5 scale."""
+        for hospital in dashboard.HOSPITALS:
+            years = [year for year, _ in hospital['yearly_ratings']]
+            self.assertEqual(years, sorted(years))
+            for _, rating in hospital['yearly_ratings']:
+                self.assertTrue(1 <= rating <= 5)
+
+
+class TestHeartbeat(unittest.TestCase):
+    """Test cases for dashboard liveness via lock file and heartbeat."""
+
+    def test_lock_and_heartbeat(self):
+        """Test one dashboard holds the lock, beats are readable, and a stale beat counts as hung."""
+        test_dir = tempfile.mkdtemp()
+        lock_path = os.path.join(test_dir, "dashboard.lock")
+        path = os.path.join(test_dir, "dashboard.heartbeat")
+        try:
+            self.assertEqual(heartbeat.read_status(lock_path, path), {"running": False})
+            beat = heartbeat.Heartbeat(lock_path, path)
+            self.assertTrue(beat.acquire())
+            self.assertFalse(heartbeat.Heartbeat(lock_path, path).acquire())
+
+            timer = dashboard.HeartbeatTimer(beat, interval=10)
+            timer.start()
+            time.sleep(0.06)
+            timer.tick()
+            status = heartbeat.read_status(lock_path, path)
+            self.assertTrue(status["responding"])
+            self.assertEqual(status["pid"], os.getpid())
+            self.assertGreater(status["lag_ms"], 30)
+            self.assertGreater(status["rss"], 0)
+            self.assertFalse(heartbeat.read_status(lock_path, path, now=time.time() + 60)["responding"])
+
+            timer.stop()
+            self.assertEqual(heartbeat.read_status(lock_path, path), {"running": False})
+        finally:
+            shutil.rmtree(test_dir)
+
+
+    def test_acquire_waits_out_a_status_check(self):
+        """Test a dashboard starting while is_locked() briefly holds the lock still gets it."""
+        import threading
+        test_dir = tempfile.mkdtemp()
+        lock_path = os.path.join(test_dir, "dashboard.lock")
+        path = os.path.join(test_dir, "dashboard.heartbeat")
+        try:
+            checker = open(lock_path, "a+")
+            self.assertTrue(heartbeat._try_lock(checker))
+            release = threading.Timer(0.03, lambda: (heartbeat._unlock(checker), checker.close()))
+            release.start()
+            beat = heartbeat.Heartbeat(lock_path, path)
+            self.assertTrue(beat.acquire())
+            release.join()
+            beat.close()
+        finally:
+            shutil.rmtree(test_dir)
+
+    def test_default_paths_are_absolute(self):
+        """Test the lock and heartbeat files don't depend on the working directory."""
+        self.assertTrue(os.path.isabs(heartbeat.LOCK_FILE))
+        self.assertTrue(os.path.isabs(heartbeat.HEARTBEAT_FILE))
+        self.assertEqual(os.path.dirname(heartbeat.LOCK_FILE), os.path.dirname(os.path.abspath(admin.DASHBOARD_SCRIPT)))
+
+
+class TestControlSocket(unittest.TestCase):
+    """Test cases for the admin-to-dashboard control socket."""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt5.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def call(self, name, command):
+        # The client blocks, so it runs on a thread while this one serves the socket
+        import threading
+        outcome = {}
+
+        def run():
+            try:
+                outcome["result"] = control.send_command(command, name=name)
+            except control.ControlError as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        while thread.is_alive():
+            self.app.processEvents()
+            thread.join(0.005)
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def test_commands_round_trip(self):
+        """Test commands reach their handlers and failures come back as ControlError."""
+        def fail():
+            raise RuntimeError("disk full")
+
+        name = f"hilom-test-{os.getpid()}"
+        server = control.ControlServer({"stats": lambda: {"pages": [0, 4]}, "flush": fail}, name=name)
+        self.assertTrue(server.listen())
+        try:
+            self.assertEqual(self.call(name, "stats"), {"pages": [0, 4]})
+            with patch("builtins.print"), self.assertRaisesRegex(control.ControlError, "disk full"):
+                self.call(name, "flush")
+            with self.assertRaisesRegex(control.ControlError, "unknown command"):
+                self.call(name, "reboot")
+        finally:
+            server.close()
+        with self.assertRaises(control.ControlError):
+            control.send_command("stats", name=name, timeout=200)
+
+    def test_window_reload_and_stats(self):
+        """Test a warm reload refreshes built pages without rebuilding them."""
+        window = dashboard.HilomMainWindow(prewarm=False)
+        window.switch_page(4)
+        favorite_page = window.favorite_page
+        with patch.object(dashboard, "content_catalog") as content, \
+                patch.object(favorite_page, "reload") as reload_favorites:
+            result = window.reload_content()
+            content.close.assert_called_once()
+            reload_favorites.assert_called_once()
+            self.assertIn("elapsed_ms", result)
+            self.assertIs(window.pages[4], favorite_page)
+            stats = window.control_stats()
+        self.assertEqual(stats["pages_built"], [0, 4])
+        self.assertEqual(stats["pid"], os.getpid())
+        window.deleteLater()
+
+
+    def test_window_reload_picks_up_favorites_file(self):
+        """Test a warm reload shows favorites.csv as it is now on the open Favorites page."""
+        test_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(test_dir, "favorites.csv")
+            with open(path, "w", newline="") as f:
+                f.write("music,Song A\r\n")
+            store = dashboard.FavoritesStore(path)
+            with patch.object(dashboard, "favorites_store", store), \
+                    patch.object(dashboard, "content_catalog"):
+                window = dashboard.HilomMainWindow(prewarm=False)
+                window.switch_page(4)
+                page = window.favorite_page
+                music = page.category_models["music"]
+                self.assertEqual([music.data(music.index(r)) for r in range(music.rowCount())], ["Song A"])
+
+                # Edited outside the app
+                with open(path, "w", newline="") as f:
+                    f.write("music,Song B\r\nmusic,Song C\r\nvideo,Clip\r\n")
+                window.reload_content()
+
+                self.assertIs(window.favorite_page, page)
+                self.assertEqual([music.data(music.index(r)) for r in range(music.rowCount())], ["Song B", "Song C"])
+                self.assertEqual(page.category_models["video"].rowCount(), 1)
+                self.assertIs(page.content_layout.itemAt(0).widget(), page.music_list)
+                window.deleteLater()
+        finally:
+            shutil.rmtree(test_dir)
+
+
+class TestAdminPanel(unittest.TestCase):
+    """Test cases for the admin panel's background loading."""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt5.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_refresh_does_not_block(self):
+        """Test a hanging MySQL call runs off the GUI thread and each source reports its state."""
+        def slow_connection():
+            time.sleep(0.5)
+            raise OSError("MySQL not reachable")
+
+        with patch("admin.get_connection", side_effect=slow_connection), patch("builtins.print"):
+            start = time.perf_counter()
+            panel = admin.AdminPanel()
+            self.assertLess(time.perf_counter() - start, 0.4)
+            self.assertIn("loading", panel.source_labels["users"].text())
+            self.assertFalse(panel.loader.submit("users", panel.fetch_registered_users))
+
+            deadline = time.monotonic() + 10
+            while len(panel.source_state) < len(panel.sources) and time.monotonic() < deadline:
+                self.app.processEvents()
+                time.sleep(0.01)
+        self.assertEqual(set(panel.source_state), set(panel.sources))
+        # The MySQL loaders fell back to their sample rows
+        self.assertEqual(panel.mysql_users_model.rowCount(), 2)
+        self.assertEqual(panel.appointments_model.rowCount(), 2)
+        self.assertRegex(panel.source_labels["users"].text(), r"Users: \d+ ms, 0s ago")
+        panel.close()
+
+    def test_large_table_sort_and_filter(self):
+        """Test 100k appointment rows load quickly and sort/filter through the proxy."""
+        from PyQt5.QtWidgets import QVBoxLayout, QWidget
+        container = QWidget()
+        view, model = admin.make_table(admin.RowTableModel(["Name", "Date", "Price"]), QVBoxLayout(container))
+        rows = [(f"Patient {i}", f"2025-{i % 12 + 1:02d}-01", i % 500) for i in range(100000)]
+
+        start = time.perf_counter()
+        model.set_rows(rows)
+        container.resize(600, 400)
+        container.grab()
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        proxy = view.model()
+        proxy.sort(2, admin.Qt.DescendingOrder)
+        self.assertEqual(proxy.index(0, 2).data(), "499")
+        proxy.set_filter_text("PATIENT 9999")
+        self.assertEqual(sorted(proxy.index(r, 0).data() for r in range(proxy.rowCount())),
+                         ["Patient 9999", "Patient 99990", "Patient 99991", "Patient 99992", "Patient 99993",
+                          "Patient 99994", "Patient 99995", "Patient 99996", "Patient 99997", "Patient 99998",
+                          "Patient 99999"])
+        proxy.set_filter_text("")
+        self.assertEqual(proxy.rowCount(), 100000)
+
+    def test_sort_survives_refresh(self):
+        """Test refreshed rows come back in the order the header says they are sorted by."""
+        from PyQt5.QtWidgets import QVBoxLayout, QWidget
+        container = QWidget()
+        view, model = admin.make_table(admin.RowTableModel(["Name", "Price"]), QVBoxLayout(container))
+        model.set_rows([("Ana", 300), ("Ben", 100), ("Cy", 200)])
+        view.sortByColumn(1, admin.Qt.DescendingOrder)
+        proxy = view.model()
+        self.assertEqual([proxy.index(r, 0).data() for r in range(3)], ["Ana", "Cy", "Ben"])
+
+        model.set_rows([("Ben", 100), ("Dee", 400), ("Cy", 200), ("Ana", 300)])
+        self.assertEqual([proxy.index(r, 0).data() for r in range(4)], ["Dee", "Ana", "Cy", "Ben"])
+        self.assertEqual(view.horizontalHeader().sortIndicatorSection(), 1)
+
+        # Clearing the indicator goes back to the order the rows were fetched in
+        view.sortByColumn(-1, admin.Qt.AscendingOrder)
+        model.set_rows([("Ben", 100), ("Cy", 200)])
+        self.assertEqual([proxy.index(r, 0).data() for r in range(2)], ["Ben", "Cy"])
+
+    def test_restart_waits_for_old_dashboard(self):
+        """Test no second dashboard is started while the old one still holds the lock."""
+        panel = MagicMock()
+        with patch("admin.heartbeat.is_locked", return_value=True), \
+             patch("admin.heartbeat.read_status", return_value={"running": True, "pid": 4242}), \
+             patch("admin.QMessageBox.question", return_value=admin.QMessageBox.No) as mock_question, \
+             patch("admin.subprocess.Popen") as mock_popen, patch("admin.os.kill") as mock_kill:
+            admin.AdminPanel.start_dashboard_when_stopped(panel, time.monotonic() - 1)
+
+            mock_question.assert_called_once()
+            mock_kill.assert_not_called()
+            mock_popen.assert_not_called()
+
+            # Forcing it and still finding the lock held gives up with a warning
+            with patch("admin.QMessageBox.warning") as mock_warning:
+                admin.AdminPanel.start_dashboard_when_stopped(panel, time.monotonic() - 1, forced=True)
+            mock_warning.assert_called_once()
+            mock_popen.assert_not_called()
+
+    def test_control_commands_do_not_block(self):
+        """Test a slow control socket doesn't freeze the panel and the result still reaches the UI."""
+        def slow_reload(command):
+            time.sleep(0.5)
+            return {"elapsed_ms": 12}
+
+        status = {"running": True, "responding": True, "pid": 4242}
+        with patch("admin.get_connection", side_effect=OSError("MySQL not reachable")), patch("builtins.print"):
+            panel = admin.AdminPanel()
+            self.assertTrue(self.wait_for(lambda: len(panel.source_state) == len(panel.sources)))
+        with patch("admin.heartbeat.read_status", return_value=status), \
+             patch("admin.control.send_command", side_effect=slow_reload) as mock_send, \
+             patch("admin.QMessageBox.question", return_value=admin.QMessageBox.Yes), \
+             patch("admin.QMessageBox.information") as mock_info, \
+             patch.object(panel, "check_system_status"), patch.object(panel, "start_dashboard_when_stopped") as mock_start:
+            start = time.perf_counter()
+            panel.restart_dashboard()
+            self.assertLess(time.perf_counter() - start, 0.4)
+            self.assertTrue(self.wait_for(lambda: mock_info.called))
+            mock_send.assert_called_once_with("reload")
+            self.assertIn("reloaded in 12 ms", mock_info.call_args[0][2])
+            mock_start.assert_not_called()
+
+            # A failed reload stops the old process and hands over to the lock poller
+            mock_send.side_effect = admin.control.ControlError("no answer")
+            with patch("admin.os.kill") as mock_kill, patch("builtins.print"):
+                panel.restart_dashboard()
+                self.assertTrue(self.wait_for(lambda: mock_start.called))
+            mock_kill.assert_called_once_with(4242, admin.signal.SIGTERM)
+        panel.close()
+
+    def wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        return condition()
+
+    def test_keyset_pages(self):
+        """Test pages are prefetched in the background, appended in order, and dropped after a reset."""
+        data = [(f"Patient {i}", i) for i in range(250)]
+
+        def fetch_page(after, limit):
+            start = 0 if after is None else after + 1
+            rows = data[start:start + limit]
+            return rows, (start + limit - 1 if start + limit < len(data) else None)
+
+        model = admin.KeysetTableModel(["Name", "N"], fetch_page, page_size=100)
+        model.reset_pages(*fetch_page(None, 100))
+        self.assertTrue(self.wait_for(lambda: model._prefetched is not None))
+        while model.canFetchMore():
+            model.fetchMore()
+            self.wait_for(lambda: not model.loader.is_running("page"))
+            self.app.processEvents()
+        self.assertEqual(model.rows, data)
+
+        # A page still loading when the data is refreshed never shows up
+        model.fetch_page = lambda after, limit: (time.sleep(0.2), fetch_page(after, limit))[1]
+        model.reset_pages(*fetch_page(None, 100))
+        model.reset_pages(data[:100], None)
+        self.wait_for(lambda: not model.loader.is_running("page"))
+        self.app.processEvents()
+        self.assertEqual(len(model.rows), 100)
+        self.assertFalse(model.canFetchMore())
+        model.loader.shutdown()
+
+    def test_index_migration(self):
+        """Test a migration runs once and an index that already exists counts as applied."""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = []
+        error = dashboard.db_pool.mysql.connector.Error("Duplicate key name", errno=migrations.ER_DUP_KEYNAME)
+
+        def execute(sql, *args):
+            if "CREATE INDEX" in sql:
+                raise error
+        cursor.execute.side_effect = execute
+        self.assertEqual(migrations.migrate(conn), ["appointments_created_at_id"])
+        cursor.execute.assert_any_call("INSERT INTO schema_migrations (name) VALUES (%s)",
+                                       ("appointments_created_at_id",))
+
+        cursor.fetchall.return_value = [("appointments_created_at_id",)]
+        cursor.execute.reset_mock()
+        self.assertEqual(migrations.migrate(conn), [])
+        self.assertFalse(any("CREATE INDEX" in c[0][0] for c in cursor.execute.call_args_list))
+
+    def test_appointment_page_query(self):
+        """Test the keyset query continues after the last (created_at, id) and reports the next key."""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = [("A", "d", "t", "Online", 1, "c", "x", "Active", "2025-01-02", 7),
+                                        ("B", "d", "t", "Online", 1, "c", "x", "Active", "2025-01-01", 3)]
+        with patch("admin.get_connection", return_value=conn):
+            rows, key = admin.fetch_appointment_page(("2025-01-03", 9), limit=2)
+        query, params = cursor.execute.call_args[0]
+        self.assertIn("ORDER BY created_at DESC, id DESC LIMIT %s", query)
+        self.assertEqual(params, ["2025-01-03", "2025-01-03", 9, 2])
+        self.assertEqual(rows[1], ("B", "d", "t", "Online", 1, "c", "x", "Active"))
+        self.assertEqual(key, ("2025-01-01", 3))
+
+
+class TestCredentialIndex(unittest.TestCase):
+    """Test cases for the login credential index over registered_list.csv."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "registered_list.csv")
+        with open(self.path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Name", "Password", "Email"])
+            writer.writerow(["remy", "secret1", "remy@example.com"])
+            writer.writerow(["remy", "secret2", "remy2@example.com"])
+        self.index = LOGIN1.CredentialIndex(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def check_login(self, username, password):
+        window = MagicMock()
+        window.surname_input.text.return_value = username
+        window.password_input.text.return_value = password
+        with patch("LOGIN1.credential_index", self.index), \
+             patch("LOGIN1.QMessageBox") as mock_box, \
+             patch("os.startfile", create=True) as mock_start:
+            LOGIN1.LoginWindow.check_login(window)
+        return mock_box, mock_start
+
+    def test_login_succeeds(self):
+        """Test a registered name and password log in and open the dashboard."""
+        mock_box, mock_start = self.check_login("remy", "secret1")
+        mock_box.information.assert_called_once()
+        mock_start.assert_called_once_with("dashboard.py")
+
+    def test_later_duplicate_row_cannot_log_in(self):
+        """Test only the first row registered under a name is accepted."""
+        self.assertEqual(self.index.lookup("remy", "secret1"), ["remy", "secret1", "remy@example.com"])
+        self.assertIsNone(self.index.lookup("remy", "secret2"))
+        mock_box, mock_start = self.check_login("remy", "secret2")
+        mock_box.warning.assert_called_once_with(unittest.mock.ANY, "Error", "Invalid username or password!")
+        mock_start.assert_not_called()
+
+    def test_wrong_password(self):
+        """Test a wrong password is refused."""
+        mock_box, mock_start = self.check_login("remy", "nope")
+        mock_box.warning.assert_called_once_with(unittest.mock.ANY, "Error", "Invalid username or password!")
+        mock_start.assert_not_called()
+        self.assertIsNone(self.index.lookup("nobody", "secret1"))
+
+    def test_duplicate_registration_rejected(self):
+        """Test registering a name that is already taken fails validation."""
+        with patch("LOGIN1.credential_index", self.index), patch("LOGIN1.QMessageBox") as mock_box:
+            ok = LOGIN1.RegisterWindow.validate_inputs(MagicMock(), "remy", "secret9", "secret9", "r@example.com")
+            self.assertFalse(ok)
+            mock_box.warning.assert_called_once_with(unittest.mock.ANY, "Error", "This name is already registered!")
+            self.assertTrue(LOGIN1.RegisterWindow.validate_inputs(
+                MagicMock(), "ana", "secret9", "secret9", "ana@example.com"))
+
+    def test_new_user_indexed_without_rescan(self):
+        """Test a user registered through the index can log in without the file being parsed again."""
+        self.assertTrue(self.index.lookup("remy", "secret1"))
+        self.index.register(["ana", "secret3", "ana@example.com"])
+
+        with patch("LOGIN1.csv.reader", side_effect=AssertionError("file re-read")):
+            self.assertEqual(self.index.lookup("ana", "secret3"), ["ana", "secret3", "ana@example.com"])
+            self.assertTrue(self.index.has_user("ana"))
+        with open(self.path, newline="") as f:
+            self.assertEqual(list(csv.reader(f))[-1], ["ana", "secret3", "ana@example.com"])
+
+        # Written by someone else since the last read: picked up on the next lookup
+        with open(self.path, "a", newline="") as f:
+            csv.writer(f).writerow(["ben", "secret4", "ben@example.com"])
+        self.index.register(["cy", "secret5", "cy@example.com"])
+        self.assertTrue(self.index.lookup("ben", "secret4"))
+        self.assertTrue(self.index.lookup("cy", "secret5"))
+
+
 class TestDatabaseFunctions(unittest.TestCase):
     """Test cases for database-related functions."""
 
     @patch('mysql.connector.connect')
     def test_get_connection(self, mock_connect):
-        """Test get_connection function."""
+        """Test get_connection hands out pooled connections built from DB_CONFIG."""
         mock_connection = MagicMock()
         mock_connect.return_value = mock_connection
 
-        result = dashboard.get_connection()
+        with patch('db_pool.pool', dashboard.db_pool.ConnectionPool()):
+            result = dashboard.get_connection()
+            result.close()
+            again = dashboard.get_connection()
 
         mock_connect.assert_called_once_with(
             host="localhost",
@@ -148,18 +1225,151 @@ class TestDatabaseFunctions(unittest.TestCase):
             database="hilom",
             connection_timeout=5
         )
-        self.assertEqual(result, mock_connection)
+        self.assertIs(again._conn, mock_connection)
+        again.close()
 
-    def test_init_database_skip(self):
-        """Test init_database function skips MySQL initialization."""
-        with patch('builtins.print') as mock_print:
+    @patch('mysql.connector.connect')
+    def test_pool_replaces_dead_connection(self, mock_connect):
+        """Test a connection that fails its health check is replaced."""
+        dead, fresh = MagicMock(), MagicMock()
+        dead.ping.side_effect = dashboard.db_pool.mysql.connector.Error("gone away")
+        mock_connect.side_effect = [dead, fresh]
+
+        pool = dashboard.db_pool.ConnectionPool(ping_after=0)
+        pool.get_connection().close()
+        conn = pool.get_connection()
+
+        self.assertIs(conn._conn, fresh)
+        dead.close.assert_called_once()
+        self.assertEqual(pool.stats()["in_use"], 1)
+        conn.close()
+        self.assertEqual(pool.stats(), {"size": dashboard.db_pool.POOL_SIZE, "in_use": 0, "idle": 1})
+
+    def test_appointment_outbox_retries_until_saved(self):
+        """Test a failed appointment insert is retried in the background and then dropped from the outbox."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "outbox.jsonl")
+            insert = MagicMock(side_effect=[dashboard.db_pool.mysql.connector.OperationalError("down"), None])
+            outbox = dashboard.AppointmentOutbox(path, insert=insert, retry_base=0.01)
+
+            with patch('builtins.print'):
+                outbox.submit({"name": "Ana", "price": 500})
+                deadline = time.monotonic() + 5
+                while outbox.pending_count() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                outbox.stop()
+
+            self.assertEqual(outbox.pending_count(), 0)
+            self.assertEqual(insert.call_count, 2)
+            insert.assert_called_with({"name": "Ana", "price": 500})
+            self.assertFalse(os.path.exists(path))
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_appointment_outbox_survives_restart(self):
+        """Test appointments that could not be saved are reloaded from the outbox file."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "outbox.jsonl")
+            failing = MagicMock(side_effect=dashboard.db_pool.mysql.connector.InterfaceError("down"))
+            outbox = dashboard.AppointmentOutbox(path, insert=failing, retry_base=60)
+            with patch('builtins.print'):
+                outbox.submit({"name": "Ana"})
+                outbox.submit({"name": "Ben"})
+                outbox.stop()
+
+            reopened = dashboard.AppointmentOutbox(path, insert=MagicMock())
+            self.assertEqual(reopened.pending_count(), 2)
+            self.assertEqual(reopened._pending, [{"name": "Ana"}, {"name": "Ben"}])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_appointment_outbox_dead_letters_permanent_failure(self):
+        """Test an appointment that can never be inserted is set aside and the next one still goes through."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "outbox.jsonl")
+            dead_path = os.path.join(temp_dir, "failed.jsonl")
+            duplicate = dashboard.db_pool.mysql.connector.IntegrityError("Duplicate entry")
+            insert = MagicMock(side_effect=[duplicate, None])
+            outbox = dashboard.AppointmentOutbox(path, insert=insert, retry_base=60, dead_letter_path=dead_path)
+            failures = []
+            outbox.failed.connect(lambda info, error, will_retry: failures.append((info["name"], will_retry)))
+
+            with patch('builtins.print'):
+                outbox.submit({"name": "Ana"})
+                outbox.submit({"name": "Ben"})
+                deadline = time.monotonic() + 5
+                while outbox.pending_count() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                outbox.stop()
+            # failed is emitted from the outbox thread, so it arrives through the event loop
+            from PyQt5.QtWidgets import QApplication
+            (QApplication.instance() or QApplication([])).processEvents()
+
+            self.assertEqual(outbox.pending_count(), 0)
+            insert.assert_called_with({"name": "Ben"})
+            self.assertEqual(failures, [("Ana", False)])
+            with open(dead_path, encoding="utf-8") as f:
+                dead = [json.loads(line) for line in f]
+            self.assertEqual([entry["info"] for entry in dead], [{"name": "Ana"}])
+            self.assertIn("Duplicate entry", dead[0]["error"])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_appointment_outbox_without_driver(self):
+        """Test a missing MySQL driver sets the appointment aside instead of ending the outbox thread."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            dead_path = os.path.join(temp_dir, "failed.jsonl")
+            insert = MagicMock(side_effect=[ImportError("No module named 'mysql'"), None])
+            outbox = dashboard.AppointmentOutbox(os.path.join(temp_dir, "outbox.jsonl"), insert=insert,
+                                                 retry_base=60, dead_letter_path=dead_path)
+            with patch.dict(sys.modules, {"mysql.connector": None}), patch('builtins.print'):
+                self.assertFalse(dashboard.is_transient_error(ImportError("No module named 'mysql'")))
+                outbox.submit({"name": "Ana"})
+                outbox.submit({"name": "Ben"})
+                deadline = time.monotonic() + 5
+                while outbox.pending_count() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertTrue(outbox._thread.is_alive())
+                outbox.stop()
+
+            self.assertEqual(outbox.pending_count(), 0)
+            insert.assert_called_with({"name": "Ben"})
+            self.assertTrue(os.path.exists(dead_path))
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_init_database_reports_outbox(self):
+        """Test init_database reports appointments left in the outbox without touching MySQL."""
+        with patch.object(dashboard.appointment_outbox, 'pending_count', return_value=2), \
+             patch('dashboard.db_pool.get_connection') as mock_conn, \
+             patch('builtins.print') as mock_print:
             dashboard.init_database()
 
-            mock_print.assert_any_call("Skipping MySQL initialization for now.")
-            mock_print.assert_any_call("Database initialization skipped. Appointments will be saved to history only.")
+        mock_conn.assert_not_called()
+        mock_print.assert_any_call("2 appointment(s) from the last session are waiting to be saved to MySQL.")
+        mock_print.assert_any_call("Appointments are saved to MySQL in the background.")
+
+
+class TestDatabaseExport(unittest.TestCase):
+    """Test cases for the streaming export in database.py."""
+
+    def test_child_stream_groups_rows_by_user(self):
+        """Test child rows are handed out per user and orphaned rows are skipped."""
+        import database
+        rows = iter([
+            {"user_id": 1, "id": 10}, {"user_id": 1, "id": 11},
+            {"user_id": 2, "id": 12},  # user 2 was deleted
+            {"user_id": 3, "id": 13},
+        ])
+        stream = database.ChildStream(rows)
 
-            # Check that MYSQL_AVAILABLE is set to False
-            self.assertFalse(dashboard.MYSQL_AVAILABLE)
+        self.assertEqual(stream.take(1), [{"id": 10}, {"id": 11}])
+        self.assertEqual(stream.take(3), [{"id": 13}])
+        self.assertEqual(stream.take(4), [])
 
 
 class TestDataValidation(unittest.TestCase):